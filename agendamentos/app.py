@@ -1,14 +1,29 @@
-from flask import Flask
+import click
+from flask import Blueprint, Flask
 from flasgger import Swagger
+from sqlalchemy import text
 from models import db
+from models.versao import VersaoColecao
 from models.agendamentos import Agendamento
+from models.recorrencias import Recorrencia, ExcecaoRecorrencia
+from models.salas import Sala
+from models.alteracoes import Alteracao
 from config import Config
+from database.connection import configurar_sqlite
+from utils.etag import condicional
+from utils.metricas import metricas
+from utils.perfilamento import perfilamento
+from utils.serializacao import ProvedorJSON
+from services.gerenciamento_client import gerenciamento
 from controllers.agendamentos_controller import AgendamentoController
+from controllers.disponibilidade_controller import DisponibilidadeController
+from controllers.recorrencias_controller import RecorrenciaController
+from controllers.alteracoes_controller import AlteracaoController
+from controllers.arquivamento_controller import ArquivamentoController
 
-app = Flask(__name__)
-app.config.from_object(Config)
-db.init_app(app)
-swagger = Swagger(app, template={
+rotas = Blueprint("agendamentos", __name__)
+
+SWAGGER_TEMPLATE = {
     "swagger": "2.0",
     "info": {
         "title": "API Escolar - Agendamentos de Salas",
@@ -17,21 +32,155 @@ swagger = Swagger(app, template={
     },
     "basePath": "/",
     "schemes": ["http"]
-})
+}
 
-@app.route("/agendamentos", methods=["GET"])
+@rotas.route("/agendamentos", methods=["GET"])
+@condicional("agendamentos")
 def get_agendamentos():
     """Listar todos os agendamentos
     ---
     tags: [Agendamentos]
+    parameters:
+      - name: num_sala
+        in: query
+        type: string
+        description: Sala ou lista de salas separadas por vírgula
+      - name: turma_id
+        in: query
+        type: string
+        description: Id ou lista de ids separados por vírgula
+      - name: lab
+        in: query
+        type: boolean
+        description: Somente laboratórios ou salas comuns
+      - name: data
+        in: query
+        type: string
+        description: Dia exato (AAAA-MM-DD)
+      - name: data_de
+        in: query
+        type: string
+        description: A partir de (AAAA-MM-DD)
+      - name: data_ate
+        in: query
+        type: string
+        description: Até (AAAA-MM-DD)
+      - name: incluir_arquivados
+        in: query
+        type: boolean
+        description: Inclui os agendamentos arquivados (anos letivos anteriores)
     responses:
       200:
         description: Lista de agendamentos disponíveis
+      400: {description: Filtro inválido}
     """
     return AgendamentoController.get_agendamentos()
 
 
-@app.route("/agendamentos/<int:agendamento_id>", methods=["GET"])
+@rotas.route("/agendamentos/disponibilidade", methods=["GET"])
+@condicional("agendamentos", "recorrencias")
+def get_disponibilidade():
+    """Intervalos livres de cada sala em um dia
+    ---
+    tags: [Agendamentos]
+    parameters:
+      - name: data
+        in: query
+        type: string
+        required: true
+        description: Dia da busca (AAAA-MM-DD)
+      - name: duracao
+        in: query
+        type: integer
+        description: Duração mínima do intervalo livre, em minutos
+      - name: lab
+        in: query
+        type: boolean
+        description: Somente laboratórios ou somente salas comuns
+      - name: num_sala
+        in: query
+        type: string
+        description: Sala ou lista de salas separadas por vírgula
+      - name: inicio
+        in: query
+        type: string
+        description: Início da janela (HH:MM, padrão EXPEDIENTE_INICIO)
+      - name: fim
+        in: query
+        type: string
+        description: Fim da janela (HH:MM, padrão EXPEDIENTE_FIM)
+    responses:
+      200: {description: Salas com a lista de intervalos livres de cada uma}
+      400: {description: Parâmetros inválidos}
+    """
+    return DisponibilidadeController.get_disponibilidade()
+
+
+@rotas.route("/agendamentos/ocorrencias", methods=["GET"])
+@condicional("agendamentos", "recorrencias")
+def get_ocorrencias():
+    """Agendamentos avulsos e ocorrências das recorrências em um período
+    ---
+    tags: [Recorrências]
+    parameters:
+      - name: data_de
+        in: query
+        type: string
+        required: true
+        description: Início do período (AAAA-MM-DD)
+      - name: data_ate
+        in: query
+        type: string
+        required: true
+        description: Fim do período (AAAA-MM-DD, no máximo 400 dias depois)
+      - name: num_sala
+        in: query
+        type: string
+        description: Sala ou lista de salas separadas por vírgula
+      - name: turma_id
+        in: query
+        type: string
+        description: Id ou lista de ids separados por vírgula
+      - name: lab
+        in: query
+        type: boolean
+        description: Somente laboratórios ou salas comuns
+    responses:
+      200:
+        description: Ocorrências ordenadas por data, sala e horário, com `origem` agendamento ou recorrencia
+      400: {description: Parâmetros inválidos}
+    """
+    return RecorrenciaController.get_ocorrencias()
+
+
+@rotas.route("/agendamentos/export", methods=["GET"])
+def export_agendamentos():
+    """Exportar agendamentos em CSV ou NDJSON
+    ---
+    tags: [Agendamentos]
+    produces: [text/csv, application/x-ndjson]
+    parameters:
+      - name: format
+        in: query
+        type: string
+        enum: [csv, ndjson]
+        description: Formato do arquivo (padrão csv)
+      - name: incluir_arquivados
+        in: query
+        type: boolean
+        description: Inclui os registros arquivados
+    responses:
+      200:
+        description: >
+          Arquivo enviado em blocos à medida que as linhas são lidas, em
+          ordem de id. Aceita os mesmos filtros da listagem (data_de, data_ate, num_sala, ...).
+      400: {description: Formato ou filtro inválido}
+    """
+    return AgendamentoController.export_agendamentos()
+
+
+@rotas.route("/agendamentos/<int:agendamento_id>", methods=["GET"])
+@condicional("agendamentos")
 def get_agendamento_by_id(agendamento_id):
     """Buscar agendamento por ID
     ---
@@ -41,6 +190,10 @@ def get_agendamento_by_id(agendamento_id):
         in: path
         type: integer
         required: true
+      - name: incluir_arquivados
+        in: query
+        type: boolean
+        description: Procura também no arquivo
     responses:
       200: {description: Agendamento encontrado}
       404: {description: Agendamento não encontrado}
@@ -48,7 +201,7 @@ def get_agendamento_by_id(agendamento_id):
     return AgendamentoController.get_agendamento_by_id(agendamento_id)
 
 
-@app.route("/agendamentos", methods=["POST"])
+@rotas.route("/agendamentos", methods=["POST"])
 def create_agendamento():
     """Criar novo agendamento
     ---
@@ -69,11 +222,12 @@ def create_agendamento():
     responses:
       201: {description: Agendamento criado com sucesso}
       400: {description: Dados inválidos}
+      409: {description: Sala já reservada no horário informado}
     """
     return AgendamentoController.create_agendamento()
 
 
-@app.route("/agendamentos/<int:agendamento_id>", methods=["PUT"])
+@rotas.route("/agendamentos/<int:agendamento_id>", methods=["PUT"])
 def update_agendamento(agendamento_id):
     """Atualizar um agendamento existente
     ---
@@ -96,12 +250,14 @@ def update_agendamento(agendamento_id):
             hora_fim: {type: string, example: "11:00"}
     responses:
       200: {description: Agendamento atualizado}
+      400: {description: Dados inválidos}
       404: {description: Agendamento não encontrado}
+      409: {description: Sala já reservada no horário informado}
     """
     return AgendamentoController.update_agendamento(agendamento_id)
 
 
-@app.route("/agendamentos/<int:agendamento_id>", methods=["DELETE"])
+@rotas.route("/agendamentos/<int:agendamento_id>", methods=["DELETE"])
 def delete_agendamento(agendamento_id):
     """Excluir um agendamento
     ---
@@ -118,11 +274,237 @@ def delete_agendamento(agendamento_id):
     return AgendamentoController.delete_agendamento(agendamento_id)
 
 
-def init_db():
+
+@rotas.route("/recorrencias", methods=["GET"])
+@condicional("recorrencias")
+def get_recorrencias():
+    """Listar as recorrências semanais
+    ---
+    tags: [Recorrências]
+    parameters:
+      - name: num_sala
+        in: query
+        type: string
+        description: Sala ou lista de salas separadas por vírgula
+      - name: turma_id
+        in: query
+        type: string
+        description: Id ou lista de ids separados por vírgula
+      - name: dia_semana
+        in: query
+        type: string
+        description: Dia da semana (0 = segunda ... 6 = domingo)
+      - name: lab
+        in: query
+        type: boolean
+        description: Somente laboratórios ou salas comuns
+    responses:
+      200: {description: Lista de recorrências}
+      400: {description: Filtro inválido}
+    """
+    return RecorrenciaController.get_recorrencias()
+
+
+@rotas.route("/recorrencias/<int:recorrencia_id>", methods=["GET"])
+@condicional("recorrencias")
+def get_recorrencia_by_id(recorrencia_id):
+    """Buscar recorrência por ID
+    ---
+    tags: [Recorrências]
+    parameters:
+      - name: recorrencia_id
+        in: path
+        type: integer
+        required: true
+    responses:
+      200: {description: Recorrência encontrada}
+      404: {description: Recorrência não encontrada}
+    """
+    return RecorrenciaController.get_recorrencia_by_id(recorrencia_id)
+
+
+@rotas.route("/recorrencias", methods=["POST"])
+def create_recorrencia():
+    """Criar uma reserva semanal
+    ---
+    tags: [Recorrências]
+    consumes: [application/json]
+    parameters:
+      - in: body
+        name: body
+        schema:
+          type: object
+          properties:
+            num_sala: {type: integer}
+            lab: {type: boolean}
+            turma_id: {type: integer}
+            dia_semana: {type: integer, description: "0 = segunda; padrão: dia de data_inicio"}
+            data_inicio: {type: string, format: date}
+            data_fim: {type: string, format: date}
+            hora_inicio: {type: string, example: "08:00"}
+            hora_fim: {type: string, example: "10:00"}
+            excecoes: {type: array, items: {type: string, format: date}}
+    responses:
+      201: {description: Recorrência criada}
+      400: {description: Dados inválidos}
+      409: {description: Alguma ocorrência conflita com um agendamento ou outra recorrência}
+    """
+    return RecorrenciaController.create_recorrencia()
+
+
+@rotas.route("/recorrencias/<int:recorrencia_id>", methods=["PUT"])
+def update_recorrencia(recorrencia_id):
+    """Atualizar uma recorrência
+    ---
+    tags: [Recorrências]
+    parameters:
+      - name: recorrencia_id
+        in: path
+        type: integer
+        required: true
+      - in: body
+        name: body
+        schema:
+          type: object
+          properties:
+            num_sala: {type: integer}
+            lab: {type: boolean}
+            turma_id: {type: integer}
+            dia_semana: {type: integer}
+            data_inicio: {type: string, format: date}
+            data_fim: {type: string, format: date}
+            hora_inicio: {type: string}
+            hora_fim: {type: string}
+            excecoes: {type: array, items: {type: string, format: date}, description: Substitui a lista atual}
+    responses:
+      200: {description: Recorrência atualizada}
+      404: {description: Recorrência não encontrada}
+      409: {description: Alguma ocorrência conflita com um agendamento ou outra recorrência}
+    """
+    return RecorrenciaController.update_recorrencia(recorrencia_id)
+
+
+@rotas.route("/recorrencias/<int:recorrencia_id>", methods=["DELETE"])
+def delete_recorrencia(recorrencia_id):
+    """Excluir uma recorrência e todas as suas ocorrências
+    ---
+    tags: [Recorrências]
+    parameters:
+      - name: recorrencia_id
+        in: path
+        type: integer
+        required: true
+    responses:
+      200: {description: Recorrência removida com sucesso}
+      404: {description: Recorrência não encontrada}
+    """
+    return RecorrenciaController.delete_recorrencia(recorrencia_id)
+
+
+@rotas.route("/recorrencias/<int:recorrencia_id>/excecoes", methods=["POST"])
+def add_excecao(recorrencia_id):
+    """Cancelar uma ocorrência (acrescenta uma data às exceções)
+    ---
+    tags: [Recorrências]
+    parameters:
+      - name: recorrencia_id
+        in: path
+        type: integer
+        required: true
+      - in: body
+        name: body
+        schema:
+          type: object
+          properties:
+            data: {type: string, format: date}
+    responses:
+      200: {description: Recorrência com a nova exceção}
+      404: {description: Recorrência não encontrada}
+    """
+    return RecorrenciaController.add_excecao(recorrencia_id)
+
+
+@rotas.route("/changes", methods=["GET"])
+def get_alteracoes():
+    """Feed de alterações (inserts, updates e deletes) a partir de um cursor
+    ---
+    tags: [Alterações]
+    parameters:
+      - name: since
+        in: query
+        type: integer
+        description: Último seq já consumido (padrão 0)
+      - name: limit
+        in: query
+        type: integer
+        description: Máximo de alterações (padrão 500, máx. 5000)
+      - name: colecao
+        in: query
+        type: string
+        description: Coleção ou lista separada por vírgulas (agendamentos, recorrencias)
+    responses:
+      200:
+        description: >
+          Alterações com seq > since em ordem, cada uma com coleção, id,
+          operação e o estado da entidade (null nos deletes). `next` é o
+          cursor da próxima chamada e `mais` indica se há outra página.
+      400: {description: Parâmetros inválidos}
+    """
+    return AlteracaoController.get_alteracoes()
+
+
+@rotas.route("/arquivamento", methods=["POST"])
+def arquivar():
+    """Arquivar agendamentos de anos letivos anteriores
+    ---
+    tags: [Arquivamento]
+    responses:
+      200:
+        description: >
+          Agendamentos com data antes do início do ano letivo
+          (ANO_LETIVO_INICIO) movidos para agendamentos_arquivo; quantidade
+          movida por coleção
+      500: {description: Falha no meio do arquivamento (os lotes anteriores ficam arquivados)}
+    """
+    return ArquivamentoController.post_arquivar()
+
+
+def create_app(config=Config):
+    app = Flask(__name__)
+    app.config.from_object(config)
+    if app.config.get("JSON_RAPIDO", True):
+        app.json = ProvedorJSON(app)
+    db.init_app(app)
+    Alteracao.monitorar({Agendamento: "agendamentos", Recorrencia: "recorrencias"})
+    with app.app_context():
+        configurar_sqlite(db.engine, app.config["SQLITE_PRAGMAS"])
+        metricas.init_app(app, db.engine)
+        perfilamento.init_app(app, db.engine)
+    gerenciamento.init_app(app)
+
+    @app.cli.command("arquivar")
+    def arquivar_comando():
+        """Arquiva os agendamentos de anos letivos anteriores."""
+        click.echo(ArquivamentoController.arquivar())
+
+    Swagger(app, template=SWAGGER_TEMPLATE)
+    app.register_blueprint(rotas)
+    return app
+
+def init_db(app):
     with app.app_context():
         db.create_all()
+        # create_all não cria índices novos em tabelas que já existem. O
+        # (num_sala, data, minuto_inicio) de versões anteriores é coberto por
+        # ix_agendamentos_data_sala.
+        for indice in Agendamento.__table__.indexes:
+            indice.create(db.engine, checkfirst=True)
+        db.session.execute(text("DROP INDEX IF EXISTS ix_agendamentos_sala_data"))
+        Sala.sincronizar()
+        db.session.commit()
         print("✅ Base de dados do módulo Agendamentos pronta para uso!")
 
 if __name__ == "__main__":
-    init_db()
-    app.run(host="0.0.0.0", port=5051, debug=True)
\ No newline at end of file
+    app = create_app()
+    init_db(app)
+    app.run(host="0.0.0.0", port=5051, debug=True)
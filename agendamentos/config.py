@@ -4,10 +4,76 @@ BASE_DIR = os.path.abspath(os.path.dirname(__file__))
 DB_DIR = os.path.join(BASE_DIR, "database")
 os.makedirs(DB_DIR, exist_ok=True)
 
+# PRAGMAs aplicados a cada conexão SQLite; escolha com SQLITE_PERFIL.
+SQLITE_PERFIS = {
+    "legado": {},
+    "wal": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,
+        "foreign_keys": "ON",
+    },
+    "desempenho": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,
+        "foreign_keys": "ON",
+        "mmap_size": 268435456,
+        "cache_size": -65536,
+        "temp_store": "MEMORY",
+    },
+}
+
+
+def _pragmas(perfil):
+    """PRAGMAs do perfil `perfil`; ValueError com os perfis válidos se ele não existir."""
+    if perfil not in SQLITE_PERFIS:
+        raise ValueError(
+            f"SQLITE_PERFIL inválido: {perfil!r}; use um de: {', '.join(SQLITE_PERFIS)}"
+        )
+    return SQLITE_PERFIS[perfil]
+
 class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv(
         "DATABASE_URL",
         f"sqlite:///{os.path.join(DB_DIR, 'agendamentos.db')}"
     )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    SECRET_KEY = os.urandom(24)
\ No newline at end of file
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "10")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "20")),
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "30")),
+    }
+    SQLITE_PERFIL = os.getenv("SQLITE_PERFIL", "desempenho")
+    SQLITE_PRAGMAS = _pragmas(SQLITE_PERFIL)
+    SECRET_KEY = os.urandom(24)
+    METRICAS_HABILITADAS = os.getenv("METRICAS_HABILITADAS", "true").lower() == "true"
+    # Diretório compartilhado pelos workers para somar as métricas em /metrics.
+    METRICAS_DIR = os.getenv("METRICAS_DIR")
+    METRICAS_INTERVALO = float(os.getenv("METRICAS_INTERVALO", "1.0"))
+    # Provedor JSON com orjson (se instalado) e chaves na ordem dos dicts.
+    JSON_RAPIDO = os.getenv("JSON_RAPIDO", "true").lower() == "true"
+
+    # Perfil sob demanda (cabeçalho X-Perfil: <token>) e log de SQL lento.
+    PERFIL_TOKEN = os.getenv("PERFIL_TOKEN")
+    PERFIL_DIR = os.getenv("PERFIL_DIR")
+    SQL_LENTO_MS = float(os.getenv("SQL_LENTO_MS", "0")) or None
+    SQL_LENTO_MAX = int(os.getenv("SQL_LENTO_MAX", "200"))
+
+    GERENCIAMENTO_URL = os.getenv("GERENCIAMENTO_URL")
+    VALIDAR_REFERENCIAS = os.getenv("VALIDAR_REFERENCIAS", "true").lower() == "true"
+    GERENCIAMENTO_TIMEOUT = float(os.getenv("GERENCIAMENTO_TIMEOUT", "2.0"))
+    GERENCIAMENTO_POOL_TAMANHO = int(os.getenv("GERENCIAMENTO_POOL_TAMANHO", "10"))
+    GERENCIAMENTO_CACHE_TTL = int(os.getenv("GERENCIAMENTO_CACHE_TTL", "60"))
+    GERENCIAMENTO_CACHE_TTL_NEGATIVO = int(os.getenv("GERENCIAMENTO_CACHE_TTL_NEGATIVO", "5"))
+    GERENCIAMENTO_CACHE_TAMANHO = int(os.getenv("GERENCIAMENTO_CACHE_TAMANHO", "10000"))
+
+    # Janela considerada na busca de salas livres (GET /agendamentos/disponibilidade).
+    EXPEDIENTE_INICIO = os.getenv("EXPEDIENTE_INICIO", "07:00")
+    EXPEDIENTE_FIM = os.getenv("EXPEDIENTE_FIM", "22:00")
+
+    # Arquivamento (POST /arquivamento ou `flask arquivar`): agendamentos de
+    # anos letivos anteriores vão para agendamentos_arquivo. O ano letivo
+    # começa em ANO_LETIVO_INICIO (MM-DD).
+    ANO_LETIVO_INICIO = os.getenv("ANO_LETIVO_INICIO", "02-01")
+    ARQUIVO_LOTE = int(os.getenv("ARQUIVO_LOTE", "1000"))
@@ -1,9 +1,34 @@
 from flask import request, jsonify
 from models.agendamentos import Agendamento, db
+from models.recorrencias import Recorrencia
+from models.salas import Sala
+from models.versao import VersaoColecao
+from services.arquivamento import AGENDAMENTOS, incluir_arquivados
+from services.gerenciamento_client import validar_referencias
+from utils.exportacao import exportar, ler_formato
+from utils.filtros import Filtro, aplicar_filtros, booleano, data_iso
+from utils.serializacao import Serializador
 from datetime import datetime
+from database.connection import reservar_escrita
 
 class AgendamentoController:
 
+    FILTROS = {
+        "id": Filtro(Agendamento.id),
+        "num_sala": Filtro(Agendamento.num_sala),
+        "turma_id": Filtro(Agendamento.turma_id),
+        "lab": Filtro(Agendamento.lab, conversor=booleano),
+        "data": Filtro(Agendamento.data, conversor=data_iso),
+        "data_de": Filtro(Agendamento.data, ">=", data_iso),
+        "data_ate": Filtro(Agendamento.data, "<=", data_iso)
+    }
+
+    # Colunas de Agendamento.to_dict; a listagem não carrega os minutos.
+    LINHA = Serializador(
+        Agendamento.id, Agendamento.num_sala, Agendamento.lab, Agendamento.data,
+        Agendamento.turma_id, Agendamento.hora_inicio, Agendamento.hora_fim
+    )
+
     @staticmethod
     def _get_json():
         data = request.get_json()
@@ -11,13 +36,74 @@ class AgendamentoController:
             return None, jsonify({"erro": "Dados inválidos"}), 400
         return data, None, None
 
+    @staticmethod
+    def _verificar_conflito(agendamento):
+        """409 se a sala já estiver reservada no horário; senão None.
+
+        Toma o lock de escrita antes de ler, então a verificação e a gravação
+        que a segue no mesmo commit não se intercalam com as de outra reserva.
+        """
+        with db.session.no_autoflush:
+            reservar_escrita(db.session)
+            conflito = Agendamento.buscar_conflito(
+                agendamento.num_sala,
+                agendamento.data,
+                agendamento.minuto_inicio,
+                agendamento.minuto_fim,
+                ignorar_id=agendamento.id
+            )
+            recorrencia = None if conflito else Recorrencia.buscar_conflito_data(
+                agendamento.num_sala,
+                agendamento.data,
+                agendamento.minuto_inicio,
+                agendamento.minuto_fim
+            )
+        if conflito:
+            return jsonify({
+                "erro": "Sala já reservada neste horário",
+                "conflito": conflito.to_dict()
+            }), 409
+        if recorrencia:
+            return jsonify({
+                "erro": "Sala já reservada neste horário",
+                "conflito": recorrencia.ocorrencia(agendamento.data)
+            }), 409
+        return None
+
+    @staticmethod
+    def _consulta():
+        """Colunas de LINHA com os filtros da query string (e o arquivo, se pedido) e a coluna de ordenação."""
+        linha = AgendamentoController.LINHA
+        query = linha.selecionar(aplicar_filtros(Agendamento.query, AgendamentoController.FILTROS, request.args))
+        if not incluir_arquivados(request.args):
+            return query, Agendamento.id
+        frio = aplicar_filtros(
+            AGENDAMENTOS.selecionar(linha.colunas), AGENDAMENTOS.filtros(AgendamentoController.FILTROS), request.args
+        )
+        return AGENDAMENTOS.unir(query, frio)
+
     @staticmethod
     def get_agendamentos():
         if request.method != 'GET':
             return jsonify({"erro": "Método não permitido"}), 405
 
-        agendamentos = Agendamento.query.all()
-        return jsonify([agendamento.to_dict() for agendamento in agendamentos]), 200
+        try:
+            query, coluna_id = AgendamentoController._consulta()
+        except ValueError as e:
+            return jsonify({"erro": str(e)}), 400
+
+        return jsonify(AgendamentoController.LINHA.lista(query.order_by(coluna_id))), 200
+
+    @staticmethod
+    def export_agendamentos():
+        if request.method != 'GET':
+            return jsonify({"erro": "Método não permitido"}), 405
+        try:
+            formato = ler_formato()
+            query, coluna_id = AgendamentoController._consulta()
+        except ValueError as e:
+            return jsonify({"erro": str(e)}), 400
+        return exportar(query, coluna_id, AgendamentoController.LINHA, formato, "agendamentos")
 
     @staticmethod
     def get_agendamento_by_id(agendamento_id):
@@ -25,9 +111,16 @@ class AgendamentoController:
             return jsonify({"erro": "Método não permitido"}), 405
 
         agendamento = Agendamento.query.get(agendamento_id)
-        if not agendamento:
+        if agendamento:
+            return jsonify(agendamento.to_dict()), 200
+        try:
+            arquivados = incluir_arquivados(request.args)
+        except ValueError as e:
+            return jsonify({"erro": str(e)}), 400
+        arquivado = AGENDAMENTOS.buscar(AgendamentoController.LINHA.colunas, agendamento_id) if arquivados else None
+        if not arquivado:
             return jsonify({"erro": "Agendamento não encontrado"}), 404
-        return jsonify(agendamento.to_dict()), 200
+        return jsonify(AgendamentoController.LINHA(arquivado)), 200
 
     @staticmethod
     def create_agendamento():
@@ -41,6 +134,10 @@ class AgendamentoController:
         if "num_sala" not in data or "lab" not in data or "data" not in data or "turma_id" not in data:
             return jsonify({"erro": "Campos obrigatórios ausentes"}), 400
 
+        erro_referencia = validar_referencias(turmas=[data["turma_id"]])
+        if erro_referencia:
+            return erro_referencia
+
         try:
             data_agendamento = datetime.fromisoformat(data["data"]).date()
         except ValueError:
@@ -50,12 +147,21 @@ class AgendamentoController:
             num_sala=data["num_sala"],
             lab=bool(data["lab"]),
             data=data_agendamento,
-            turma_id=data["turma_id"],
-            hora_inicio=data.get("hora_inicio"),
-            hora_fim=data.get("hora_fim")
+            turma_id=data["turma_id"]
         )
+        try:
+            novo_agendamento.definir_horario(data.get("hora_inicio"), data.get("hora_fim"))
+        except ValueError as e:
+            return jsonify({"erro": str(e)}), 400
+
+        conflito_response = AgendamentoController._verificar_conflito(novo_agendamento)
+        if conflito_response:
+            db.session.rollback()
+            return conflito_response
 
         db.session.add(novo_agendamento)
+        Sala.registrar(novo_agendamento.num_sala, novo_agendamento.lab)
+        VersaoColecao.incrementar("agendamentos")
         db.session.commit()
         return jsonify(novo_agendamento.to_dict()), 201
 
@@ -72,7 +178,12 @@ class AgendamentoController:
         if error_response:
             return error_response, status
 
-        campos = ["data", "turma_id", "num_sala", "lab", "hora_inicio", "hora_fim"]
+        if "turma_id" in data:
+            erro_referencia = validar_referencias(turmas=[data["turma_id"]])
+            if erro_referencia:
+                return erro_referencia
+
+        campos = ["data", "turma_id", "num_sala", "lab"]
 
         for campo in campos:
             if campo in data:
@@ -80,10 +191,27 @@ class AgendamentoController:
                     try:
                         setattr(agendamento, campo, datetime.strptime(data[campo], "%Y-%m-%d").date())
                     except ValueError:
+                        db.session.rollback()
                         return jsonify({"erro": "Formato de data inválido. Use AAAA-MM-DD."}), 400
                 else:
                     setattr(agendamento, campo, data[campo])
 
+        try:
+            agendamento.definir_horario(
+                data.get("hora_inicio", agendamento.hora_inicio),
+                data.get("hora_fim", agendamento.hora_fim)
+            )
+        except ValueError as e:
+            db.session.rollback()
+            return jsonify({"erro": str(e)}), 400
+
+        conflito_response = AgendamentoController._verificar_conflito(agendamento)
+        if conflito_response:
+            db.session.rollback()
+            return conflito_response
+
+        Sala.registrar(agendamento.num_sala, agendamento.lab)
+        VersaoColecao.incrementar("agendamentos")
         db.session.commit()
         return jsonify(agendamento.to_dict()), 200
 
@@ -97,5 +225,6 @@ class AgendamentoController:
             return jsonify({"erro": "Agendamento não encontrado"}), 404
 
         db.session.delete(agendamento)
+        VersaoColecao.incrementar("agendamentos")
         db.session.commit()
         return jsonify({"mensagem": "Agendamento removido com sucesso"}), 200
\ No newline at end of file
@@ -0,0 +1,54 @@
+from flask import request, jsonify
+from models.alteracoes import Alteracao
+
+LIMITE_PADRAO = 500
+LIMITE_MAXIMO = 5000
+
+
+class AlteracaoController:
+
+    @staticmethod
+    def _inteiro(nome, padrao):
+        valor = request.args.get(nome)
+        if valor is None:
+            return padrao
+        try:
+            numero = int(valor)
+        except ValueError:
+            raise ValueError(f"Parâmetro '{nome}' deve ser um número inteiro")
+        if numero < 0:
+            raise ValueError(f"Parâmetro '{nome}' não pode ser negativo")
+        return numero
+
+    @staticmethod
+    def get_alteracoes():
+        """Alterações com seq maior que `since`, em ordem.
+
+        `next` é o cursor para a próxima chamada (o seq da última alteração
+        devolvida, ou o próprio `since` se não houve nenhuma) e `mais` indica
+        se ainda há alterações depois desta página. `ultimo_seq` serve para
+        quem vai começar do zero: guarde-o, baixe as coleções inteiras e
+        siga o feed a partir dele.
+        """
+        if request.method != 'GET':
+            return jsonify({"erro": "Método não permitido"}), 405
+
+        try:
+            desde = AlteracaoController._inteiro("since", 0)
+            limite = AlteracaoController._inteiro("limit", LIMITE_PADRAO)
+            if limite == 0:
+                raise ValueError("Parâmetro 'limit' deve ser maior que zero")
+        except ValueError as e:
+            return jsonify({"erro": str(e)}), 400
+        limite = min(limite, LIMITE_MAXIMO)
+        colecoes = [c.strip() for c in request.args.get("colecao", "").split(",") if c.strip()]
+
+        alteracoes = Alteracao.listar(desde, limite + 1, colecoes)
+        mais = len(alteracoes) > limite
+        alteracoes = alteracoes[:limite]
+        return jsonify({
+            "dados": [alteracao.to_dict() for alteracao in alteracoes],
+            "next": alteracoes[-1].seq if alteracoes else desde,
+            "mais": mais,
+            "ultimo_seq": Alteracao.ultimo_seq()
+        }), 200
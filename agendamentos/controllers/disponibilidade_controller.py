@@ -0,0 +1,107 @@
+from flask import current_app, request, jsonify
+from datetime import datetime
+from models.agendamentos import Agendamento, hora_para_minutos, minutos_para_hora
+from models.recorrencias import Recorrencia
+from models.salas import Sala
+from utils.filtros import booleano, inteiro
+
+class DisponibilidadeController:
+
+    @staticmethod
+    def _ler_parametros():
+        if "data" not in request.args:
+            raise ValueError("Parâmetro 'data' obrigatório (AAAA-MM-DD)")
+        try:
+            data = datetime.strptime(request.args["data"], "%Y-%m-%d").date()
+        except ValueError:
+            raise ValueError("Data inválida, use o formato AAAA-MM-DD")
+
+        inicio = hora_para_minutos(request.args.get("inicio", current_app.config["EXPEDIENTE_INICIO"]))
+        fim = hora_para_minutos(request.args.get("fim", current_app.config["EXPEDIENTE_FIM"]))
+        if inicio >= fim:
+            raise ValueError("inicio deve ser anterior a fim")
+
+        try:
+            duracao = int(request.args.get("duracao", 1))
+        except ValueError:
+            raise ValueError("Valor inválido para duracao")
+        if duracao < 1:
+            raise ValueError("duracao deve ser de pelo menos 1 minuto")
+
+        try:
+            lab = booleano(request.args["lab"]) if "lab" in request.args else None
+        except ValueError:
+            raise ValueError("Valor inválido para lab")
+        try:
+            salas = [inteiro(s) for s in request.args["num_sala"].split(",")] if "num_sala" in request.args else None
+        except ValueError:
+            raise ValueError("Valor inválido para num_sala")
+        return data, inicio, fim, duracao, lab, salas
+
+    @staticmethod
+    def _intervalos_livres(ocupacoes, inicio, fim, duracao):
+        """Varre as reservas de uma sala em ordem de início e devolve as lacunas do expediente."""
+        livres = []
+        cursor = inicio
+        for ocupado_inicio, ocupado_fim in ocupacoes:
+            if ocupado_inicio - cursor >= duracao:
+                livres.append((cursor, ocupado_inicio))
+            cursor = max(cursor, ocupado_fim)
+        if fim - cursor >= duracao:
+            livres.append((cursor, fim))
+        return livres
+
+    @staticmethod
+    def get_disponibilidade():
+        try:
+            data, inicio, fim, duracao, lab, filtro_salas = DisponibilidadeController._ler_parametros()
+        except ValueError as e:
+            return jsonify({"erro": str(e)}), 400
+
+        query = Sala.query
+        if lab is not None:
+            query = query.filter(Sala.lab == lab)
+        if filtro_salas is not None:
+            query = query.filter(Sala.num_sala.in_(filtro_salas))
+        salas = query.order_by(Sala.num_sala).all()
+
+        restringir = [s.num_sala for s in salas] if lab is not None or filtro_salas is not None else None
+        ocupacoes = {}
+        for num_sala, ocupado_inicio, ocupado_fim in Agendamento.ocupacoes_do_dia(
+            data, inicio, fim, restringir
+        ):
+            ocupacoes.setdefault(num_sala, []).append((ocupado_inicio, ocupado_fim))
+
+        # As ocorrências de recorrências entram na varredura; só as salas que
+        # têm alguma precisam ser reordenadas.
+        recorrentes = set()
+        for num_sala, ocupado_inicio, ocupado_fim in Recorrencia.ocupacoes_do_dia(
+            data, inicio, fim, restringir
+        ):
+            ocupacoes.setdefault(num_sala, []).append((ocupado_inicio, ocupado_fim))
+            recorrentes.add(num_sala)
+        for num_sala in recorrentes:
+            ocupacoes[num_sala].sort()
+
+        resultado = []
+        for sala in salas:
+            livres = DisponibilidadeController._intervalos_livres(
+                ocupacoes.get(sala.num_sala, ()), inicio, fim, duracao
+            )
+            resultado.append({
+                "num_sala": sala.num_sala,
+                "lab": sala.lab,
+                "livres": [{
+                    "hora_inicio": minutos_para_hora(livre_inicio),
+                    "hora_fim": minutos_para_hora(livre_fim),
+                    "minutos": livre_fim - livre_inicio
+                } for livre_inicio, livre_fim in livres]
+            })
+
+        return jsonify({
+            "data": data.isoformat(),
+            "inicio": minutos_para_hora(inicio),
+            "fim": minutos_para_hora(fim),
+            "duracao": duracao,
+            "salas": resultado
+        }), 200
@@ -0,0 +1,242 @@
+from flask import request, jsonify
+from datetime import datetime, timedelta
+from models.agendamentos import Agendamento, db
+from models.recorrencias import Recorrencia
+from models.salas import Sala
+from models.versao import VersaoColecao
+from controllers.agendamentos_controller import AgendamentoController
+from database.connection import reservar_escrita
+from services.gerenciamento_client import validar_referencias
+from utils.filtros import Filtro, aplicar_filtros, booleano
+
+class RecorrenciaController:
+
+    FILTROS = {
+        "id": Filtro(Recorrencia.id),
+        "num_sala": Filtro(Recorrencia.num_sala),
+        "turma_id": Filtro(Recorrencia.turma_id),
+        "dia_semana": Filtro(Recorrencia.dia_semana),
+        "lab": Filtro(Recorrencia.lab, conversor=booleano)
+    }
+
+    # Filtros que também valem para a expansão em /agendamentos/ocorrencias.
+    FILTROS_OCORRENCIAS = ("num_sala", "turma_id", "lab")
+
+    MAX_DIAS_OCORRENCIAS = 400
+
+    @staticmethod
+    def _get_json():
+        data = request.get_json()
+        if not data:
+            return None, jsonify({"erro": "Dados inválidos"}), 400
+        return data, None, None
+
+    @staticmethod
+    def _data(valor, campo):
+        try:
+            return datetime.strptime(valor, "%Y-%m-%d").date()
+        except (TypeError, ValueError):
+            raise ValueError(f"Data inválida em '{campo}', use o formato AAAA-MM-DD")
+
+    @staticmethod
+    def _aplicar_dados(recorrencia, data):
+        """Copia os campos do corpo para a recorrência; levanta ValueError se inválidos."""
+        for campo in ("num_sala", "turma_id"):
+            if campo in data:
+                setattr(recorrencia, campo, data[campo])
+        if "lab" in data:
+            recorrencia.lab = bool(data["lab"])
+        for campo in ("data_inicio", "data_fim"):
+            if campo in data:
+                setattr(recorrencia, campo, RecorrenciaController._data(data[campo], campo))
+        if recorrencia.data_inicio > recorrencia.data_fim:
+            raise ValueError("data_inicio deve ser anterior ou igual a data_fim")
+
+        if "dia_semana" in data:
+            recorrencia.dia_semana = data["dia_semana"]
+        elif recorrencia.dia_semana is None:
+            recorrencia.dia_semana = recorrencia.data_inicio.weekday()
+        if not isinstance(recorrencia.dia_semana, int) or not 0 <= recorrencia.dia_semana <= 6:
+            raise ValueError("dia_semana deve ser um inteiro de 0 (segunda) a 6 (domingo)")
+
+        recorrencia.definir_horario(
+            data.get("hora_inicio", recorrencia.hora_inicio),
+            data.get("hora_fim", recorrencia.hora_fim)
+        )
+        if "excecoes" in data:
+            if not isinstance(data["excecoes"], list):
+                raise ValueError("excecoes deve ser uma lista de datas")
+            recorrencia.definir_excecoes(
+                RecorrenciaController._data(valor, "excecoes") for valor in data["excecoes"]
+            )
+
+    @staticmethod
+    def _verificar_conflito(recorrencia):
+        """409 se alguma ocorrência cair numa reserva da sala; lê já com o lock de escrita."""
+        with db.session.no_autoflush:
+            reservar_escrita(db.session)
+            agendamento = recorrencia.conflito_agendamento()
+            if agendamento:
+                return jsonify({
+                    "erro": "Sala já reservada em uma das ocorrências",
+                    "conflito": agendamento.to_dict()
+                }), 409
+            outra, data = recorrencia.conflito_recorrencia()
+        if outra:
+            return jsonify({
+                "erro": "Sala já reservada em uma das ocorrências",
+                "conflito": outra.ocorrencia(data)
+            }), 409
+        return None
+
+    @staticmethod
+    def get_recorrencias():
+        try:
+            query = aplicar_filtros(Recorrencia.query, RecorrenciaController.FILTROS, request.args)
+        except ValueError as e:
+            return jsonify({"erro": str(e)}), 400
+
+        recorrencias = query.order_by(Recorrencia.id).all()
+        return jsonify([recorrencia.to_dict() for recorrencia in recorrencias]), 200
+
+    @staticmethod
+    def get_recorrencia_by_id(recorrencia_id):
+        recorrencia = Recorrencia.query.get(recorrencia_id)
+        if not recorrencia:
+            return jsonify({"erro": "Recorrência não encontrada"}), 404
+        return jsonify(recorrencia.to_dict()), 200
+
+    @staticmethod
+    def create_recorrencia():
+        data, error_response, status = RecorrenciaController._get_json()
+        if error_response:
+            return error_response, status
+
+        obrigatorios = ["num_sala", "turma_id", "data_inicio", "data_fim"]
+        for campo in obrigatorios:
+            if campo not in data:
+                return jsonify({"erro": f"Campo obrigatório '{campo}' ausente"}), 400
+
+        erro_referencia = validar_referencias(turmas=[data["turma_id"]])
+        if erro_referencia:
+            return erro_referencia
+
+        recorrencia = Recorrencia(lab=False)
+        try:
+            RecorrenciaController._aplicar_dados(recorrencia, data)
+        except ValueError as e:
+            return jsonify({"erro": str(e)}), 400
+
+        conflito_response = RecorrenciaController._verificar_conflito(recorrencia)
+        if conflito_response:
+            db.session.rollback()
+            return conflito_response
+
+        db.session.add(recorrencia)
+        Sala.registrar(recorrencia.num_sala, recorrencia.lab)
+        VersaoColecao.incrementar("recorrencias")
+        db.session.commit()
+        return jsonify(recorrencia.to_dict()), 201
+
+    @staticmethod
+    def update_recorrencia(recorrencia_id):
+        recorrencia = Recorrencia.query.get(recorrencia_id)
+        if not recorrencia:
+            return jsonify({"erro": "Recorrência não encontrada"}), 404
+
+        data, error_response, status = RecorrenciaController._get_json()
+        if error_response:
+            return error_response, status
+
+        if "turma_id" in data:
+            erro_referencia = validar_referencias(turmas=[data["turma_id"]])
+            if erro_referencia:
+                return erro_referencia
+
+        try:
+            with db.session.no_autoflush:
+                RecorrenciaController._aplicar_dados(recorrencia, data)
+        except ValueError as e:
+            db.session.rollback()
+            return jsonify({"erro": str(e)}), 400
+
+        conflito_response = RecorrenciaController._verificar_conflito(recorrencia)
+        if conflito_response:
+            db.session.rollback()
+            return conflito_response
+
+        Sala.registrar(recorrencia.num_sala, recorrencia.lab)
+        VersaoColecao.incrementar("recorrencias")
+        db.session.commit()
+        return jsonify(recorrencia.to_dict()), 200
+
+    @staticmethod
+    def delete_recorrencia(recorrencia_id):
+        recorrencia = Recorrencia.query.get(recorrencia_id)
+        if not recorrencia:
+            return jsonify({"erro": "Recorrência não encontrada"}), 404
+
+        db.session.delete(recorrencia)
+        VersaoColecao.incrementar("recorrencias")
+        db.session.commit()
+        return jsonify({"mensagem": "Recorrência removida com sucesso"}), 200
+
+    @staticmethod
+    def add_excecao(recorrencia_id):
+        recorrencia = Recorrencia.query.get(recorrencia_id)
+        if not recorrencia:
+            return jsonify({"erro": "Recorrência não encontrada"}), 404
+
+        data, error_response, status = RecorrenciaController._get_json()
+        if error_response:
+            return error_response, status
+        try:
+            dia = RecorrenciaController._data(data.get("data"), "data")
+        except ValueError as e:
+            return jsonify({"erro": str(e)}), 400
+
+        # Cancelar uma ocorrência só libera a sala; não há conflito a verificar.
+        recorrencia.definir_excecoes(recorrencia.datas_excecoes() | {dia})
+        VersaoColecao.incrementar("recorrencias")
+        db.session.commit()
+        return jsonify(recorrencia.to_dict()), 200
+
+    @staticmethod
+    def get_ocorrencias():
+        """Agendamentos avulsos e ocorrências das recorrências num período, em ordem de data."""
+        try:
+            data_de = RecorrenciaController._data(request.args.get("data_de"), "data_de")
+            data_ate = RecorrenciaController._data(request.args.get("data_ate"), "data_ate")
+            if data_de > data_ate:
+                raise ValueError("data_de deve ser anterior ou igual a data_ate")
+            if data_ate - data_de > timedelta(days=RecorrenciaController.MAX_DIAS_OCORRENCIAS):
+                raise ValueError(
+                    f"Período máximo de {RecorrenciaController.MAX_DIAS_OCORRENCIAS} dias"
+                )
+            filtros = {
+                nome: request.args[nome]
+                for nome in RecorrenciaController.FILTROS_OCORRENCIAS if nome in request.args
+            }
+            agendamentos = aplicar_filtros(
+                Agendamento.query.filter(Agendamento.data >= data_de, Agendamento.data <= data_ate),
+                AgendamentoController.FILTROS,
+                filtros
+            ).all()
+            recorrencias = aplicar_filtros(
+                Recorrencia.vigentes(data_de, data_ate), RecorrenciaController.FILTROS, filtros
+            ).all()
+        except ValueError as e:
+            return jsonify({"erro": str(e)}), 400
+
+        ocorrencias = [
+            (a.data, a.num_sala, a.minuto_inicio, dict(a.to_dict(), origem="agendamento"))
+            for a in agendamentos
+        ]
+        for recorrencia in recorrencias:
+            for dia in recorrencia.datas(data_de, data_ate):
+                ocorrencias.append((
+                    dia, recorrencia.num_sala, recorrencia.minuto_inicio,
+                    dict(recorrencia.ocorrencia(dia), origem="recorrencia")
+                ))
+        ocorrencias.sort(key=lambda item: item[:3])
+        return jsonify([item[3] for item in ocorrencias]), 200
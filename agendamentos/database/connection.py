@@ -0,0 +1,30 @@
+from sqlalchemy import event
+
+
+def configurar_sqlite(engine, pragmas):
+    """Aplica os PRAGMAs do perfil escolhido em toda conexão nova do pool."""
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def aplicar_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for nome, valor in pragmas.items():
+            cursor.execute(f"PRAGMA {nome}={valor}")
+        cursor.close()
+
+
+def reservar_escrita(sessao):
+    """Abre a transação da sessão com BEGIN IMMEDIATE, tomando já o lock de escrita do SQLite.
+
+    Serve para verificar e gravar como uma operação só: outra escrita que
+    chegue entre a leitura e o INSERT espera este commit (ou rollback) em vez
+    de ler o mesmo estado. Se a conexão já está numa transação com escrita, o
+    lock já é dela e nada muda.
+    """
+    conexao = sessao.connection()
+    if conexao.dialect.name != "sqlite":
+        return
+    bruta = conexao.connection.driver_connection
+    if not bruta.in_transaction:
+        bruta.execute("BEGIN IMMEDIATE")
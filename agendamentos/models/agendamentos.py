@@ -1,16 +1,101 @@
 from models import db
 from datetime import date
 
-class Agendamento(db.Model):
+MINUTOS_DIA = 24 * 60
+
+
+def hora_para_minutos(hora):
+    """Converte "HH:MM" em minutos desde a meia-noite ("24:00" é aceito como fim do dia)."""
+    try:
+        horas, minutos = hora.split(":")
+        horas, minutos = int(horas), int(minutos)
+    except (AttributeError, ValueError):
+        raise ValueError(f"Horário inválido '{hora}', use o formato HH:MM")
+    total = horas * 60 + minutos
+    if not 0 <= minutos < 60 or not 0 <= total <= MINUTOS_DIA:
+        raise ValueError(f"Horário inválido '{hora}', use o formato HH:MM")
+    return total
+
+
+def minutos_para_hora(minutos):
+    """Converte minutos desde a meia-noite em "HH:MM"."""
+    return f"{minutos // 60:02d}:{minutos % 60:02d}"
+
+
+class IntervaloHorario:
+    """Colunas de horário compartilhadas por agendamentos e recorrências.
+
+    Guarda o texto informado e o intervalo em minutos, usado nas buscas de
+    conflito e de disponibilidade.
+    """
+    hora_inicio = db.Column(db.String(5), nullable=True)
+    hora_fim = db.Column(db.String(5), nullable=True)
+    minuto_inicio = db.Column(db.Integer, nullable=False, default=0)
+    minuto_fim = db.Column(db.Integer, nullable=False, default=MINUTOS_DIA)
+
+    def definir_horario(self, hora_inicio, hora_fim):
+        """Valida o horário e preenche as colunas em minutos.
+
+        Sem horário informado o agendamento ocupa a sala o dia inteiro.
+        """
+        inicio = hora_para_minutos(hora_inicio) if hora_inicio else 0
+        fim = hora_para_minutos(hora_fim) if hora_fim else MINUTOS_DIA
+        if inicio >= fim:
+            raise ValueError("hora_inicio deve ser anterior a hora_fim")
+        self.hora_inicio = hora_inicio
+        self.hora_fim = hora_fim
+        self.minuto_inicio = inicio
+        self.minuto_fim = fim
+
+
+class Agendamento(IntervaloHorario, db.Model):
     __tablename__ = "agendamentos"
+    __table_args__ = (
+        db.Index("ix_agendamentos_data_sala", "data", "num_sala", "minuto_inicio", "minuto_fim"),
+        {"sqlite_autoincrement": True},
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     num_sala = db.Column(db.Integer, nullable=False)
     lab = db.Column(db.Boolean, default=False)
     data = db.Column(db.Date, nullable=False)
-    turma_id = db.Column(db.Integer, nullable=False)
-    hora_inicio = db.Column(db.String(5), nullable=True)
-    hora_fim = db.Column(db.String(5), nullable=True)
+    turma_id = db.Column(db.Integer, nullable=False, index=True)
+
+    @classmethod
+    def buscar_conflito(cls, num_sala, data, minuto_inicio, minuto_fim, ignorar_id=None):
+        """Retorna um agendamento da mesma sala e dia que se sobreponha ao intervalo.
+
+        A busca usa o índice (data, num_sala, minuto_inicio, minuto_fim), então
+        só os agendamentos daquela sala naquele dia são examinados, sem
+        acessar a tabela.
+        """
+        query = cls.query.filter(
+            cls.num_sala == num_sala,
+            cls.data == data,
+            cls.minuto_inicio < minuto_fim,
+            cls.minuto_fim > minuto_inicio,
+        )
+        if ignorar_id is not None:
+            query = query.filter(cls.id != ignorar_id)
+        return query.first()
+
+    @classmethod
+    def ocupacoes_do_dia(cls, data, minuto_inicio, minuto_fim, salas=None):
+        """Reservas do dia que tocam o intervalo, como (num_sala, minuto_inicio, minuto_fim).
+
+        Vêm ordenadas por sala e início e são lidas só do índice
+        (data, num_sala, minuto_inicio, minuto_fim), sem acessar a tabela.
+        """
+        query = db.session.query(
+            cls.num_sala, cls.minuto_inicio, cls.minuto_fim
+        ).filter(
+            cls.data == data,
+            cls.minuto_inicio < minuto_fim,
+            cls.minuto_fim > minuto_inicio,
+        )
+        if salas is not None:
+            query = query.filter(cls.num_sala.in_(salas))
+        return query.order_by(cls.num_sala, cls.minuto_inicio).all()
     
     def to_dict(self):
         return {
@@ -21,4 +106,4 @@ class Agendamento(db.Model):
             "turma_id": self.turma_id,
             "hora_inicio": self.hora_inicio,
             "hora_fim": self.hora_fim
-        }
\ No newline at end of file
+        }
@@ -0,0 +1,110 @@
+from datetime import datetime, timezone
+
+from models import db
+from sqlalchemy import event, select
+
+
+def _agora():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class Alteracao(db.Model):
+    """Outbox de alterações: uma linha por insert, update ou delete de entidade.
+
+    Gravada na mesma transação da escrita, então só aparece se ela for
+    efetivada. ``seq`` é AUTOINCREMENT (nunca reaproveitado) e o SQLite só
+    admite uma transação de escrita por vez, logo a ordem de ``seq`` é a
+    ordem dos commits: quem lê ``seq > cursor`` não perde alterações
+    confirmadas depois. Deletes viram lápides (``dados`` nulo).
+
+    Escritas pelo ORM são capturadas no ``after_flush`` da sessão para os
+    modelos registrados em ``monitorar``; caminhos em lote que usam o Core
+    direto chamam ``registrar``.
+    """
+    __tablename__ = "alteracoes"
+    __table_args__ = (
+        db.Index("ix_alteracoes_colecao_seq", "colecao", "seq"),
+        {"sqlite_autoincrement": True},
+    )
+
+    seq = db.Column(db.Integer, primary_key=True)
+    colecao = db.Column(db.String(50), nullable=False)
+    entidade_id = db.Column(db.Integer, nullable=False)
+    operacao = db.Column(db.String(10), nullable=False)
+    dados = db.Column(db.JSON)
+    criado_em = db.Column(db.DateTime, nullable=False, default=_agora)
+
+    INSERT = "insert"
+    UPDATE = "update"
+    DELETE = "delete"
+
+    # Modelo ORM -> nome da coleção no feed.
+    monitorados = {}
+
+    @classmethod
+    def monitorar(cls, colecoes):
+        cls.monitorados.update(colecoes)
+
+    @staticmethod
+    def _linha(colecao, operacao, entidade_id, dados):
+        return {
+            "colecao": colecao,
+            "entidade_id": entidade_id,
+            "operacao": operacao,
+            "dados": dados,
+            "criado_em": _agora()
+        }
+
+    @classmethod
+    def registrar(cls, colecao, operacao, itens):
+        """Grava na transação corrente as alterações de `itens` (dicts de to_dict, com "id")."""
+        linhas = [
+            cls._linha(colecao, operacao, item["id"], None if operacao == cls.DELETE else item)
+            for item in itens
+        ]
+        if linhas:
+            db.session.execute(cls.__table__.insert(), linhas)
+
+    @classmethod
+    def _capturar(cls, sessao, contexto):
+        linhas = []
+        for operacao, objetos in (
+            (cls.INSERT, sessao.new),
+            (cls.UPDATE, sessao.dirty),
+            (cls.DELETE, sessao.deleted),
+        ):
+            for objeto in objetos:
+                colecao = cls.monitorados.get(type(objeto))
+                if colecao is None:
+                    continue
+                if operacao == cls.UPDATE and not sessao.is_modified(objeto):
+                    continue
+                dados = None if operacao == cls.DELETE else objeto.to_dict()
+                linhas.append(cls._linha(colecao, operacao, objeto.id, dados))
+        if linhas:
+            sessao.connection().execute(cls.__table__.insert(), linhas)
+
+    @classmethod
+    def listar(cls, desde, limite, colecoes=None):
+        """Até `limite` alterações com seq > `desde`, em ordem de seq."""
+        query = select(cls).where(cls.seq > desde)
+        if colecoes:
+            query = query.where(cls.colecao.in_(colecoes))
+        return db.session.execute(query.order_by(cls.seq).limit(limite)).scalars().all()
+
+    @classmethod
+    def ultimo_seq(cls):
+        return db.session.execute(select(db.func.max(cls.seq))).scalar() or 0
+
+    def to_dict(self):
+        return {
+            "seq": self.seq,
+            "colecao": self.colecao,
+            "id": self.entidade_id,
+            "operacao": self.operacao,
+            "dados": self.dados,
+            "em": self.criado_em.isoformat() + "Z"
+        }
+
+
+event.listen(db.session, "after_flush", Alteracao._capturar)
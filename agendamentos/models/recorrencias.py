@@ -0,0 +1,168 @@
+from datetime import timedelta
+
+from models import db
+from models.agendamentos import Agendamento, IntervaloHorario
+from sqlalchemy import exists, func
+from sqlalchemy.orm import relationship
+
+
+class Recorrencia(IntervaloHorario, db.Model):
+    """Reserva semanal de uma sala, guardada uma única vez.
+
+    Vale no dia da semana ``dia_semana`` (0 = segunda) entre ``data_inicio``
+    e ``data_fim``, exceto nas datas de ``excecoes``. As ocorrências não são
+    gravadas: são expandidas sob demanda para o período consultado.
+    """
+    __tablename__ = "recorrencias"
+    __table_args__ = (
+        db.Index("ix_recorrencias_sala_dia", "num_sala", "dia_semana", "data_inicio"),
+        db.Index("ix_recorrencias_periodo", "data_inicio", "data_fim"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    num_sala = db.Column(db.Integer, nullable=False)
+    lab = db.Column(db.Boolean, default=False)
+    turma_id = db.Column(db.Integer, nullable=False, index=True)
+    dia_semana = db.Column(db.Integer, nullable=False)
+    data_inicio = db.Column(db.Date, nullable=False)
+    data_fim = db.Column(db.Date, nullable=False)
+
+    excecoes = relationship(
+        "ExcecaoRecorrencia",
+        cascade="all, delete-orphan",
+        order_by="ExcecaoRecorrencia.data",
+        lazy="selectin"
+    )
+
+    def datas_excecoes(self):
+        return {excecao.data for excecao in self.excecoes}
+
+    def definir_excecoes(self, datas):
+        atuais = {excecao.data: excecao for excecao in self.excecoes}
+        self.excecoes = [atuais.get(data) or ExcecaoRecorrencia(data=data) for data in sorted(set(datas))]
+
+    def datas(self, data_de=None, data_ate=None):
+        """Datas das ocorrências entre data_de e data_ate (inclusive), sem as exceções."""
+        inicio = max(self.data_inicio, data_de) if data_de else self.data_inicio
+        fim = min(self.data_fim, data_ate) if data_ate else self.data_fim
+        dia = inicio + timedelta(days=(self.dia_semana - inicio.weekday()) % 7)
+        excecoes = self.datas_excecoes()
+        while dia <= fim:
+            if dia not in excecoes:
+                yield dia
+            dia += timedelta(days=7)
+
+    def ocorrencia(self, data):
+        return {
+            "recorrencia_id": self.id,
+            "num_sala": self.num_sala,
+            "lab": self.lab,
+            "data": data.isoformat(),
+            "turma_id": self.turma_id,
+            "hora_inicio": self.hora_inicio,
+            "hora_fim": self.hora_fim
+        }
+
+    @classmethod
+    def _sem_excecao(cls, data):
+        return ~exists().where(
+            ExcecaoRecorrencia.recorrencia_id == cls.id,
+            ExcecaoRecorrencia.data == data
+        )
+
+    @classmethod
+    def vigentes(cls, data_de, data_ate):
+        """Recorrências com alguma data no período (as exceções vêm no mesmo carregamento)."""
+        return cls.query.filter(cls.data_inicio <= data_ate, cls.data_fim >= data_de)
+
+    @classmethod
+    def buscar_conflito_data(cls, num_sala, data, minuto_inicio, minuto_fim, ignorar_id=None):
+        """Recorrência da sala com ocorrência em `data` que se sobreponha ao intervalo."""
+        query = cls.query.filter(
+            cls.num_sala == num_sala,
+            cls.dia_semana == data.weekday(),
+            cls.data_inicio <= data,
+            cls.data_fim >= data,
+            cls.minuto_inicio < minuto_fim,
+            cls.minuto_fim > minuto_inicio,
+            cls._sem_excecao(data)
+        )
+        if ignorar_id is not None:
+            query = query.filter(cls.id != ignorar_id)
+        return query.first()
+
+    def conflito_agendamento(self):
+        """Primeiro agendamento avulso da sala que cai numa ocorrência desta recorrência."""
+        # strftime('%w') conta a partir de domingo; dia_semana, a partir de segunda.
+        query = Agendamento.query.filter(
+            Agendamento.num_sala == self.num_sala,
+            Agendamento.data >= self.data_inicio,
+            Agendamento.data <= self.data_fim,
+            Agendamento.minuto_inicio < self.minuto_fim,
+            Agendamento.minuto_fim > self.minuto_inicio,
+            func.strftime("%w", Agendamento.data) == str((self.dia_semana + 1) % 7)
+        )
+        excecoes = self.datas_excecoes()
+        if excecoes:
+            query = query.filter(Agendamento.data.notin_(excecoes))
+        return query.order_by(Agendamento.data).first()
+
+    def conflito_recorrencia(self):
+        """Outra recorrência da sala com uma ocorrência em comum; retorna (recorrência, data)."""
+        query = Recorrencia.query.filter(
+            Recorrencia.num_sala == self.num_sala,
+            Recorrencia.dia_semana == self.dia_semana,
+            Recorrencia.data_inicio <= self.data_fim,
+            Recorrencia.data_fim >= self.data_inicio,
+            Recorrencia.minuto_inicio < self.minuto_fim,
+            Recorrencia.minuto_fim > self.minuto_inicio
+        )
+        if self.id is not None:
+            query = query.filter(Recorrencia.id != self.id)
+        for outra in query:
+            excecoes = outra.datas_excecoes()
+            for data in self.datas(outra.data_inicio, outra.data_fim):
+                if data not in excecoes:
+                    return outra, data
+        return None, None
+
+    @classmethod
+    def ocupacoes_do_dia(cls, data, minuto_inicio, minuto_fim, salas=None):
+        """(num_sala, minuto_inicio, minuto_fim) das ocorrências do dia que tocam o intervalo."""
+        query = db.session.query(
+            cls.num_sala, cls.minuto_inicio, cls.minuto_fim
+        ).filter(
+            cls.dia_semana == data.weekday(),
+            cls.data_inicio <= data,
+            cls.data_fim >= data,
+            cls.minuto_inicio < minuto_fim,
+            cls.minuto_fim > minuto_inicio,
+            cls._sem_excecao(data)
+        )
+        if salas is not None:
+            query = query.filter(cls.num_sala.in_(salas))
+        return query.all()
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "num_sala": self.num_sala,
+            "lab": self.lab,
+            "turma_id": self.turma_id,
+            "dia_semana": self.dia_semana,
+            "data_inicio": self.data_inicio.isoformat(),
+            "data_fim": self.data_fim.isoformat(),
+            "hora_inicio": self.hora_inicio,
+            "hora_fim": self.hora_fim,
+            "excecoes": [excecao.data.isoformat() for excecao in self.excecoes]
+        }
+
+
+class ExcecaoRecorrencia(db.Model):
+    """Data em que uma recorrência não acontece (feriado, aula cancelada)."""
+    __tablename__ = "recorrencias_excecoes"
+
+    recorrencia_id = db.Column(
+        db.Integer, db.ForeignKey("recorrencias.id", ondelete="CASCADE"), primary_key=True
+    )
+    data = db.Column(db.Date, primary_key=True)
@@ -0,0 +1,45 @@
+from models import db
+from models.agendamentos import Agendamento
+from sqlalchemy import func, or_, select
+from sqlalchemy.dialects.sqlite import insert
+
+
+class Sala(db.Model):
+    """Salas conhecidas pelo serviço, registradas a cada agendamento gravado.
+
+    Permite listar também as salas sem nenhuma reserva no dia consultado.
+    """
+    __tablename__ = "salas"
+
+    num_sala = db.Column(db.Integer, primary_key=True)
+    lab = db.Column(db.Boolean, nullable=False, default=False, index=True)
+
+    @classmethod
+    def registrar(cls, num_sala, lab):
+        """Cria a sala ou a marca como laboratório se a reserva for de um.
+
+        Uma reserva com ``lab`` falso não desmarca a sala: recorrências sem o
+        campo chegam como salas comuns, e a regra é a mesma de `sincronizar`
+        (laboratório se alguma reserva o indicou).
+        """
+        stmt = insert(cls).values(num_sala=num_sala, lab=bool(lab))
+        db.session.execute(stmt.on_conflict_do_update(
+            index_elements=[cls.num_sala],
+            set_={"lab": or_(cls.lab, stmt.excluded.lab)}
+        ))
+
+    @classmethod
+    def sincronizar(cls):
+        """Registra as salas de agendamentos gravados antes desta tabela existir."""
+        origem = select(
+            Agendamento.num_sala, func.max(Agendamento.lab)
+        ).group_by(Agendamento.num_sala)
+        db.session.execute(
+            insert(cls).from_select(["num_sala", "lab"], origem).on_conflict_do_nothing()
+        )
+
+    def to_dict(self):
+        return {
+            "num_sala": self.num_sala,
+            "lab": self.lab
+        }
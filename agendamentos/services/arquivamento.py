@@ -0,0 +1,38 @@
+from datetime import date
+
+from models import db
+from models.agendamentos import Agendamento
+from models.arquivo import Arquivo
+from models.versao import VersaoColecao
+from utils.filtros import booleano
+
+AGENDAMENTOS = Arquivo(Agendamento, indices=("data", "turma_id"))
+
+
+def incluir_arquivados(args):
+    """Lê `?incluir_arquivados=`; ValueError se o valor não for booleano."""
+    try:
+        return booleano(args.get("incluir_arquivados", "false"))
+    except ValueError:
+        raise ValueError("Parâmetro 'incluir_arquivados' deve ser true ou false")
+
+
+def inicio_ano_letivo(hoje, inicio="02-01"):
+    """Primeiro dia do ano letivo em curso em `hoje`; `inicio` é o dia em que ele começa (MM-DD)."""
+    mes, dia = map(int, inicio.split("-"))
+    comeco = date(hoje.year, mes, dia)
+    return comeco if hoje >= comeco else date(hoje.year - 1, mes, dia)
+
+
+def arquivar(hoje=None, inicio="02-01", lote=1000):
+    """Arquiva os agendamentos de anos letivos anteriores.
+
+    Datas passadas não entram em conflito nem em disponibilidade, então
+    essas buscas não mudam. Recorrências ficam onde estão: são poucas e
+    uma só cobre o ano inteiro. Retorna {coleção: linhas movidas}.
+    """
+    corte = inicio_ano_letivo(hoje or date.today(), inicio)
+    movidos = {"agendamentos": AGENDAMENTOS.mover(Agendamento.data < corte, lote)}
+    VersaoColecao.incrementar(*[colecao for colecao, total in movidos.items() if total])
+    db.session.commit()
+    return movidos
@@ -0,0 +1,76 @@
+import csv
+import io
+
+from flask import Response, current_app, request, stream_with_context
+from sqlalchemy import Boolean
+
+TAMANHO_LOTE = 1000
+FORMATOS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def ler_formato():
+    """Lê `format` da query string (padrão csv); ValueError se não for suportado."""
+    formato = request.args.get("format", "csv").lower()
+    if formato not in FORMATOS:
+        raise ValueError(f"Parâmetro 'format' deve ser um de: {', '.join(FORMATOS)}")
+    return formato
+
+
+def _linhas_csv(serializador, linhas):
+    # Booleanos saem como no JSON (true/false), e não como True/False.
+    booleanas = [
+        nome for nome, coluna in zip(serializador.nomes, serializador.colunas)
+        if isinstance(coluna.type, Boolean)
+    ]
+
+    def valores(linha):
+        dados = serializador(linha)
+        for nome in booleanas:
+            if dados[nome] is not None:
+                dados[nome] = "true" if dados[nome] else "false"
+        return dados.values()
+
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer, lineterminator="\r\n")
+    escritor.writerow(serializador.nomes)
+    yield buffer.getvalue()
+    for lote in linhas:
+        buffer.seek(0)
+        buffer.truncate()
+        escritor.writerows(map(valores, lote))
+        yield buffer.getvalue()
+
+
+def _linhas_ndjson(serializador, linhas):
+    dumps = current_app.json.dumps
+    for lote in linhas:
+        yield "".join(dumps(serializador(linha)) + "\n" for linha in lote)
+
+
+def exportar(query, coluna_id, serializador, formato, nome, tamanho_lote=TAMANHO_LOTE):
+    """Envia a consulta inteira como anexo CSV ou NDJSON, em blocos.
+
+    As linhas vêm do banco com `yield_per` e cada lote é escrito e enviado
+    antes de o próximo ser lido, então a memória não cresce com a tabela.
+    No CSV o cabeçalho (nomes das colunas do `serializador`) sai antes da
+    consulta rodar.
+    """
+    def lotes():
+        lote = []
+        for linha in query.order_by(coluna_id).yield_per(tamanho_lote):
+            lote.append(linha)
+            if len(lote) >= tamanho_lote:
+                yield lote
+                lote = []
+        if lote:
+            yield lote
+
+    gerar = _linhas_csv if formato == "csv" else _linhas_ndjson
+    return Response(
+        stream_with_context(gerar(serializador, lotes())),
+        mimetype=FORMATOS[formato],
+        headers={"Content-Disposition": f'attachment; filename="{nome}.{formato}"'}
+    )
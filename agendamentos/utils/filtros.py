@@ -0,0 +1,78 @@
+from datetime import date, datetime, timezone
+
+
+def inteiro(valor):
+    return int(valor)
+
+
+def numero(valor):
+    return float(valor)
+
+
+def data_iso(valor):
+    return date.fromisoformat(valor)
+
+
+def data_hora_iso(valor):
+    """Data e hora ISO 8601; com fuso, é convertida para UTC sem fuso."""
+    momento = datetime.fromisoformat(valor)
+    if momento.tzinfo is not None:
+        momento = momento.astimezone(timezone.utc).replace(tzinfo=None)
+    return momento
+
+
+def booleano(valor):
+    valor = valor.lower()
+    if valor in ("1", "true", "sim"):
+        return True
+    if valor in ("0", "false", "nao", "não"):
+        return False
+    raise ValueError(valor)
+
+
+def texto(valor):
+    return valor
+
+
+class Filtro:
+    """Filtro declarativo de query string sobre uma coluna.
+
+    operador "=" aceita lista separada por vírgulas e vira IN; ">=" e "<="
+    servem para faixas (ex.: data_entrega_de / data_entrega_ate). Para casos
+    especiais, `expressao` recebe a lista de valores convertidos e devolve a
+    condição SQL.
+    """
+
+    def __init__(self, coluna=None, operador="=", conversor=inteiro, expressao=None):
+        self.coluna = coluna
+        self.operador = operador
+        self.conversor = conversor
+        self.expressao = expressao
+
+    def condicao(self, nome, valor):
+        partes = valor.split(",") if self.operador == "=" else [valor]
+        try:
+            valores = [self.conversor(p.strip()) for p in partes if p.strip()]
+        except ValueError:
+            raise ValueError(f"Valor inválido para o filtro '{nome}'")
+        if not valores:
+            raise ValueError(f"Valor inválido para o filtro '{nome}'")
+
+        if self.expressao is not None:
+            return self.expressao(valores)
+        if self.operador == ">=":
+            return self.coluna >= valores[0]
+        if self.operador == "<=":
+            return self.coluna <= valores[0]
+        if len(valores) == 1:
+            return self.coluna == valores[0]
+        return self.coluna.in_(valores)
+
+
+def aplicar_filtros(query, filtros, args):
+    """Aplica à query os filtros declarados que aparecem em `args`; ignora os demais parâmetros."""
+    for nome, filtro in filtros.items():
+        valor = args.get(nome)
+        if valor is not None:
+            query = query.filter(filtro.condicao(nome, valor))
+    return query
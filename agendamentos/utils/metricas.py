@@ -0,0 +1,262 @@
+import glob
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from flask import Response, request
+from sqlalchemy import event
+
+# Limites (em segundos) dos baldes do histograma de latência e (em comandos)
+# do histograma de SQL por requisição.
+BALDES_LATENCIA = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BALDES_SQL = (0, 1, 2, 3, 5, 10, 20, 50, 100, 500)
+
+ROTA_NAO_MAPEADA = "<nao_mapeada>"
+
+# [início da requisição, comandos SQL, segundos em SQL] da requisição corrente.
+_requisicao = ContextVar("metricas_requisicao", default=None)
+
+
+class _SerieRota:
+    __slots__ = ("status", "latencia", "latencia_soma", "sql", "sql_comandos", "sql_segundos")
+
+    def __init__(self):
+        self.status = {}
+        self.latencia = [0] * (len(BALDES_LATENCIA) + 1)
+        self.latencia_soma = 0.0
+        self.sql = [0] * (len(BALDES_SQL) + 1)
+        self.sql_comandos = 0
+        self.sql_segundos = 0.0
+
+    def copia(self):
+        return [dict(self.status), list(self.latencia), self.latencia_soma,
+                list(self.sql), self.sql_comandos, self.sql_segundos]
+
+    def somar(self, status, latencia, latencia_soma, sql, sql_comandos, sql_segundos):
+        for codigo, quantidade in status.items():
+            codigo = int(codigo)
+            self.status[codigo] = self.status.get(codigo, 0) + quantidade
+        self.latencia = [a + b for a, b in zip(self.latencia, latencia)]
+        self.latencia_soma += latencia_soma
+        self.sql = [a + b for a, b in zip(self.sql, sql)]
+        self.sql_comandos += sql_comandos
+        self.sql_segundos += sql_segundos
+
+
+def _escapar(valor):
+    return str(valor).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class Metricas:
+    """Métricas de requisições e de SQL no formato texto do Prometheus.
+
+    Os hooks before/after_request medem cada rota (pelo modelo da URL, não
+    pela URL concreta) e os eventos de cursor do SQLAlchemy somam comandos e
+    tempo de SQL na requisição corrente.
+
+    Cada worker conta na própria memória. Com METRICAS_DIR, uma thread do
+    worker grava um retrato dos contadores em ``<dir>/worker-<índice>.json``
+    a cada METRICAS_INTERVALO segundos, se algo mudou, e ao sair; GET
+    /metrics, atendido por qualquer worker, soma os arquivos de todos: o
+    Prometheus vê uma única série por rota, sem rótulo de worker. O índice
+    vem do gunicorn (``definir_worker``) e é reaproveitado pelo worker que
+    substitui um reciclado, que parte dos totais do anterior; assim os
+    contadores só crescem enquanto o mestre vive. Sem METRICAS_DIR (um
+    processo só) vale a memória do processo.
+    """
+
+    def __init__(self):
+        self._series = {}
+        self._lock = threading.Lock()
+        self.diretorio = None
+        self.intervalo = 1.0
+        self._indice = 0
+        self._alterado = False
+
+    def init_app(self, app, engine):
+        if not app.config.get("METRICAS_HABILITADAS", True):
+            return
+        self.diretorio = app.config.get("METRICAS_DIR") or None
+        self.intervalo = app.config.get("METRICAS_INTERVALO", 1.0)
+        if self.diretorio:
+            os.makedirs(self.diretorio, exist_ok=True)
+        app.before_request(self._antes)
+        app.after_request(self._depois)
+        app.add_url_rule("/metrics", "metricas", self.exportar, methods=["GET"])
+        event.listen(engine, "before_cursor_execute", self._antes_sql)
+        event.listen(engine, "after_cursor_execute", self._depois_sql)
+        app.extensions["metricas"] = self
+
+    def _antes(self):
+        _requisicao.set([time.perf_counter(), 0, 0.0])
+
+    def _depois(self, resposta):
+        estado = _requisicao.get()
+        if estado is None:
+            return resposta
+        _requisicao.set(None)
+        duracao = time.perf_counter() - estado[0]
+        # Cada acesso pelo proxy `request` custa microssegundos; resolve uma vez.
+        atual = request._get_current_object()
+        regra = atual.url_rule
+        if regra is None:
+            chave = (atual.method, ROTA_NAO_MAPEADA)
+        elif regra.endpoint == "metricas":
+            return resposta
+        else:
+            chave = (atual.method, regra.rule)
+
+        with self._lock:
+            serie = self._series.get(chave)
+            if serie is None:
+                serie = self._series[chave] = _SerieRota()
+            serie.status[resposta.status_code] = serie.status.get(resposta.status_code, 0) + 1
+            serie.latencia[bisect_left(BALDES_LATENCIA, duracao)] += 1
+            serie.latencia_soma += duracao
+            serie.sql[bisect_left(BALDES_SQL, estado[1])] += 1
+            serie.sql_comandos += estado[1]
+            serie.sql_segundos += estado[2]
+            self._alterado = True
+        return resposta
+
+    @staticmethod
+    def _antes_sql(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._metricas_inicio = time.perf_counter()
+
+    @staticmethod
+    def _depois_sql(conn, cursor, statement, parameters, context, executemany):
+        estado = _requisicao.get()
+        if estado is not None and context is not None:
+            estado[1] += 1
+            estado[2] += time.perf_counter() - context._metricas_inicio
+
+    def _linhas_histograma(self, nome, rotulos, baldes, contagens, soma):
+        acumulado = 0
+        for limite, quantidade in zip(baldes, contagens):
+            acumulado += quantidade
+            yield f'{nome}_bucket{{{rotulos},le="{limite}"}} {acumulado}'
+        acumulado += contagens[-1]
+        yield f'{nome}_bucket{{{rotulos},le="+Inf"}} {acumulado}'
+        yield f"{nome}_sum{{{rotulos}}} {soma}"
+        yield f"{nome}_count{{{rotulos}}} {acumulado}"
+
+    # --- agregação entre workers ---------------------------------------------
+
+    def _arquivo(self, indice):
+        return os.path.join(self.diretorio, f"worker-{indice}.json")
+
+    def definir_worker(self, indice):
+        """Adota o índice estável do worker, continua os totais gravados sob ele
+        e inicia a thread que grava o retrato. Chamado no worker, após o fork.
+        """
+        self._indice = indice
+        if not self.diretorio:
+            return
+        series = {}
+        try:
+            with open(self._arquivo(indice)) as arquivo:
+                anteriores = json.load(arquivo)
+        except (OSError, ValueError):
+            anteriores = []
+        for metodo, rota, *valores in anteriores:
+            series.setdefault((metodo, rota), _SerieRota()).somar(*valores)
+        with self._lock:
+            self._series = series
+        threading.Thread(target=self._gravar_periodicamente, name="metricas", daemon=True).start()
+
+    def _gravar_periodicamente(self):
+        while True:
+            time.sleep(self.intervalo)
+            if self._alterado:
+                self.gravar()
+
+    def gravar(self):
+        """Grava o retrato dos contadores deste worker (troca atômica do arquivo)."""
+        if not self.diretorio:
+            return
+        with self._lock:
+            self._alterado = False
+            retrato = [[metodo, rota, *s.copia()] for (metodo, rota), s in self._series.items()]
+        destino = self._arquivo(self._indice)
+        temporario = f"{destino}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporario, "w") as arquivo:
+            json.dump(retrato, arquivo)
+        os.replace(temporario, destino)
+
+    def limpar_diretorio(self):
+        """Apaga os retratos de uma execução anterior; chamado pelo mestre ao iniciar."""
+        if self.diretorio:
+            for caminho in glob.glob(os.path.join(self.diretorio, "worker-*.json")):
+                os.remove(caminho)
+
+    def _agregado(self):
+        if not self.diretorio:
+            with self._lock:
+                return {chave: s.copia() for chave, s in self._series.items()}
+        self.gravar()
+        total = {}
+        for caminho in glob.glob(os.path.join(self.diretorio, "worker-*.json")):
+            try:
+                with open(caminho) as arquivo:
+                    retrato = json.load(arquivo)
+            except (OSError, ValueError):
+                continue
+            for metodo, rota, *valores in retrato:
+                total.setdefault((metodo, rota), _SerieRota()).somar(*valores)
+        return {chave: s.copia() for chave, s in total.items()}
+
+    def texto(self):
+        series = self._agregado()
+
+        requisicoes = [
+            "# HELP http_requests_total Requisições atendidas por rota e status.",
+            "# TYPE http_requests_total counter",
+        ]
+        latencia = [
+            "# HELP http_request_duration_seconds Latência das requisições por rota.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        sql_por_requisicao = [
+            "# HELP sql_statements_per_request Comandos SQL executados por requisição.",
+            "# TYPE sql_statements_per_request histogram",
+        ]
+        sql_total = [
+            "# HELP sql_statements_total Comandos SQL executados por rota.",
+            "# TYPE sql_statements_total counter",
+        ]
+        sql_tempo = [
+            "# HELP sql_duration_seconds_total Tempo gasto em SQL por rota.",
+            "# TYPE sql_duration_seconds_total counter",
+        ]
+        for (metodo, rota), valores in sorted(series.items()):
+            status, baldes, soma, baldes_sql, comandos, segundos = valores
+            rotulos = f'method="{metodo}",route="{_escapar(rota)}"'
+            for codigo, quantidade in sorted(status.items()):
+                requisicoes.append(
+                    f'http_requests_total{{{rotulos},status="{codigo}"}} {quantidade}'
+                )
+            latencia.extend(self._linhas_histograma(
+                "http_request_duration_seconds", rotulos, BALDES_LATENCIA, baldes, soma
+            ))
+            sql_por_requisicao.extend(self._linhas_histograma(
+                "sql_statements_per_request", rotulos, BALDES_SQL, baldes_sql, comandos
+            ))
+            sql_total.append(f"sql_statements_total{{{rotulos}}} {comandos}")
+            sql_tempo.append(f"sql_duration_seconds_total{{{rotulos}}} {segundos}")
+
+        return "\n".join(requisicoes + latencia + sql_por_requisicao + sql_total + sql_tempo) + "\n"
+
+    def exportar(self):
+        return Response(self.texto(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+    def limpar(self):
+        with self._lock:
+            self._series.clear()
+        self.gravar()
+
+
+metricas = Metricas()
@@ -0,0 +1,5 @@
+"""Benchmarks dos microsserviços.
+
+Cada serviço tem pacotes de mesmo nome (`models`, `controllers`, `config`),
+então cada script carrega um único serviço por processo.
+"""
@@ -0,0 +1,26 @@
+import importlib
+import os
+import sys
+import tempfile
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def banco_temporario(nome):
+    """Cria um diretório temporário e devolve a URL de um banco SQLite dentro dele."""
+    diretorio = tempfile.mkdtemp(prefix=f"bench_{nome}_")
+    return f"sqlite:///{os.path.join(diretorio, nome + '.db')}"
+
+
+def carregar_servico(nome, database_url=None):
+    """Cria o app do serviço `nome` apontando para `database_url`, com as tabelas criadas.
+
+    Só pode ser chamado uma vez por processo; depois dele os pacotes `models`
+    e `controllers` do serviço ficam importáveis.
+    """
+    os.environ["DATABASE_URL"] = database_url or banco_temporario(nome)
+    sys.path.insert(0, os.path.join(RAIZ, nome))
+    modulo = importlib.import_module("app")
+    app = modulo.create_app()
+    modulo.init_db(app)
+    return app
@@ -0,0 +1,60 @@
+"""Compara a importação de alunos um a um (POST /alunos) com POST /alunos/bulk.
+
+Uso: python -m benchmarks.bulk_alunos [--alunos 2000]
+"""
+import argparse
+import json
+import time
+
+from benchmarks._servico import carregar_servico
+
+
+def gerar_alunos(quantidade, turma_id):
+    for i in range(quantidade):
+        yield {
+            "nome": f"Aluno {i}",
+            "idade": 10 + i % 8,
+            "data_nascimento": f"{2008 + i % 8}-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+            "turma_id": turma_id,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--alunos", type=int, default=2000)
+    args = parser.parse_args()
+
+    cliente = carregar_servico("gerenciamento").test_client()
+    cliente.post("/professores", json={"nome": "Professor", "idade": 40, "materia": "Matemática"})
+    turma_id = cliente.post("/turmas", json={"descricao": "Turma", "professor_id": 1}).get_json()["id"]
+    alunos = list(gerar_alunos(args.alunos, turma_id))
+
+    inicio = time.perf_counter()
+    for aluno in alunos:
+        cliente.post("/alunos", json=aluno)
+    por_linha = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    resposta = cliente.post("/alunos/bulk", json=alunos)
+    bulk_json = time.perf_counter() - inicio
+    assert resposta.get_json()["inseridos"] == args.alunos
+
+    ndjson = "\n".join(json.dumps(aluno) for aluno in alunos)
+    inicio = time.perf_counter()
+    resposta = cliente.post("/alunos/bulk", data=ndjson, content_type="application/x-ndjson")
+    bulk_ndjson = time.perf_counter() - inicio
+    assert resposta.get_json()["inseridos"] == args.alunos
+
+    print(json.dumps({
+        "benchmark": "bulk_alunos",
+        "alunos": args.alunos,
+        "por_linha_linhas_s": round(args.alunos / por_linha),
+        "bulk_json_linhas_s": round(args.alunos / bulk_json),
+        "bulk_ndjson_linhas_s": round(args.alunos / bulk_ndjson),
+        "ganho_json": round(por_linha / bulk_json, 1),
+        "ganho_ndjson": round(por_linha / bulk_ndjson, 1),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
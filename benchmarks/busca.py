@@ -0,0 +1,111 @@
+"""Latência de GET /alunos/busca (FTS5) contra um LIKE '%...%' em nome.
+
+Os alunos semeados recebem nomes compostos de listas com e sem acento (o
+UPDATE passa pelos gatilhos do índice). Para cada consulta mede a mediana
+da rota de busca, primeira página, e de um SELECT com LIKE por palavra na
+tabela alunos, que varre a tabela inteira e não casa "joao" com "João";
+a diferença aparece em `encontrados`.
+
+Uso: python -m benchmarks.busca [--alunos 100000] [--repeticoes 20]
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+from urllib.parse import quote
+
+from benchmarks._servico import carregar_servico
+from benchmarks.sementes import ALUNOS_POR_TURMA, semear_gerenciamento
+
+PRENOMES = [
+    "João", "José", "Antônio", "Conceição", "Inês", "Lúcia", "Márcio", "Fábio", "Cecília", "Débora",
+    "Ana", "Maria", "Pedro", "Paulo", "Lucas", "Gabriel", "Rafael", "Juliana", "Camila", "Bruno"
+]
+SOBRENOMES = [
+    "Araújo", "Conceição", "Gonçalves", "Simões", "Magalhães", "Estêvão", "Brandão", "Falcão",
+    "Silva", "Souza", "Oliveira", "Pereira", "Lima", "Costa", "Ribeiro", "Almeida", "Carvalho"
+]
+CONSULTAS = ["joao", "conceicao", "antonio goncalves", "ines simoes", "fab", "silva"]
+
+
+def renomear(rng):
+    from models import db
+    from models.aluno import Aluno
+    from sqlalchemy import bindparam, select
+
+    ids = db.session.execute(select(Aluno.id)).scalars().all()
+    db.session.execute(
+        Aluno.__table__.update().where(Aluno.id == bindparam("b_id")),
+        [
+            {"b_id": aluno_id, "nome": f"{rng.choice(PRENOMES)} {rng.choice(SOBRENOMES)} {rng.choice(SOBRENOMES)}"}
+            for aluno_id in ids
+        ]
+    )
+    db.session.commit()
+
+
+def mediana_ms(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return round(statistics.median(tempos) * 1000, 2), resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--alunos", type=int, default=100000)
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args()
+
+    app = carregar_servico("gerenciamento")
+    rng = random.Random(42)
+    with app.app_context():
+        ctx = semear_gerenciamento(args.alunos / (1000 * ALUNOS_POR_TURMA), rng)
+        renomear(rng)
+    cliente = app.test_client()
+
+    from models import db
+    from models.aluno import Aluno
+    from services.busca import ALUNOS
+    from sqlalchemy import func, select, text
+
+    resultados = {}
+    for consulta in CONSULTAS:
+        def buscar():
+            resposta = cliente.get(f"/alunos/busca?q={quote(consulta)}")
+            if resposta.status_code != 200:
+                raise SystemExit(f"busca '{consulta}': {resposta.status_code}")
+            return len(resposta.get_json()["dados"])
+
+        def like():
+            with app.app_context():
+                condicoes = [Aluno.nome.like(f"%{palavra}%") for palavra in consulta.split()]
+                return db.session.execute(select(func.count()).where(*condicoes)).scalar()
+
+        with app.app_context():
+            total = db.session.execute(
+                text(f"SELECT count(*) FROM {ALUNOS.nome} WHERE {ALUNOS.nome} MATCH :q"),
+                {"q": ALUNOS.expressao(consulta)}
+            ).scalar()
+        ms_busca, pagina = mediana_ms(buscar, args.repeticoes)
+        ms_like, encontrados_like = mediana_ms(like, args.repeticoes)
+        resultados[consulta] = {
+            "busca_ms": ms_busca,
+            "busca_pagina": pagina,
+            "busca_encontrados": total,
+            "like_ms": ms_like,
+            "like_encontrados": encontrados_like,
+        }
+
+    print(json.dumps({
+        "benchmark": "busca",
+        "alunos": ctx["alunos"],
+        "resultados": resultados,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""Carga mista de leitura e escrita sobre todas as rotas de cada serviço.
+
+Popula um banco SQLite temporário com `benchmarks.sementes`, dispara as
+operações de `benchmarks.cenarios` em várias threads durante um tempo fixo e
+grava vazão e latências p50/p95/p99 (total e por rota) em JSON.
+
+Uso:
+    python -m benchmarks.carga --servico todos --segundos 20 --saida resultado.json
+    python -m benchmarks.carga --servico tarefas --servidor   # HTTP real, servidor local
+
+Cada serviço roda num subprocesso próprio, pois os três usam pacotes de mesmo nome.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+from benchmarks._servico import RAIZ, carregar_servico
+from benchmarks.estatisticas import resumir
+
+SERVICOS = ("gerenciamento", "tarefas", "agendamentos")
+
+
+def _commit_atual():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _executar_thread(cliente, operacoes, ctx, prazo, semente, resultados):
+    rng = random.Random(semente)
+    pesos = [peso for peso, _, _ in operacoes]
+    latencias = {}
+    status = {}
+    while time.perf_counter() < prazo:
+        _, nome, funcao = rng.choices(operacoes, weights=pesos)[0]
+        inicio = time.perf_counter()
+        codigo = funcao(cliente, ctx, rng)
+        decorrido = time.perf_counter() - inicio
+        if codigo is None:
+            continue
+        latencias.setdefault(nome, []).append(decorrido)
+        contagem = status.setdefault(nome, {})
+        contagem[codigo] = contagem.get(codigo, 0) + 1
+    resultados.append((latencias, status))
+
+
+def medir_servico(servico, args):
+    from benchmarks.cenarios import CENARIOS, preparar_contexto
+    from benchmarks.sementes import SEMENTES
+
+    with contextlib.redirect_stdout(sys.stderr):
+        app = carregar_servico(servico)
+        inicio = time.perf_counter()
+        with app.app_context():
+            semente = SEMENTES[servico](args.escala, random.Random(args.semente))
+        preparo = time.perf_counter() - inicio
+    ctx = preparar_contexto(servico, semente)
+
+    with contextlib.ExitStack() as pilha:
+        if args.servidor:
+            from benchmarks.clientes import ServidorLocal
+            servidor = pilha.enter_context(ServidorLocal(app, args.threads))
+            novo_cliente = servidor.cliente
+        else:
+            from benchmarks.clientes import ClienteTeste
+            novo_cliente = lambda: ClienteTeste(app)  # noqa: E731
+
+        resultados = []
+        prazo = time.perf_counter() + args.segundos
+        threads = [
+            threading.Thread(
+                target=_executar_thread,
+                args=(novo_cliente(), CENARIOS[servico], ctx, prazo, args.semente + i, resultados)
+            )
+            for i in range(args.threads)
+        ]
+        inicio = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        duracao = time.perf_counter() - inicio
+
+    latencias, status = {}, {}
+    for parcial_latencias, parcial_status in resultados:
+        for nome, valores in parcial_latencias.items():
+            latencias.setdefault(nome, []).extend(valores)
+        for nome, contagem in parcial_status.items():
+            destino = status.setdefault(nome, {})
+            for codigo, quantidade in contagem.items():
+                destino[str(codigo)] = destino.get(str(codigo), 0) + quantidade
+
+    rotas = {}
+    for _, nome, _ in CENARIOS[servico]:
+        rotas[nome] = resumir(latencias.get(nome, []), duracao)
+        rotas[nome]["status"] = status.get(nome, {})
+        rotas[nome]["erros_5xx"] = sum(q for c, q in status.get(nome, {}).items() if c.startswith("5"))
+
+    return {
+        "servico": servico,
+        "modo": "http" if args.servidor else "test_client",
+        "volumes": {k: v for k, v in semente.items() if isinstance(v, int)},
+        "preparo_s": round(preparo, 2),
+        "duracao_s": round(duracao, 2),
+        "total": resumir([v for valores in latencias.values() for v in valores], duracao),
+        "rotas": rotas,
+    }
+
+
+def _medir_em_subprocesso(servico, args):
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as arquivo:
+        saida = arquivo.name
+    comando = [
+        sys.executable, "-m", "benchmarks.carga",
+        "--servico", servico,
+        "--segundos", str(args.segundos),
+        "--threads", str(args.threads),
+        "--escala", str(args.escala),
+        "--semente", str(args.semente),
+        "--saida", saida,
+    ] + (["--servidor"] if args.servidor else [])
+    subprocess.run(comando, cwd=RAIZ, check=True)
+    with open(saida) as arquivo:
+        relatorio = json.load(arquivo)
+    os.remove(saida)
+    return relatorio["servicos"][0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--servico", choices=SERVICOS + ("todos",), default="todos")
+    parser.add_argument("--segundos", type=float, default=10)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--escala", type=float, default=0.2,
+                        help="Fração do volume de uma escola grande (1 = 1000 turmas)")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--servidor", action="store_true",
+                        help="Usa HTTP real contra um servidor local em vez do test client")
+    parser.add_argument("--saida", help="Arquivo JSON de saída (padrão: stdout)")
+    args = parser.parse_args()
+
+    if args.servico == "todos":
+        servicos = [_medir_em_subprocesso(servico, args) for servico in SERVICOS]
+    else:
+        servicos = [medir_servico(args.servico, args)]
+
+    relatorio = {
+        "data": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _commit_atual(),
+        "python": platform.python_version(),
+        "parametros": {
+            "segundos": args.segundos,
+            "threads": args.threads,
+            "escala": args.escala,
+            "semente": args.semente,
+        },
+        "servicos": servicos,
+    }
+    texto = json.dumps(relatorio, indent=2, ensure_ascii=False)
+    if args.saida:
+        with open(args.saida, "w") as arquivo:
+            arquivo.write(texto + "\n")
+    else:
+        print(texto)
+
+
+if __name__ == "__main__":
+    main()
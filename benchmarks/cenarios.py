@@ -0,0 +1,431 @@
+"""Operações de carga de cada serviço: (peso, nome da rota, função).
+
+Cada função recebe (cliente, ctx, rng) e devolve o status HTTP, ou None
+quando não havia o que fazer (por exemplo, nada criado para apagar).
+`ctx` é o retorno da semente mais as filas de ids criados durante a carga.
+"""
+import itertools
+import json
+from collections import deque
+
+HORARIOS = [(h * 60, h * 60 + 50) for h in range(7, 22)]
+
+
+def _hora(minuto):
+    return f"{minuto // 60:02d}:{minuto % 60:02d}"
+
+
+def _criar(ctx, fila, status, corpo):
+    if status == 201:
+        ctx[fila].append(json.loads(corpo)["id"])
+    return status
+
+
+def _retirar(ctx, fila):
+    try:
+        return ctx[fila].popleft()
+    except IndexError:
+        return None
+
+
+def _get(cli, caminho, headers=None):
+    return cli.request("GET", caminho, headers=headers)[0]
+
+
+def acompanhar_alteracoes(cli, ctx, rng):
+    """Consumidor do feed: pede só o que mudou desde o último cursor."""
+    status, _, corpo = cli.request("GET", f"/changes?since={ctx['cursor_alteracoes']}&limit=500")
+    if status == 200:
+        ctx["cursor_alteracoes"] = max(ctx["cursor_alteracoes"], json.loads(corpo)["next"])
+    return status
+
+
+# --- gerenciamento ---------------------------------------------------------
+
+def _aluno(ctx, rng):
+    return {
+        "nome": f"Aluno carga {rng.randrange(10**6)}",
+        "idade": rng.randint(6, 17),
+        "data_nascimento": f"{rng.randint(2008, 2019)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        "turma_id": rng.randint(1, ctx["turmas"]),
+    }
+
+
+def listar_alunos_pagina(cli, ctx, rng):
+    return _get(cli, f"/alunos?limit=100&after={rng.randrange(ctx['alunos'])}")
+
+
+def exportar_alunos_turma(cli, ctx, rng):
+    return _get(cli, f"/alunos/export?format=csv&turma_id={rng.randint(1, ctx['turmas'])}")
+
+
+def listar_alunos_arquivados(cli, ctx, rng):
+    return _get(cli, f"/alunos?incluir_arquivados=true&limit=100&after={rng.randrange(ctx['alunos'])}")
+
+
+def pesquisar_alunos(cli, ctx, rng):
+    return _get(cli, f"/alunos/busca?q=aluno+{rng.randint(1, ctx['alunos'])}")
+
+
+def listar_alunos_stream(cli, ctx, rng):
+    return _get(cli, "/alunos?stream=true")
+
+
+def buscar_aluno(cli, ctx, rng):
+    return _get(cli, f"/alunos/{rng.randint(1, ctx['alunos'])}")
+
+
+def criar_aluno(cli, ctx, rng):
+    status, _, corpo = cli.request("POST", "/alunos", _aluno(ctx, rng))
+    return _criar(ctx, "alunos_criados", status, corpo)
+
+
+def importar_alunos(cli, ctx, rng):
+    linhas = "\n".join(json.dumps(_aluno(ctx, rng)) for _ in range(50))
+    return cli.request("POST", "/alunos/bulk", linhas, content_type="application/x-ndjson")[0]
+
+
+def atualizar_aluno(cli, ctx, rng):
+    corpo = {"nota_primeiro_semestre": round(rng.uniform(0, 10), 1)}
+    return cli.request("PUT", f"/alunos/{rng.randint(1, ctx['alunos'])}", corpo)[0]
+
+
+def remover_aluno(cli, ctx, rng):
+    aluno_id = _retirar(ctx, "alunos_criados")
+    return None if aluno_id is None else cli.request("DELETE", f"/alunos/{aluno_id}")[0]
+
+
+def listar_turmas(cli, ctx, rng):
+    status, headers, _ = cli.request("GET", "/turmas")
+    ctx["etag_turmas"] = headers.get("ETag")
+    return status
+
+
+def listar_turmas_condicional(cli, ctx, rng):
+    etag = ctx.get("etag_turmas")
+    return _get(cli, "/turmas", headers={"If-None-Match": etag} if etag else None)
+
+
+def buscar_turma(cli, ctx, rng):
+    return _get(cli, f"/turmas/{rng.randint(1, ctx['turmas'])}")
+
+
+def roster_turma(cli, ctx, rng):
+    return _get(cli, f"/turmas/{rng.randint(1, ctx['turmas'])}/roster")
+
+
+def listar_turmas_expandidas(cli, ctx, rng):
+    return _get(cli, f"/turmas?expand=professor,alunos&limit=50&after={rng.randint(0, ctx['turmas'])}")
+
+
+def criar_turma(cli, ctx, rng):
+    corpo = {"descricao": "Turma carga", "professor_id": rng.randint(1, ctx["professores"])}
+    status, _, resposta = cli.request("POST", "/turmas", corpo)
+    return _criar(ctx, "turmas_criadas", status, resposta)
+
+
+def atualizar_turma(cli, ctx, rng):
+    corpo = {"descricao": f"Turma {rng.randrange(10**6)}"}
+    return cli.request("PUT", f"/turmas/{rng.randint(1, ctx['turmas'])}", corpo)[0]
+
+
+def remover_turma(cli, ctx, rng):
+    turma_id = _retirar(ctx, "turmas_criadas")
+    return None if turma_id is None else cli.request("DELETE", f"/turmas/{turma_id}")[0]
+
+
+def listar_professores(cli, ctx, rng):
+    return _get(cli, "/professores")
+
+
+def buscar_professor(cli, ctx, rng):
+    return _get(cli, f"/professores/{rng.randint(1, ctx['professores'])}")
+
+
+def criar_professor(cli, ctx, rng):
+    corpo = {"nome": "Professor carga", "idade": rng.randint(25, 65), "materia": "Física"}
+    status, _, resposta = cli.request("POST", "/professores", corpo)
+    return _criar(ctx, "professores_criados", status, resposta)
+
+
+def atualizar_professor(cli, ctx, rng):
+    corpo = {"observacoes": f"Sala {rng.randint(1, 40)}"}
+    return cli.request("PUT", f"/professores/{rng.randint(1, ctx['professores'])}", corpo)[0]
+
+
+def remover_professor(cli, ctx, rng):
+    professor_id = _retirar(ctx, "professores_criados")
+    return None if professor_id is None else cli.request("DELETE", f"/professores/{professor_id}")[0]
+
+
+def verificar_existencia(cli, ctx, rng):
+    alunos = ",".join(str(rng.randint(1, ctx["alunos"] + 100)) for _ in range(30))
+    return _get(cli, f"/existencia?alunos={alunos}&turmas={rng.randint(1, ctx['turmas'])}")
+
+
+# --- tarefas ---------------------------------------------------------------
+
+def _turma_tarefa(ctx, rng):
+    return rng.randint(1, ctx["turmas"])
+
+
+def listar_tarefas(cli, ctx, rng):
+    return _get(cli, "/tarefas")
+
+
+def filtrar_tarefas(cli, ctx, rng):
+    return _get(cli, f"/tarefas?turma_id={_turma_tarefa(ctx, rng)}&data_entrega_de=2026-04-01")
+
+
+def buscar_tarefa(cli, ctx, rng):
+    return _get(cli, f"/tarefas/{rng.randint(1, ctx['tarefas'])}")
+
+
+def pesquisar_tarefas(cli, ctx, rng):
+    return _get(cli, f"/tarefas/busca?q=tarefa+{rng.randint(1, 8)}+turma+{_turma_tarefa(ctx, rng)}")
+
+
+def criar_tarefa(cli, ctx, rng):
+    corpo = {
+        "nome_tarefa": "Tarefa carga",
+        "descricao": "Criada pelo benchmark",
+        "peso_porcento": 10,
+        "data_entrega": "2026-11-30",
+        "turma_id": _turma_tarefa(ctx, rng),
+        "professor_id": 1,
+    }
+    status, _, resposta = cli.request("POST", "/tarefas", corpo)
+    return _criar(ctx, "tarefas_criadas", status, resposta)
+
+
+def atualizar_tarefa(cli, ctx, rng):
+    corpo = {"descricao": f"Revisada {rng.randrange(10**6)}"}
+    return cli.request("PUT", f"/tarefas/{rng.randint(1, ctx['tarefas'])}", corpo)[0]
+
+
+def remover_tarefa(cli, ctx, rng):
+    tarefa_id = _retirar(ctx, "tarefas_criadas")
+    return None if tarefa_id is None else cli.request("DELETE", f"/tarefas/{tarefa_id}")[0]
+
+
+def estatisticas_tarefa(cli, ctx, rng):
+    return _get(cli, f"/tarefas/{rng.randint(1, ctx['tarefas'])}/estatisticas")
+
+
+def lancar_notas_tarefa(cli, ctx, rng):
+    tarefa_id = rng.randint(1, ctx["tarefas"])
+    turma_id = (tarefa_id - 1) // 8 + 1
+    primeiro = (turma_id - 1) * ctx["alunos_por_turma"] + 1
+    corpo = [
+        {"aluno_id": aluno_id, "nota": round(rng.uniform(0, 10), 1)}
+        for aluno_id in range(primeiro, primeiro + ctx["alunos_por_turma"])
+    ]
+    return cli.request("PUT", f"/tarefas/{tarefa_id}/avaliacoes", corpo)[0]
+
+
+def listar_avaliacoes(cli, ctx, rng):
+    return _get(cli, "/avaliacoes")
+
+
+def filtrar_avaliacoes(cli, ctx, rng):
+    aluno_id = rng.randint(1, ctx["turmas"] * ctx["alunos_por_turma"])
+    return _get(cli, f"/avaliacoes?aluno_id={aluno_id}")
+
+
+def buscar_avaliacao(cli, ctx, rng):
+    return _get(cli, f"/avaliacoes/{rng.randint(1, ctx['avaliacoes'])}")
+
+
+def criar_avaliacao(cli, ctx, rng):
+    corpo = {
+        "nota": round(rng.uniform(0, 10), 1),
+        "aluno_id": next(ctx["novos_alunos"]),
+        "tarefa_id": rng.randint(1, ctx["tarefas"]),
+    }
+    status, _, resposta = cli.request("POST", "/avaliacoes", corpo)
+    return _criar(ctx, "avaliacoes_criadas", status, resposta)
+
+
+def atualizar_avaliacao(cli, ctx, rng):
+    corpo = {"nota": round(rng.uniform(0, 10), 1)}
+    return cli.request("PUT", f"/avaliacoes/{rng.randint(1, ctx['avaliacoes'])}", corpo)[0]
+
+
+def remover_avaliacao(cli, ctx, rng):
+    avaliacao_id = _retirar(ctx, "avaliacoes_criadas")
+    return None if avaliacao_id is None else cli.request("DELETE", f"/avaliacoes/{avaliacao_id}")[0]
+
+
+def medias_turma(cli, ctx, rng):
+    return _get(cli, f"/turmas/{_turma_tarefa(ctx, rng)}/medias")
+
+
+def media_aluno(cli, ctx, rng):
+    turma_id = _turma_tarefa(ctx, rng)
+    aluno_id = (turma_id - 1) * ctx["alunos_por_turma"] + rng.randint(1, ctx["alunos_por_turma"])
+    return _get(cli, f"/turmas/{turma_id}/medias/{aluno_id}")
+
+
+def boletim_aluno(cli, ctx, rng):
+    return _get(cli, f"/alunos/{rng.randint(1, ctx['turmas'] * ctx['alunos_por_turma'])}/boletim")
+
+
+def avaliacoes_turma(cli, ctx, rng):
+    return _get(cli, f"/turmas/{_turma_tarefa(ctx, rng)}/avaliacoes")
+
+
+def recalcular_medias(cli, ctx, rng):
+    return cli.request("POST", f"/turmas/{_turma_tarefa(ctx, rng)}/medias/recalcular")[0]
+
+
+# --- agendamentos ----------------------------------------------------------
+
+def _agendamento(ctx, rng):
+    minuto_inicio, minuto_fim = rng.choice(HORARIOS)
+    return {
+        "num_sala": rng.randint(1, ctx["salas"]),
+        "lab": False,
+        "data": rng.choice(ctx["dias"]),
+        "turma_id": rng.randint(1, 1000),
+        "hora_inicio": _hora(minuto_inicio),
+        "hora_fim": _hora(minuto_fim),
+    }
+
+
+def listar_agendamentos(cli, ctx, rng):
+    return _get(cli, "/agendamentos")
+
+
+def filtrar_agendamentos(cli, ctx, rng):
+    return _get(cli, f"/agendamentos?data={rng.choice(ctx['dias'])}&num_sala={rng.randint(1, ctx['salas'])}")
+
+
+def disponibilidade_salas(cli, ctx, rng):
+    lab = "&lab=true" if rng.random() < 0.5 else ""
+    return _get(cli, f"/agendamentos/disponibilidade?data={rng.choice(ctx['dias'])}&duracao=90{lab}")
+
+
+def listar_ocorrencias(cli, ctx, rng):
+    inicio = rng.randrange(len(ctx["dias"]) - 5)
+    return _get(cli, f"/agendamentos/ocorrencias?data_de={ctx['dias'][inicio]}"
+                     f"&data_ate={ctx['dias'][inicio + 5]}&num_sala={rng.randint(1, ctx['salas'])}")
+
+
+def criar_recorrencia(cli, ctx, rng):
+    # Salas acima das semeadas, para que os conflitos venham só entre recorrências.
+    minuto_inicio, minuto_fim = rng.choice(HORARIOS)
+    corpo = {
+        "num_sala": ctx["salas"] + rng.randint(1, 50),
+        "lab": False,
+        "turma_id": rng.randint(1, 1000),
+        "dia_semana": rng.randint(0, 4),
+        "data_inicio": ctx["dias"][0],
+        "data_fim": ctx["dias"][-1],
+        "hora_inicio": _hora(minuto_inicio),
+        "hora_fim": _hora(minuto_fim),
+    }
+    status, _, resposta = cli.request("POST", "/recorrencias", corpo)
+    return _criar(ctx, "recorrencias_criadas", status, resposta)
+
+
+def remover_recorrencia(cli, ctx, rng):
+    recorrencia_id = _retirar(ctx, "recorrencias_criadas")
+    return None if recorrencia_id is None else cli.request("DELETE", f"/recorrencias/{recorrencia_id}")[0]
+
+
+def buscar_agendamento(cli, ctx, rng):
+    return _get(cli, f"/agendamentos/{rng.randint(1, ctx['agendamentos'])}")
+
+
+def criar_agendamento(cli, ctx, rng):
+    status, _, resposta = cli.request("POST", "/agendamentos", _agendamento(ctx, rng))
+    return _criar(ctx, "agendamentos_criados", status, resposta)
+
+
+def atualizar_agendamento(cli, ctx, rng):
+    corpo = {"turma_id": rng.randint(1, 1000)}
+    return cli.request("PUT", f"/agendamentos/{rng.randint(1, ctx['agendamentos'])}", corpo)[0]
+
+
+def remover_agendamento(cli, ctx, rng):
+    agendamento_id = _retirar(ctx, "agendamentos_criados")
+    return None if agendamento_id is None else cli.request("DELETE", f"/agendamentos/{agendamento_id}")[0]
+
+
+CENARIOS = {
+    "gerenciamento": [
+        (20, "GET /alunos?limit", listar_alunos_pagina),
+        (1, "GET /alunos?stream", listar_alunos_stream),
+        (2, "GET /alunos?incluir_arquivados&limit", listar_alunos_arquivados),
+        (1, "GET /alunos/export?turma_id", exportar_alunos_turma),
+        (3, "GET /alunos/busca?q", pesquisar_alunos),
+        (20, "GET /alunos/<id>", buscar_aluno),
+        (5, "POST /alunos", criar_aluno),
+        (1, "POST /alunos/bulk", importar_alunos),
+        (5, "PUT /alunos/<id>", atualizar_aluno),
+        (3, "DELETE /alunos/<id>", remover_aluno),
+        (3, "GET /turmas", listar_turmas),
+        (5, "GET /turmas (If-None-Match)", listar_turmas_condicional),
+        (10, "GET /turmas/<id>", buscar_turma),
+        (5, "GET /turmas/<id>/roster", roster_turma),
+        (2, "GET /turmas?expand", listar_turmas_expandidas),
+        (2, "POST /turmas", criar_turma),
+        (2, "PUT /turmas/<id>", atualizar_turma),
+        (1, "DELETE /turmas/<id>", remover_turma),
+        (3, "GET /professores", listar_professores),
+        (5, "GET /professores/<id>", buscar_professor),
+        (1, "POST /professores", criar_professor),
+        (1, "PUT /professores/<id>", atualizar_professor),
+        (1, "DELETE /professores/<id>", remover_professor),
+        (5, "GET /existencia", verificar_existencia),
+        (3, "GET /changes", acompanhar_alteracoes),
+    ],
+    "tarefas": [
+        (1, "GET /tarefas", listar_tarefas),
+        (10, "GET /tarefas?turma_id&data_entrega_de", filtrar_tarefas),
+        (3, "GET /tarefas/busca?q", pesquisar_tarefas),
+        (15, "GET /tarefas/<id>", buscar_tarefa),
+        (3, "POST /tarefas", criar_tarefa),
+        (3, "PUT /tarefas/<id>", atualizar_tarefa),
+        (2, "DELETE /tarefas/<id>", remover_tarefa),
+        (5, "PUT /tarefas/<id>/avaliacoes", lancar_notas_tarefa),
+        (5, "GET /tarefas/<id>/estatisticas", estatisticas_tarefa),
+        (1, "GET /avaliacoes", listar_avaliacoes),
+        (10, "GET /avaliacoes?aluno_id", filtrar_avaliacoes),
+        (15, "GET /avaliacoes/<id>", buscar_avaliacao),
+        (4, "POST /avaliacoes", criar_avaliacao),
+        (4, "PUT /avaliacoes/<id>", atualizar_avaliacao),
+        (2, "DELETE /avaliacoes/<id>", remover_avaliacao),
+        (10, "GET /turmas/<id>/medias", medias_turma),
+        (10, "GET /turmas/<id>/medias/<aluno_id>", media_aluno),
+        (15, "GET /alunos/<id>/boletim", boletim_aluno),
+        (5, "GET /turmas/<id>/avaliacoes", avaliacoes_turma),
+        (1, "POST /turmas/<id>/medias/recalcular", recalcular_medias),
+        (3, "GET /changes", acompanhar_alteracoes),
+    ],
+    "agendamentos": [
+        (1, "GET /agendamentos", listar_agendamentos),
+        (10, "GET /agendamentos?data&num_sala", filtrar_agendamentos),
+        (10, "GET /agendamentos/disponibilidade", disponibilidade_salas),
+        (5, "GET /agendamentos/ocorrencias", listar_ocorrencias),
+        (2, "POST /recorrencias", criar_recorrencia),
+        (1, "DELETE /recorrencias/<id>", remover_recorrencia),
+        (20, "GET /agendamentos/<id>", buscar_agendamento),
+        (10, "POST /agendamentos", criar_agendamento),
+        (3, "PUT /agendamentos/<id>", atualizar_agendamento),
+        (3, "DELETE /agendamentos/<id>", remover_agendamento),
+        (3, "GET /changes", acompanhar_alteracoes),
+    ],
+}
+
+
+def preparar_contexto(servico, semente):
+    """Acrescenta ao retorno da semente as filas de ids criados durante a carga."""
+    ctx = dict(semente)
+    for fila in ("alunos_criados", "turmas_criadas", "professores_criados", "tarefas_criadas",
+                 "avaliacoes_criadas", "agendamentos_criados", "recorrencias_criadas"):
+        ctx[fila] = deque()
+    ctx["cursor_alteracoes"] = 0
+    if servico == "tarefas":
+        ctx["novos_alunos"] = itertools.count(10**7)
+    return ctx
@@ -0,0 +1,62 @@
+"""Clientes usados pela carga: o test client do Flask ou HTTP real contra um servidor local."""
+import json
+import threading
+
+import urllib3
+from werkzeug.serving import make_server
+
+
+class ClienteTeste:
+    """Executa as requisições em processo, sem rede, pelo test client do Flask."""
+
+    def __init__(self, app):
+        self._cliente = app.test_client()
+
+    def request(self, metodo, caminho, corpo=None, headers=None, content_type=None):
+        kwargs = {"headers": headers or {}}
+        if isinstance(corpo, (bytes, str)):
+            kwargs.update(data=corpo, content_type=content_type)
+        elif corpo is not None:
+            kwargs["json"] = corpo
+        resposta = self._cliente.open(caminho, method=metodo, **kwargs)
+        return resposta.status_code, resposta.headers, resposta.get_data()
+
+
+class ClienteHTTP:
+    """Executa as requisições por HTTP com conexões keep-alive."""
+
+    def __init__(self, url_base, pool):
+        self.url_base = url_base
+        self._pool = pool
+
+    def request(self, metodo, caminho, corpo=None, headers=None, content_type=None):
+        headers = dict(headers or {})
+        if corpo is not None and not isinstance(corpo, (bytes, str)):
+            corpo = json.dumps(corpo)
+            content_type = "application/json"
+        if content_type:
+            headers["Content-Type"] = content_type
+        resposta = self._pool.request(
+            metodo, self.url_base + caminho, body=corpo, headers=headers, retries=False
+        )
+        return resposta.status, resposta.headers, resposta.data
+
+
+class ServidorLocal:
+    """Sobe o app num servidor WSGI com threads, numa porta livre, em segundo plano."""
+
+    def __init__(self, app, threads):
+        self._servidor = make_server("127.0.0.1", 0, app, threaded=True)
+        self._thread = threading.Thread(target=self._servidor.serve_forever, daemon=True)
+        self._pool = urllib3.PoolManager(maxsize=threads)
+        self.url_base = f"http://127.0.0.1:{self._servidor.server_port}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._servidor.shutdown()
+
+    def cliente(self):
+        return ClienteHTTP(self.url_base, self._pool)
@@ -0,0 +1,85 @@
+"""Mede o custo da verificação de conflito de salas conforme a tabela cresce.
+
+Uso: python -m benchmarks.conflitos_agendamentos [--consultas 2000]
+"""
+import argparse
+import json
+import random
+import time
+from datetime import date, timedelta
+
+from benchmarks._servico import carregar_servico
+
+TAMANHOS = (1_000, 10_000, 100_000, 500_000)
+SALAS = 80
+HORARIOS = [(h * 60, h * 60 + 50) for h in range(7, 22)]
+
+
+def gerar_agendamentos(quantidade, inicio_id):
+    inicio = date(2020, 1, 1)
+    for i in range(inicio_id, inicio_id + quantidade):
+        minuto_inicio, minuto_fim = HORARIOS[i % len(HORARIOS)]
+        yield {
+            "num_sala": (i // len(HORARIOS)) % SALAS + 1,
+            "lab": False,
+            "data": inicio + timedelta(days=i // (len(HORARIOS) * SALAS)),
+            "turma_id": i % 300 + 1,
+            "hora_inicio": f"{minuto_inicio // 60:02d}:{minuto_inicio % 60:02d}",
+            "hora_fim": f"{minuto_fim // 60:02d}:{minuto_fim % 60:02d}",
+            "minuto_inicio": minuto_inicio,
+            "minuto_fim": minuto_fim,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--consultas", type=int, default=2000)
+    args = parser.parse_args()
+
+    app = carregar_servico("agendamentos")
+    from models import db
+    from models.agendamentos import Agendamento
+
+    rng = random.Random(42)
+    resultados = []
+
+    with app.app_context():
+        total = 0
+        for tamanho in TAMANHOS:
+            linhas = list(gerar_agendamentos(tamanho - total, total))
+            db.session.execute(Agendamento.__table__.insert(), linhas)
+            db.session.commit()
+            total = tamanho
+            ultimo_dia = linhas[-1]["data"]
+            dias = (ultimo_dia - date(2020, 1, 1)).days + 1
+
+            inicio = time.perf_counter()
+            for _ in range(args.consultas):
+                minuto = rng.randrange(7 * 60, 21 * 60)
+                Agendamento.buscar_conflito(
+                    rng.randrange(1, SALAS + 1),
+                    date(2020, 1, 1) + timedelta(days=rng.randrange(dias)),
+                    minuto,
+                    minuto + 90,
+                )
+            decorrido = time.perf_counter() - inicio
+            resultados.append({
+                "agendamentos": total,
+                "consultas": args.consultas,
+                "us_por_consulta": round(decorrido / args.consultas * 1e6, 1),
+            })
+
+        plano = db.session.execute(db.text(
+            "EXPLAIN QUERY PLAN SELECT id FROM agendamentos "
+            "WHERE num_sala = 1 AND data = '2020-01-01' AND minuto_inicio < 600 AND minuto_fim > 480"
+        )).all()
+
+    print(json.dumps({
+        "benchmark": "conflitos_agendamentos",
+        "plano": [linha[-1] for linha in plano],
+        "resultados": resultados,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Conta os comandos SQL de GET /turmas/<id>/roster e GET /turmas?expand=.
+
+Com o carregamento antecipado, o número de SELECTs deve ser o mesmo para
+qualquer quantidade de turmas e alunos (sem N+1). O script falha se variar.
+
+Uso: python -m benchmarks.consultas_roster [--escalas 0.01,0.05,0.2]
+"""
+import argparse
+import json
+import random
+import time
+
+from sqlalchemy import event
+
+from benchmarks._servico import carregar_servico
+from benchmarks.sementes import semear_gerenciamento
+
+CONSULTAS = [
+    ("roster", lambda ctx: f"/turmas/{ctx['turmas']}/roster"),
+    ("expand_pagina", lambda ctx: "/turmas?expand=professor,alunos&limit=100"),
+    ("expand_completo", lambda ctx: "/turmas?expand=professor,alunos"),
+]
+
+
+def medir(app, cliente, caminho):
+    comandos = []
+
+    def contar(conn, cursor, sql, parametros, contexto, executemany):
+        comandos.append(sql)
+
+    with app.app_context():
+        from models import db
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", contar)
+    try:
+        inicio = time.perf_counter()
+        resposta = cliente.get(caminho)
+        duracao = time.perf_counter() - inicio
+    finally:
+        event.remove(engine, "before_cursor_execute", contar)
+    assert resposta.status_code == 200, resposta.get_data(as_text=True)
+    # A leitura das versões feita pelo ETag não depende do volume; só os
+    # SELECTs das entidades interessam aqui.
+    selects = [sql for sql in comandos if "versoes_colecoes" not in sql]
+    return len(selects), round(duracao * 1000, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--escalas", default="0.01,0.05,0.2")
+    args = parser.parse_args()
+
+    app = carregar_servico("gerenciamento")
+    cliente = app.test_client()
+    rng = random.Random(42)
+
+    resultados = []
+    for escala in (float(e) for e in args.escalas.split(",")):
+        with app.app_context():
+            from models import db
+            tabelas = ("alunos", "turmas", "professores")
+            for tabela in tabelas:
+                db.session.execute(db.text(f"DELETE FROM {tabela}"))
+            # As tabelas são AUTOINCREMENT; a semente conta com ids a partir de 1.
+            db.session.execute(
+                db.text("DELETE FROM sqlite_sequence WHERE name IN :nomes").bindparams(
+                    db.bindparam("nomes", expanding=True)
+                ),
+                {"nomes": list(tabelas)}
+            )
+            db.session.commit()
+            ctx = semear_gerenciamento(escala, rng)
+        linha = {"turmas": ctx["turmas"], "alunos": ctx["alunos"]}
+        for nome, caminho in CONSULTAS:
+            linha[f"{nome}_consultas"], linha[f"{nome}_ms"] = medir(app, cliente, caminho(ctx))
+        resultados.append(linha)
+
+    print(json.dumps({"benchmark": "consultas_roster", "resultados": resultados}, indent=2))
+    for nome, _ in CONSULTAS:
+        contagens = {linha[f"{nome}_consultas"] for linha in resultados}
+        if len(contagens) != 1:
+            raise SystemExit(f"{nome}: número de consultas varia com o volume ({sorted(contagens)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+import math
+
+
+def percentil(ordenados, p):
+    """Percentil por posição mais próxima (nearest-rank) de uma lista já ordenada."""
+    if not ordenados:
+        return None
+    posicao = max(1, math.ceil(p / 100 * len(ordenados)))
+    return ordenados[posicao - 1]
+
+
+def resumir(latencias, segundos):
+    """Resume latências (em segundos) em vazão e percentis em milissegundos."""
+    ordenados = sorted(latencias)
+    quantidade = len(ordenados)
+    if not quantidade:
+        return {"requisicoes": 0, "vazao_rps": 0}
+    return {
+        "requisicoes": quantidade,
+        "vazao_rps": round(quantidade / segundos, 1),
+        "media_ms": round(sum(ordenados) / quantidade * 1000, 3),
+        "p50_ms": round(percentil(ordenados, 50) * 1000, 3),
+        "p95_ms": round(percentil(ordenados, 95) * 1000, 3),
+        "p99_ms": round(percentil(ordenados, 99) * 1000, 3),
+        "max_ms": round(ordenados[-1] * 1000, 3),
+    }
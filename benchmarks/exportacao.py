@@ -0,0 +1,87 @@
+"""Memória e tempo até o primeiro byte da exportação de alunos.
+
+Compara GET /alunos (lista JSON montada inteira) com GET /alunos/export em
+CSV e NDJSON (linhas lidas com `yield_per` e enviadas em blocos), sobre o
+mesmo banco. Os tempos vêm de uma leitura normal e o pico de memória de
+outra, sob tracemalloc; nas duas o corpo é lido bloco a bloco sem ser
+guardado. O CSV e o NDJSON são conferidos contra a lista JSON antes.
+
+Uso: python -m benchmarks.exportacao [--alunos 100000]
+"""
+import argparse
+import csv
+import io
+import json
+import random
+import time
+import tracemalloc
+
+from benchmarks._servico import carregar_servico
+from benchmarks.sementes import ALUNOS_POR_TURMA, semear_gerenciamento
+
+
+def ler(cliente, url):
+    """Lê a resposta bloco a bloco sem guardá-la; retorna (primeiro byte, total, bytes) em s."""
+    inicio = time.perf_counter()
+    resposta = cliente.get(url, buffered=False)
+    primeiro = None
+    tamanho = 0
+    for bloco in resposta.response:
+        if primeiro is None:
+            primeiro = time.perf_counter() - inicio
+        tamanho += len(bloco)
+    total = time.perf_counter() - inicio
+    resposta.close()
+    return primeiro, total, tamanho
+
+
+def medir(cliente, url):
+    """Tempos numa leitura normal e pico de memória numa segunda, sob tracemalloc."""
+    primeiro, total, tamanho = ler(cliente, url)
+    tracemalloc.start()
+    ler(cliente, url)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "primeiro_byte_ms": round(primeiro * 1000, 1),
+        "total_ms": round(total * 1000, 1),
+        "pico_mb": round(pico / 2**20, 1),
+        "bytes": tamanho,
+    }
+
+
+def conferir(lista, csv_corpo, ndjson_corpo):
+    lista = json.loads(lista)
+    linhas = list(csv.DictReader(io.StringIO(csv_corpo.decode())))
+    if [linha["id"] for linha in linhas] != [str(aluno["id"]) for aluno in lista]:
+        raise SystemExit("csv: ids diferentes da listagem")
+    if [json.loads(linha) for linha in ndjson_corpo.splitlines()] != lista:
+        raise SystemExit("ndjson: linhas diferentes da listagem")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--alunos", type=int, default=100000)
+    args = parser.parse_args()
+
+    app = carregar_servico("gerenciamento")
+    with app.app_context():
+        ctx = semear_gerenciamento(args.alunos / (1000 * ALUNOS_POR_TURMA), random.Random(42))
+    cliente = app.test_client()
+
+    urls = {
+        "lista_json": "/alunos",
+        "export_csv": "/alunos/export?format=csv",
+        "export_ndjson": "/alunos/export?format=ndjson",
+    }
+    conferir(*(cliente.get(url).get_data() for url in urls.values()))
+    resultados = {nome: medir(cliente, url) for nome, url in urls.items()}
+    print(json.dumps({
+        "benchmark": "exportacao",
+        "alunos": ctx["alunos"],
+        "resultados": resultados,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Latência de GET /turmas/<id>/painel com os três serviços em HTTP real.
+
+Tarefas e agendamentos sobem em subprocessos, com `--atraso-ms` somado a
+cada requisição para simular a rede; o gerenciamento roda neste processo.
+Compara o painel (chamadas em paralelo) com as mesmas chamadas feitas uma
+depois da outra, como o frontend fazia.
+
+Uso: python -m benchmarks.painel [--escala 0.05] [--requisicoes 200] [--atraso-ms 20]
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import time
+
+from benchmarks._servico import RAIZ, carregar_servico
+from benchmarks.estatisticas import resumir
+from benchmarks.sementes import SEMENTES
+
+PREFIXO_URL = "URL "
+
+
+def servir(servico, args):
+    """Modo subprocesso: semeia o serviço, sobe o servidor e espera o stdin fechar."""
+    from benchmarks.clientes import ServidorLocal
+
+    app = carregar_servico(servico)
+    with app.app_context():
+        SEMENTES[servico](args.escala, random.Random(args.semente))
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    if args.atraso_ms:
+        app.before_request(lambda: time.sleep(args.atraso_ms / 1000))
+    with ServidorLocal(app, threads=16) as servidor:
+        print(PREFIXO_URL + servidor.url_base, flush=True)
+        sys.stdin.read()
+
+
+def subir(servico, args):
+    processo = subprocess.Popen(
+        [
+            sys.executable, "-m", "benchmarks.painel",
+            "--servir", servico,
+            "--escala", str(args.escala),
+            "--semente", str(args.semente),
+            "--atraso-ms", str(args.atraso_ms),
+        ],
+        cwd=RAIZ, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True
+    )
+    for linha in processo.stdout:
+        if linha.startswith(PREFIXO_URL):
+            return processo, linha[len(PREFIXO_URL):].strip()
+    raise SystemExit(f"{servico}: o servidor não subiu")
+
+
+def sequencial(app, turma_id):
+    """As mesmas consultas do painel, uma de cada vez."""
+    from controllers.painel_controller import PainelController
+    from controllers.turma_controller import TurmaController
+    from services.servicos_client import servicos
+
+    with app.test_request_context(f"/turmas/{turma_id}/roster"):
+        TurmaController.get_roster(turma_id)
+        for servico, caminho, campos in PainelController._chamadas(turma_id, {}).values():
+            servicos._get(servico, caminho, campos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--escala", type=float, default=0.05)
+    parser.add_argument("--requisicoes", type=int, default=200)
+    parser.add_argument("--atraso-ms", type=float, default=20)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--servir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.servir:
+        servir(args.servir, args)
+        return
+
+    processos = []
+    try:
+        for servico in ("tarefas", "agendamentos"):
+            processo, url = subir(servico, args)
+            processos.append(processo)
+            os.environ[f"{servico.upper()}_URL"] = url
+
+        app = carregar_servico("gerenciamento")
+        with app.app_context():
+            volumes = SEMENTES["gerenciamento"](args.escala, random.Random(args.semente))
+        cliente = app.test_client()
+        rng = random.Random(args.semente)
+        turmas = [rng.randint(1, volumes["turmas"]) for _ in range(args.requisicoes)]
+
+        resposta = cliente.get(f"/turmas/{turmas[0]}/painel").get_json()
+        if resposta["parcial"]:
+            raise SystemExit(f"Painel parcial: {json.dumps(resposta['fontes'])}")
+
+        resultados = {}
+        for nome, executar in (
+            ("sequencial", lambda turma_id: sequencial(app, turma_id)),
+            ("paralelo", lambda turma_id: cliente.get(f"/turmas/{turma_id}/painel")),
+        ):
+            latencias = []
+            inicio_total = time.perf_counter()
+            for turma_id in turmas:
+                inicio = time.perf_counter()
+                executar(turma_id)
+                latencias.append(time.perf_counter() - inicio)
+            resultados[nome] = resumir(latencias, time.perf_counter() - inicio_total)
+    finally:
+        for processo in processos:
+            processo.stdin.close()
+            processo.wait(timeout=30)
+
+    print(json.dumps({
+        "benchmark": "painel",
+        "escala": args.escala,
+        "atraso_ms": args.atraso_ms,
+        "chamadas_remotas": len(resposta["fontes"]),
+        "resultados": resultados,
+        "ganho_p50": round(resultados["sequencial"]["p50_ms"] / resultados["paralelo"]["p50_ms"], 2),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Compara a vazão de leitura e escrita concorrentes para cada perfil SQLite.
+
+Uso: python -m benchmarks.perfis_sqlite [--leitores 8] [--escritores 2] [--segundos 5]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from benchmarks._servico import RAIZ
+
+sys.path.insert(0, os.path.join(RAIZ, "gerenciamento"))
+from config import SQLITE_PERFIS  # noqa: E402
+from database.connection import configurar_sqlite  # noqa: E402
+
+LINHAS_INICIAIS = 50_000
+
+
+def preparar(engine):
+    with engine.begin() as conexao:
+        conexao.execute(text(
+            "CREATE TABLE alunos (id INTEGER PRIMARY KEY, nome TEXT NOT NULL, turma_id INTEGER NOT NULL)"
+        ))
+        conexao.execute(text("CREATE INDEX ix_alunos_turma ON alunos (turma_id)"))
+        conexao.execute(
+            text("INSERT INTO alunos (nome, turma_id) VALUES (:nome, :turma_id)"),
+            [{"nome": f"Aluno {i}", "turma_id": i % 500} for i in range(LINHAS_INICIAIS)]
+        )
+
+
+def trabalhador(engine, escrita, prazo, contadores, semente):
+    rng = random.Random(semente)
+    operacoes = erros = 0
+    while time.perf_counter() < prazo:
+        try:
+            with engine.begin() as conexao:
+                if escrita:
+                    conexao.execute(
+                        text("INSERT INTO alunos (nome, turma_id) VALUES (:nome, :turma_id)"),
+                        {"nome": "Novo", "turma_id": rng.randrange(500)}
+                    )
+                else:
+                    conexao.execute(
+                        text("SELECT id, nome FROM alunos WHERE turma_id = :turma_id"),
+                        {"turma_id": rng.randrange(500)}
+                    ).all()
+            operacoes += 1
+        except OperationalError:
+            erros += 1
+    chave = "escritas" if escrita else "leituras"
+    with contadores["lock"]:
+        contadores[chave] += operacoes
+        contadores["erros"] += erros
+
+
+def medir(perfil, args):
+    caminho = os.path.join(tempfile.mkdtemp(prefix="bench_perfil_"), "bench.db")
+    engine = create_engine(
+        f"sqlite:///{caminho}",
+        pool_size=args.leitores + args.escritores
+    )
+    configurar_sqlite(engine, SQLITE_PERFIS[perfil])
+    preparar(engine)
+
+    contadores = {"lock": threading.Lock(), "leituras": 0, "escritas": 0, "erros": 0}
+    prazo = time.perf_counter() + args.segundos
+    threads = [
+        threading.Thread(target=trabalhador, args=(engine, i < args.escritores, prazo, contadores, i))
+        for i in range(args.leitores + args.escritores)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+
+    return {
+        "perfil": perfil,
+        "leituras_s": round(contadores["leituras"] / args.segundos),
+        "escritas_s": round(contadores["escritas"] / args.segundos),
+        "erros_lock": contadores["erros"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--leitores", type=int, default=8)
+    parser.add_argument("--escritores", type=int, default=2)
+    parser.add_argument("--segundos", type=float, default=5)
+    args = parser.parse_args()
+
+    print(json.dumps({
+        "benchmark": "perfis_sqlite",
+        "leitores": args.leitores,
+        "escritores": args.escritores,
+        "resultados": [medir(perfil, args) for perfil in SQLITE_PERFIS],
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Popula o banco de cada serviço com volumes realistas.
+
+As inserções usam executemany do SQLAlchemy Core para que a preparação não
+domine o tempo do benchmark. `escala=1` corresponde a uma escola grande:
+200 professores, 1000 turmas de 30 alunos, 8 tarefas por turma com todas
+as avaliações lançadas e um ano letivo de agendamentos em 40 salas.
+"""
+from datetime import date, timedelta
+
+ALUNOS_POR_TURMA = 30
+TAREFAS_POR_TURMA = 8
+HORARIOS = [(h * 60, h * 60 + 50) for h in range(7, 22)]
+LOTE = 5000
+
+
+def _inserir(db, tabela, linhas):
+    for inicio in range(0, len(linhas), LOTE):
+        db.session.execute(tabela.insert(), linhas[inicio:inicio + LOTE])
+    db.session.commit()
+
+
+def semear_gerenciamento(escala, rng):
+    from models import db
+    from models.aluno import Aluno
+    from models.professor import Professor
+    from models.turma import Turma
+
+    professores = max(1, int(200 * escala))
+    turmas = max(1, int(1000 * escala))
+    _inserir(db, Professor.__table__, [
+        {"nome": f"Professor {i}", "idade": 25 + i % 40, "materia": f"Matéria {i % 12}", "observacoes": None}
+        for i in range(1, professores + 1)
+    ])
+    _inserir(db, Turma.__table__, [
+        {"descricao": f"Turma {i}", "professor_id": rng.randint(1, professores), "ativo": True}
+        for i in range(1, turmas + 1)
+    ])
+    _inserir(db, Aluno.__table__, [
+        {
+            "nome": f"Aluno {i}",
+            "idade": 6 + i % 12,
+            "turma_id": (i - 1) // ALUNOS_POR_TURMA + 1,
+            "data_nascimento": date(2008, 1, 1) + timedelta(days=i % 3650),
+            "nota_primeiro_semestre": round(rng.uniform(0, 10), 1),
+            "nota_segundo_semestre": round(rng.uniform(0, 10), 1),
+            "media_final": None,
+        }
+        for i in range(1, turmas * ALUNOS_POR_TURMA + 1)
+    ])
+    return {"professores": professores, "turmas": turmas, "alunos": turmas * ALUNOS_POR_TURMA}
+
+
+def semear_tarefas(escala, rng):
+    from models import db
+    from models.avaliacoes import Avaliacao
+    from models.estatisticas import EstatisticaTarefa
+    from models.medias import MediaAluno
+    from models.tarefas import Tarefa
+
+    turmas = max(1, int(1000 * escala))
+    pesos = [12] * (TAREFAS_POR_TURMA - 1) + [100 - 12 * (TAREFAS_POR_TURMA - 1)]
+    tarefas = []
+    avaliacoes = []
+    for turma_id in range(1, turmas + 1):
+        for indice, peso in enumerate(pesos):
+            tarefa_id = len(tarefas) + 1
+            tarefas.append({
+                "nome_tarefa": f"Tarefa {indice + 1} da turma {turma_id}",
+                "descricao": "Lista de exercícios e trabalho em grupo",
+                "peso_porcento": peso,
+                "data_entrega": date(2026, 2, 1) + timedelta(days=indice * 30),
+                "turma_id": turma_id,
+                "professor_id": turma_id % 200 + 1,
+            })
+            for k in range(ALUNOS_POR_TURMA):
+                avaliacoes.append({
+                    "nota": round(rng.uniform(0, 10), 1),
+                    "aluno_id": (turma_id - 1) * ALUNOS_POR_TURMA + k + 1,
+                    "tarefa_id": tarefa_id,
+                })
+    _inserir(db, Tarefa.__table__, tarefas)
+    _inserir(db, Avaliacao.__table__, avaliacoes)
+    for turma_id in range(1, turmas + 1):
+        MediaAluno.recalcular_turma(turma_id)
+    EstatisticaTarefa.recalcular()
+    db.session.commit()
+    return {
+        "turmas": turmas,
+        "tarefas": len(tarefas),
+        "avaliacoes": len(avaliacoes),
+        "alunos_por_turma": ALUNOS_POR_TURMA,
+    }
+
+
+def semear_agendamentos(escala, rng):
+    from models import db
+    from models.agendamentos import Agendamento
+    from models.salas import Sala
+
+    salas = max(5, int(40 * escala))
+    dias = [
+        date(2026, 2, 2) + timedelta(days=d)
+        for d in range(300)
+        if (date(2026, 2, 2) + timedelta(days=d)).weekday() < 5
+    ][:200]
+    linhas = []
+    for dia in dias:
+        for sala in range(1, salas + 1):
+            for minuto_inicio, minuto_fim in HORARIOS:
+                if rng.random() < 0.6:
+                    linhas.append({
+                        "num_sala": sala,
+                        "lab": sala % 5 == 0,
+                        "data": dia,
+                        "turma_id": rng.randint(1, 1000),
+                        "hora_inicio": f"{minuto_inicio // 60:02d}:{minuto_inicio % 60:02d}",
+                        "hora_fim": f"{minuto_fim // 60:02d}:{minuto_fim % 60:02d}",
+                        "minuto_inicio": minuto_inicio,
+                        "minuto_fim": minuto_fim,
+                    })
+    _inserir(db, Agendamento.__table__, linhas)
+    Sala.sincronizar()
+    db.session.commit()
+    return {"salas": salas, "dias": [d.isoformat() for d in dias], "agendamentos": len(linhas)}
+
+
+SEMENTES = {
+    "gerenciamento": semear_gerenciamento,
+    "tarefas": semear_tarefas,
+    "agendamentos": semear_agendamentos,
+}
@@ -0,0 +1,102 @@
+"""Compara o caminho antigo das listagens com o de colunas + provedor JSON rápido.
+
+Mede GET /alunos completo em três versões, sobre o mesmo banco:
+
+- orm: objetos ORM, ``to_dict`` por linha e o provedor JSON padrão do Flask
+  (como a listagem era antes);
+- colunas: linhas do Core com o serializador gerado, ainda com o provedor
+  padrão;
+- rapido: colunas + ``ProvedorJSON`` (orjson, se instalado).
+
+As três respostas são comparadas antes da medição.
+
+Uso: python -m benchmarks.serializacao [--alunos 100000] [--repeticoes 5]
+"""
+import argparse
+import json
+import random
+import time
+
+from flask.json.provider import DefaultJSONProvider
+
+from benchmarks._servico import carregar_servico
+from benchmarks.sementes import ALUNOS_POR_TURMA, semear_gerenciamento
+
+
+def caminho_orm(provedor):
+    from models.aluno import Aluno
+
+    alunos = Aluno.query.order_by(Aluno.id).all()
+    return provedor.response([aluno.to_dict() for aluno in alunos])
+
+
+def caminho_colunas(provedor):
+    from controllers.aluno_controller import AlunoController
+    from models.aluno import Aluno
+
+    linha = AlunoController.LINHA
+    return provedor.response(linha.lista(linha.selecionar(Aluno.query).order_by(Aluno.id)))
+
+
+def medir(app, funcao, provedor, repeticoes):
+    from models import db
+
+    tempos = []
+    for _ in range(repeticoes):
+        with app.test_request_context("/alunos"):
+            inicio = time.perf_counter()
+            corpo = funcao(provedor).get_data()
+            tempos.append(time.perf_counter() - inicio)
+            db.session.remove()
+    return min(tempos), corpo
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--alunos", type=int, default=100000)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    app = carregar_servico("gerenciamento")
+    with app.app_context():
+        ctx = semear_gerenciamento(args.alunos / (1000 * ALUNOS_POR_TURMA), random.Random(42))
+
+    from utils.serializacao import ProvedorJSON, orjson
+
+    padrao = DefaultJSONProvider(app)
+    rapido = ProvedorJSON(app)
+    variantes = [
+        ("orm", caminho_orm, padrao),
+        ("colunas", caminho_colunas, padrao),
+        ("rapido", caminho_colunas, rapido),
+    ]
+
+    resultados = {}
+    referencia = None
+    for nome, funcao, provedor in variantes:
+        segundos, corpo = medir(app, funcao, provedor, args.repeticoes)
+        dados = json.loads(corpo)
+        if referencia is None:
+            referencia = dados
+        elif dados != referencia:
+            raise SystemExit(f"{nome}: resposta diferente da listagem via ORM")
+        resultados[nome] = {
+            "ms": round(segundos * 1000, 1),
+            "linhas_s": round(len(dados) / segundos),
+            "bytes": len(corpo),
+        }
+
+    base = resultados["orm"]["ms"]
+    for nome in ("colunas", "rapido"):
+        resultados[nome]["ganho"] = round(base / resultados[nome]["ms"], 2)
+
+    print(json.dumps({
+        "benchmark": "serializacao",
+        "alunos": ctx["alunos"],
+        "orjson": orjson is not None,
+        "resultados": resultados,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,31 @@
-from flask import Flask
+import click
+from flask import Blueprint, Flask
 from flasgger import Swagger
 from models import db
+from models.versao import VersaoColecao
 from models.aluno import Aluno
 from models.turma import Turma
 from models.professor import Professor
+from models.alteracoes import Alteracao
 from config import Config
+from database.connection import configurar_sqlite
+from utils.etag import condicional
+from utils.metricas import metricas
+from utils.perfilamento import perfilamento
+from utils.serializacao import ProvedorJSON
 from controllers.aluno_controller import AlunoController
 from controllers.turma_controller import TurmaController
 from controllers.professor_controller import ProfessorController
+from controllers.existencia_controller import ExistenciaController
+from controllers.painel_controller import PainelController
+from controllers.alteracoes_controller import AlteracaoController
+from controllers.arquivamento_controller import ArquivamentoController
+from services import busca
+from services.servicos_client import servicos
 
-app = Flask(__name__)
-app.config.from_object(Config)
+rotas = Blueprint("gerenciamento", __name__)
 
-db.init_app(app)
-
-
-swagger = Swagger(app, template={
+SWAGGER_TEMPLATE = {
     "swagger": "2.0",
     "info": {
         "title": "API de gerenciamento escolar",
@@ -24,20 +34,110 @@ swagger = Swagger(app, template={
     },
     "basePath": "/",
     "schemes": ["http"]
-})
+}
 
-@app.route("/alunos", methods=["GET"])
+@rotas.route("/alunos", methods=["GET"])
+@condicional("alunos")
 def get_alunos():
     """Listar todos os alunos
     ---
     tags: [Alunos]
+    parameters:
+      - name: turma_id
+        in: query
+        type: string
+        description: Id ou lista de ids separados por vírgula
+      - name: data_nascimento_de
+        in: query
+        type: string
+        description: Data mínima (AAAA-MM-DD)
+      - name: data_nascimento_ate
+        in: query
+        type: string
+        description: Data máxima (AAAA-MM-DD)
+      - name: atualizado_desde
+        in: query
+        type: string
+        description: Só registros alterados a partir deste instante (ISO 8601, UTC)
+      - name: incluir_arquivados
+        in: query
+        type: boolean
+        description: Inclui os alunos arquivados (tabela alunos_arquivo)
+      - name: limit
+        in: query
+        type: integer
+        description: Tamanho da página (máx. 1000). Ativa a paginação por cursor.
+      - name: after
+        in: query
+        type: integer
+        description: Cursor `next` devolvido pela página anterior
+      - name: stream
+        in: query
+        type: boolean
+        description: Envia a lista completa como JSON em blocos
     responses:
       200:
         description: Lista de alunos
+      400: {description: Parâmetros de paginação inválidos}
     """
     return AlunoController.get_alunos()
 
-@app.route("/alunos/<int:aluno_id>", methods=["GET"])
+@rotas.route("/alunos/export", methods=["GET"])
+def export_alunos():
+    """Exportar alunos em CSV ou NDJSON
+    ---
+    tags: [Alunos]
+    produces: [text/csv, application/x-ndjson]
+    parameters:
+      - name: format
+        in: query
+        type: string
+        enum: [csv, ndjson]
+        description: Formato do arquivo (padrão csv)
+      - name: incluir_arquivados
+        in: query
+        type: boolean
+        description: Inclui os registros arquivados
+    responses:
+      200:
+        description: >
+          Arquivo enviado em blocos à medida que as linhas são lidas, em
+          ordem de id. Aceita os mesmos filtros da listagem (turma_id, data_nascimento_de, ...).
+      400: {description: Formato ou filtro inválido}
+    """
+    return AlunoController.export_alunos()
+
+@rotas.route("/alunos/busca", methods=["GET"])
+@condicional("alunos")
+def buscar_alunos():
+    """Buscar alunos pelo nome
+    ---
+    tags: [Alunos]
+    parameters:
+      - name: q
+        in: query
+        type: string
+        required: true
+        description: Palavras a procurar; sem diferença de acentos e maiúsculas, cada palavra casa com o início de uma palavra
+      - name: limit
+        in: query
+        type: integer
+        description: Tamanho da página (padrão 20, máx. 100)
+      - name: offset
+        in: query
+        type: integer
+        description: Posição inicial; use o `next` devolvido pela página anterior
+    responses:
+      200:
+        description: >
+          Página de alunos do mais para o menos relevante, com `next`.
+          Aceita os filtros da listagem (turma_id, ...); alunos arquivados não entram.
+      400: {description: Busca vazia ou parâmetro inválido}
+    """
+    return AlunoController.buscar_alunos()
+
+@rotas.route("/alunos/<int:aluno_id>", methods=["GET"])
+@condicional("alunos")
 def get_aluno_by_id(aluno_id):
     """Buscar aluno por ID
     ---
@@ -47,13 +147,17 @@ def get_aluno_by_id(aluno_id):
         in: path
         type: integer
         required: true
+      - name: incluir_arquivados
+        in: query
+        type: boolean
+        description: Procura também no arquivo
     responses:
       200: {description: Aluno encontrado}
       404: {description: Aluno nÃ£o encontrado}
     """
     return AlunoController.get_aluno_by_id(aluno_id)
 
-@app.route("/alunos", methods=["POST"])
+@rotas.route("/alunos", methods=["POST"])
 def create_aluno():
     """Criar novo aluno
     ---
@@ -77,7 +181,35 @@ def create_aluno():
     """
     return AlunoController.create_aluno()
 
-@app.route("/alunos/<int:aluno_id>", methods=["PUT"])
+@rotas.route("/alunos/bulk", methods=["POST"])
+def create_alunos_bulk():
+    """Importar alunos em lote
+    ---
+    tags: [Alunos]
+    consumes: [application/json, application/x-ndjson]
+    parameters:
+      - in: body
+        name: body
+        description: Array JSON de alunos ou um aluno por linha (NDJSON)
+        schema:
+          type: array
+          items:
+            type: object
+            properties:
+              nome: {type: string}
+              idade: {type: integer}
+              data_nascimento: {type: string, format: date}
+              turma_id: {type: integer}
+              nota_primeiro_semestre: {type: number, format: float}
+              nota_segundo_semestre: {type: number, format: float}
+              media_final: {type: number, format: float}
+    responses:
+      200: {description: Relatório por linha com os alunos inseridos e os erros}
+      400: {description: Corpo da requisição inválido}
+    """
+    return AlunoController.create_alunos_bulk()
+
+@rotas.route("/alunos/<int:aluno_id>", methods=["PUT"])
 def update_aluno(aluno_id):
     """Atualizar aluno
     ---
@@ -97,7 +229,7 @@ def update_aluno(aluno_id):
     """
     return AlunoController.update_aluno(aluno_id)
 
-@app.route("/alunos/<int:aluno_id>", methods=["DELETE"])
+@rotas.route("/alunos/<int:aluno_id>", methods=["DELETE"])
 def delete_aluno(aluno_id):
     """Excluir aluno
     ---
@@ -113,17 +245,53 @@ def delete_aluno(aluno_id):
     """
     return AlunoController.delete_aluno(aluno_id)
 
-@app.route("/turmas", methods=["GET"])
+@rotas.route("/turmas", methods=["GET"])
+@condicional("turmas", expand={"professor": "professores", "alunos": "alunos"})
 def get_turmas():
     """Listar todas as turmas
     ---
     tags: [Turmas]
+    parameters:
+      - name: professor_id
+        in: query
+        type: string
+        description: Id ou lista de ids separados por vírgula
+      - name: ativo
+        in: query
+        type: boolean
+        description: Somente turmas ativas ou inativas
+      - name: atualizado_desde
+        in: query
+        type: string
+        description: Só registros alterados a partir deste instante (ISO 8601, UTC)
+      - name: incluir_arquivados
+        in: query
+        type: boolean
+        description: Inclui as turmas arquivadas (tabela turmas_arquivo)
+      - name: expand
+        in: query
+        type: string
+        description: Relações a incluir, separadas por vírgula (professor, alunos)
+      - name: limit
+        in: query
+        type: integer
+        description: Tamanho da página (máx. 1000). Ativa a paginação por cursor.
+      - name: after
+        in: query
+        type: integer
+        description: Cursor `next` devolvido pela página anterior
+      - name: stream
+        in: query
+        type: boolean
+        description: Envia a lista completa como JSON em blocos
     responses:
       200: {description: Lista de turmas}
+      400: {description: Parâmetros de paginação ou expand inválidos (expand não vale com incluir_arquivados)}
     """
     return TurmaController.get_turmas()
 
-@app.route("/turmas/<int:turma_id>", methods=["GET"])
+@rotas.route("/turmas/<int:turma_id>", methods=["GET"])
+@condicional("turmas")
 def get_turma_by_id(turma_id):
     """Buscar turma por ID
     ---
@@ -133,13 +301,63 @@ def get_turma_by_id(turma_id):
         in: path
         type: integer
         required: true
+      - name: incluir_arquivados
+        in: query
+        type: boolean
+        description: Procura também no arquivo
     responses:
       200: {description: Turma encontrada}
       404: {description: Turma nÃ£o encontrada}
     """
     return TurmaController.get_turma_by_id(turma_id)
 
-@app.route("/turmas", methods=["POST"])
+@rotas.route("/turmas/<int:turma_id>/roster", methods=["GET"])
+@condicional("turmas", "alunos", "professores")
+def get_roster(turma_id):
+    """Turma com professor e alunos
+    ---
+    tags: [Turmas]
+    parameters:
+      - name: turma_id
+        in: path
+        type: integer
+        required: true
+    responses:
+      200: {description: Turma com o professor e a lista de alunos ordenada por nome}
+      404: {description: Turma não encontrada}
+    """
+    return TurmaController.get_roster(turma_id)
+
+@rotas.route("/turmas/<int:turma_id>/painel", methods=["GET"])
+def get_painel(turma_id):
+    """Painel da turma com dados dos três serviços
+    ---
+    tags: [Turmas]
+    parameters:
+      - name: turma_id
+        in: path
+        type: integer
+        required: true
+      - name: data_de
+        in: query
+        type: string
+        description: Agendamentos a partir desta data (AAAA-MM-DD)
+      - name: data_ate
+        in: query
+        type: string
+        description: Agendamentos até esta data (AAAA-MM-DD)
+    responses:
+      200:
+        description: >
+          Turma com professor e alunos, tarefas, avaliações e médias (tarefas) e
+          agendamentos e recorrências (agendamentos), buscados em paralelo. Fontes
+          que falharam ou passaram do prazo vêm como null, com o motivo em
+          `fontes`, e `parcial` fica true.
+      404: {description: Turma não encontrada}
+    """
+    return PainelController.get_painel(turma_id)
+
+@rotas.route("/turmas", methods=["POST"])
 def create_turma():
     """Criar nova turma
     ---
@@ -159,7 +377,7 @@ def create_turma():
     """
     return TurmaController.create_turma()
 
-@app.route("/turmas/<int:turma_id>", methods=["PUT"])
+@rotas.route("/turmas/<int:turma_id>", methods=["PUT"])
 def update_turma(turma_id):
     """Atualizar turma
     ---
@@ -178,7 +396,7 @@ def update_turma(turma_id):
     """
     return TurmaController.update_turma(turma_id)
 
-@app.route("/turmas/<int:turma_id>", methods=["DELETE"])
+@rotas.route("/turmas/<int:turma_id>", methods=["DELETE"])
 def delete_turma(turma_id):
     """Excluir turma
     ---
@@ -194,17 +412,70 @@ def delete_turma(turma_id):
     """
     return TurmaController.delete_turma(turma_id)
 
-@app.route("/professores", methods=["GET"])
+@rotas.route("/professores", methods=["GET"])
+@condicional("professores")
 def get_professores():
     """Listar todos os professores
     ---
     tags: [Professores]
+    parameters:
+      - name: materia
+        in: query
+        type: string
+        description: Matéria (ou lista separada por vírgula)
+      - name: atualizado_desde
+        in: query
+        type: string
+        description: Só registros alterados a partir deste instante (ISO 8601, UTC)
+      - name: limit
+        in: query
+        type: integer
+        description: Tamanho da página (máx. 1000). Ativa a paginação por cursor.
+      - name: after
+        in: query
+        type: integer
+        description: Cursor `next` devolvido pela página anterior
+      - name: stream
+        in: query
+        type: boolean
+        description: Envia a lista completa como JSON em blocos
     responses:
       200: {description: Lista de professores}
+      400: {description: Parâmetros de paginação inválidos}
     """
     return ProfessorController.get_professores()
 
-@app.route("/professores/<int:professor_id>", methods=["GET"])
+@rotas.route("/professores/busca", methods=["GET"])
+@condicional("professores")
+def buscar_professores():
+    """Buscar professores por nome ou matéria
+    ---
+    tags: [Professores]
+    parameters:
+      - name: q
+        in: query
+        type: string
+        required: true
+        description: Palavras a procurar; sem diferença de acentos e maiúsculas, cada palavra casa com o início de uma palavra
+      - name: limit
+        in: query
+        type: integer
+        description: Tamanho da página (padrão 20, máx. 100)
+      - name: offset
+        in: query
+        type: integer
+        description: Posição inicial; use o `next` devolvido pela página anterior
+    responses:
+      200:
+        description: >
+          Página de professores do mais para o menos relevante, com `next`.
+          Casar no nome pesa mais que casar na matéria.
+      400: {description: Busca vazia ou parâmetro inválido}
+    """
+    return ProfessorController.buscar_professores()
+
+@rotas.route("/professores/<int:professor_id>", methods=["GET"])
+@condicional("professores")
 def get_professor_by_id(professor_id):
     """Buscar professor por ID
     ---
@@ -220,7 +491,7 @@ def get_professor_by_id(professor_id):
     """
     return ProfessorController.get_professor_by_id(professor_id)
 
-@app.route("/professores", methods=["POST"])
+@rotas.route("/professores", methods=["POST"])
 def create_professor():
     """Criar novo professor
     ---
@@ -241,7 +512,7 @@ def create_professor():
     """
     return ProfessorController.create_professor()
 
-@app.route("/professores/<int:professor_id>", methods=["PUT"])
+@rotas.route("/professores/<int:professor_id>", methods=["PUT"])
 def update_professor(professor_id):
     """Atualizar professor
     ---
@@ -260,7 +531,7 @@ def update_professor(professor_id):
     """
     return ProfessorController.update_professor(professor_id)
 
-@app.route("/professores/<int:professor_id>", methods=["DELETE"])
+@rotas.route("/professores/<int:professor_id>", methods=["DELETE"])
 def delete_professor(professor_id):
     """Excluir professor
     ---
@@ -276,11 +547,102 @@ def delete_professor(professor_id):
     """
     return ProfessorController.delete_professor(professor_id)
 
-def init_db():
+@rotas.route("/existencia", methods=["GET"])
+@condicional("alunos", "turmas", "professores")
+def get_existencia():
+    """Verificar em lote quais ids existem
+    ---
+    tags: [Existência]
+    parameters:
+      - name: alunos
+        in: query
+        type: string
+        description: Ids de alunos separados por vírgula
+      - name: turmas
+        in: query
+        type: string
+        description: Ids de turmas separados por vírgula
+      - name: professores
+        in: query
+        type: string
+        description: Ids de professores separados por vírgula
+    responses:
+      200: {description: Ids existentes de cada entidade consultada}
+      400: {description: Parâmetros inválidos}
+    """
+    return ExistenciaController.get_existencia()
+
+@rotas.route("/changes", methods=["GET"])
+def get_alteracoes():
+    """Feed de alterações (inserts, updates e deletes) a partir de um cursor
+    ---
+    tags: [Alterações]
+    parameters:
+      - name: since
+        in: query
+        type: integer
+        description: Último seq já consumido (padrão 0)
+      - name: limit
+        in: query
+        type: integer
+        description: Máximo de alterações (padrão 500, máx. 5000)
+      - name: colecao
+        in: query
+        type: string
+        description: Coleção ou lista separada por vírgulas (alunos, turmas, professores)
+    responses:
+      200:
+        description: >
+          Alterações com seq > since em ordem, cada uma com coleção, id,
+          operação e o estado da entidade (null nos deletes). `next` é o
+          cursor da próxima chamada e `mais` indica se há outra página.
+      400: {description: Parâmetros inválidos}
+    """
+    return AlteracaoController.get_alteracoes()
+
+@rotas.route("/arquivamento", methods=["POST"])
+def arquivar():
+    """Arquivar turmas inativas e seus alunos
+    ---
+    tags: [Arquivamento]
+    responses:
+      200:
+        description: >
+          Turmas inativas há mais de ARQUIVO_INATIVAS_DIAS dias e seus alunos
+          movidos para as tabelas de arquivo; quantidade movida por coleção
+      500: {description: Falha no meio do arquivamento (os lotes anteriores ficam arquivados)}
+    """
+    return ArquivamentoController.post_arquivar()
+
+def create_app(config=Config):
+    app = Flask(__name__)
+    app.config.from_object(config)
+    if app.config.get("JSON_RAPIDO", True):
+        app.json = ProvedorJSON(app)
+    db.init_app(app)
+    Alteracao.monitorar({Aluno: "alunos", Turma: "turmas", Professor: "professores"})
+    with app.app_context():
+        configurar_sqlite(db.engine, app.config["SQLITE_PRAGMAS"])
+        metricas.init_app(app, db.engine)
+        perfilamento.init_app(app, db.engine)
+    servicos.init_app(app)
+
+    @app.cli.command("arquivar")
+    def arquivar_comando():
+        """Arquiva as turmas inativas e seus alunos."""
+        click.echo(ArquivamentoController.arquivar())
+
+    Swagger(app, template=SWAGGER_TEMPLATE)
+    app.register_blueprint(rotas)
+    return app
+
+def init_db(app):
     with app.app_context():
         db.create_all()
+        busca.instalar()
         print("Banco de dados inicializado!")
 
 if __name__ == "__main__":
-    init_db()
+    app = create_app()
+    init_db(app)
     app.run(host="0.0.0.0", port=5050, debug=True)
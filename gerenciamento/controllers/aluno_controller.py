@@ -1,9 +1,41 @@
+import io
+import json
 from flask import request, jsonify
+from sqlalchemy.exc import IntegrityError
 from datetime import datetime
+from sqlalchemy import insert, select
 from models.aluno import Aluno, db
+from models.turma import Turma
+from models.alteracoes import Alteracao
+from models.versao import VersaoColecao
+from services.arquivamento import ALUNOS, incluir_arquivados
+from services import busca
+from utils.filtros import Filtro, aplicar_filtros, data_hora_iso, data_iso
+from utils.exportacao import exportar, ler_formato
+from utils.paginacao import ler_parametros, paginar, stream_json
+from utils.serializacao import Serializador
+
+TAMANHO_LOTE_BULK = 500
+TIPOS_NDJSON = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
 
 class AlunoController:
 
+    FILTROS = {
+        "id": Filtro(Aluno.id),
+        "turma_id": Filtro(Aluno.turma_id),
+        "data_nascimento_de": Filtro(Aluno.data_nascimento, ">=", data_iso),
+        "data_nascimento_ate": Filtro(Aluno.data_nascimento, "<=", data_iso),
+        "atualizado_desde": Filtro(Aluno.updated_at, ">=", data_hora_iso)
+    }
+
+    # Listagens leem só estas colunas e montam o mesmo dict de Aluno.to_dict.
+    LINHA = Serializador(
+        Aluno.id, Aluno.nome, Aluno.idade, Aluno.data_nascimento, Aluno.turma_id,
+        Aluno.nota_primeiro_semestre, Aluno.nota_segundo_semestre, Aluno.media_final,
+        Aluno.updated_at
+    )
+
     @staticmethod
     def _get_data():
         data = request.get_json()
@@ -11,21 +43,76 @@ class AlunoController:
             return None, jsonify({"error": "Dados inválidos"}), 400
         return data, None, None
 
+    @staticmethod
+    def _consulta():
+        """Colunas de LINHA com os filtros da query string, e a coluna de ordenação.
+
+        Com `incluir_arquivados` a consulta já vem unida ao arquivo.
+        """
+        linha = AlunoController.LINHA
+        query = linha.selecionar(aplicar_filtros(Aluno.query, AlunoController.FILTROS, request.args))
+        if not incluir_arquivados(request.args):
+            return query, Aluno.id
+        frio = aplicar_filtros(
+            ALUNOS.selecionar(linha.colunas), ALUNOS.filtros(AlunoController.FILTROS), request.args
+        )
+        return ALUNOS.unir(query, frio)
+
     @staticmethod
     def get_alunos():
         if request.method != 'GET':
             return jsonify({"error": "Método não permitido"}), 405
-        alunos = Aluno.query.all()
-        return jsonify([aluno.to_dict() for aluno in alunos]), 200
+        linha = AlunoController.LINHA
+        try:
+            limit, after, stream = ler_parametros()
+            query, coluna_id = AlunoController._consulta()
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        if stream:
+            return stream_json(query, coluna_id, linha)
+        if limit is None and after is None:
+            return jsonify(linha.lista(query.order_by(coluna_id))), 200
+        return jsonify(paginar(query, coluna_id, linha, limit, after)), 200
+
+    @staticmethod
+    def export_alunos():
+        if request.method != 'GET':
+            return jsonify({"error": "Método não permitido"}), 405
+        try:
+            formato = ler_formato()
+            query, coluna_id = AlunoController._consulta()
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        return exportar(query, coluna_id, AlunoController.LINHA, formato, "alunos")
+
+    @staticmethod
+    def buscar_alunos():
+        if request.method != 'GET':
+            return jsonify({"error": "Método não permitido"}), 405
+        linha = AlunoController.LINHA
+        try:
+            consulta, limit, offset = busca.ler_busca(request.args)
+            query = linha.selecionar(aplicar_filtros(Aluno.query, AlunoController.FILTROS, request.args))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify(busca.ALUNOS.paginar(query, consulta, linha, limit, offset)), 200
 
     @staticmethod
     def get_aluno_by_id(aluno_id):
         if request.method != 'GET':
             return jsonify({"error": "Método não permitido"}), 405
         aluno = Aluno.query.get(aluno_id)
-        if not aluno:
+        if aluno:
+            return jsonify(aluno.to_dict()), 200
+        try:
+            arquivados = incluir_arquivados(request.args)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        arquivado = ALUNOS.buscar(AlunoController.LINHA.colunas, aluno_id) if arquivados else None
+        if not arquivado:
             return jsonify({"error": "Aluno não encontrado"}), 404
-        return jsonify(aluno.to_dict()), 200
+        return jsonify(AlunoController.LINHA(arquivado)), 200
 
     @staticmethod
     def create_aluno():
@@ -52,7 +139,12 @@ class AlunoController:
         )
 
         db.session.add(novo_aluno)
-        db.session.commit()
+        try:
+            VersaoColecao.incrementar("alunos")
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return jsonify({"error": "Turma informada não existe"}), 400
         return jsonify(novo_aluno.to_dict()), 201
 
     @staticmethod
@@ -80,7 +172,12 @@ class AlunoController:
                 else:
                     setattr(aluno, campo, data[campo])
 
-        db.session.commit()
+        try:
+            VersaoColecao.incrementar("alunos")
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return jsonify({"error": "Turma informada não existe"}), 400
         return jsonify(aluno.to_dict()), 200
 
     @staticmethod
@@ -93,5 +190,130 @@ class AlunoController:
             return jsonify({"error": "Aluno não encontrado"}), 404
 
         db.session.delete(aluno)
+        VersaoColecao.incrementar("alunos")
         db.session.commit()
         return jsonify({"message": "Aluno deletado com sucesso"}), 200
+
+    @staticmethod
+    def _ler_linhas_bulk():
+        """Gera (numero_linha, dados, erro) a partir de um array JSON ou de NDJSON."""
+        if request.mimetype in TIPOS_NDJSON:
+            for numero, linha in enumerate(io.BufferedReader(request.stream), start=1):
+                linha = linha.strip()
+                if not linha:
+                    continue
+                try:
+                    yield numero, json.loads(linha), None
+                except ValueError:
+                    yield numero, None, "JSON inválido"
+            return
+
+        data = request.get_json(silent=True)
+        if not isinstance(data, list):
+            raise ValueError("Envie um array JSON ou NDJSON")
+        for numero, item in enumerate(data, start=1):
+            yield numero, item, None
+
+    @staticmethod
+    def _validar_linha_bulk(data):
+        if not isinstance(data, dict):
+            raise ValueError("Linha deve ser um objeto JSON")
+        for campo in ["nome", "idade", "data_nascimento", "turma_id"]:
+            if data.get(campo) is None:
+                raise ValueError(f"Campo obrigatório {campo} ausente")
+        if not isinstance(data["nome"], str):
+            raise ValueError("Campo nome deve ser texto")
+        for campo in ["idade", "turma_id"]:
+            if not isinstance(data[campo], int) or isinstance(data[campo], bool):
+                raise ValueError(f"Campo {campo} deve ser inteiro")
+        for campo in ["nota_primeiro_semestre", "nota_segundo_semestre", "media_final"]:
+            valor = data.get(campo)
+            if valor is not None and (not isinstance(valor, (int, float)) or isinstance(valor, bool)):
+                raise ValueError(f"Campo {campo} deve ser numérico")
+        try:
+            data_nascimento = datetime.strptime(data["data_nascimento"], "%Y-%m-%d").date()
+        except (TypeError, ValueError):
+            raise ValueError("Campo data_nascimento deve estar no formato AAAA-MM-DD")
+
+        return {
+            "nome": data["nome"],
+            "idade": data["idade"],
+            "data_nascimento": data_nascimento,
+            "turma_id": data["turma_id"],
+            "nota_primeiro_semestre": data.get("nota_primeiro_semestre"),
+            "nota_segundo_semestre": data.get("nota_segundo_semestre"),
+            "media_final": data.get("media_final")
+        }
+
+    @staticmethod
+    def _inserir_lote_bulk(lote, turmas_existentes, resultados):
+        """Insere um lote validado numa única transação (executemany)."""
+        novas_turmas = {row["turma_id"] for _, row in lote} - turmas_existentes
+        if novas_turmas:
+            turmas_existentes.update(db.session.execute(
+                select(Turma.id).where(Turma.id.in_(novas_turmas))
+            ).scalars())
+
+        validas = []
+        for numero, row in lote:
+            if row["turma_id"] in turmas_existentes:
+                validas.append((numero, row))
+            else:
+                resultados.append({"linha": numero, "status": "erro", "error": "Turma não encontrada"})
+        if not validas:
+            return
+
+        try:
+            ids = db.session.execute(
+                insert(Aluno).returning(Aluno.id, sort_by_parameter_order=True),
+                [row for _, row in validas]
+            ).scalars().all()
+            # O insert em lote passa por fora do ORM; o feed é gravado à mão.
+            linha = AlunoController.LINHA
+            Alteracao.registrar("alunos", Alteracao.INSERT, linha.lista(
+                linha.selecionar(Aluno.query).filter(Aluno.id.in_(ids)).order_by(Aluno.id)
+            ))
+            VersaoColecao.incrementar("alunos")
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            for numero, _ in validas:
+                resultados.append({"linha": numero, "status": "erro", "error": f"Erro ao inserir: {str(e)}"})
+            return
+
+        for (numero, _), aluno_id in zip(validas, ids):
+            resultados.append({"linha": numero, "status": "ok", "id": aluno_id})
+
+    @staticmethod
+    def create_alunos_bulk():
+        if request.method != 'POST':
+            return jsonify({"error": "Método não permitido"}), 405
+
+        resultados = []
+        turmas_existentes = set()
+        lote = []
+        try:
+            for numero, data, erro in AlunoController._ler_linhas_bulk():
+                if erro is None:
+                    try:
+                        lote.append((numero, AlunoController._validar_linha_bulk(data)))
+                    except ValueError as e:
+                        erro = str(e)
+                if erro is not None:
+                    resultados.append({"linha": numero, "status": "erro", "error": erro})
+                if len(lote) >= TAMANHO_LOTE_BULK:
+                    AlunoController._inserir_lote_bulk(lote, turmas_existentes, resultados)
+                    lote = []
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        if lote:
+            AlunoController._inserir_lote_bulk(lote, turmas_existentes, resultados)
+
+        resultados.sort(key=lambda r: r["linha"])
+        inseridos = sum(1 for r in resultados if r["status"] == "ok")
+        return jsonify({
+            "total": len(resultados),
+            "inseridos": inseridos,
+            "erros": len(resultados) - inseridos,
+            "resultados": resultados
+        }), 200
@@ -0,0 +1,25 @@
+from flask import current_app, jsonify
+from models import db
+from services.arquivamento import arquivar
+
+
+class ArquivamentoController:
+
+    @staticmethod
+    def arquivar():
+        """Move para o arquivo as turmas inativas e seus alunos, segundo a configuração do app."""
+        config = current_app.config
+        return arquivar(
+            inativas_dias=config.get("ARQUIVO_INATIVAS_DIAS", 30),
+            lote=config.get("ARQUIVO_LOTE", 1000)
+        )
+
+    @staticmethod
+    def post_arquivar():
+        """Cada lote é efetivado ao ser movido; numa falha só o lote corrente é desfeito."""
+        try:
+            movidos = ArquivamentoController.arquivar()
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({"error": f"Erro ao arquivar: {str(e)}"}), 500
+        return jsonify({"movidos": movidos}), 200
@@ -0,0 +1,40 @@
+from flask import request, jsonify
+from sqlalchemy import select
+from models import db
+from models.aluno import Aluno
+from models.turma import Turma
+from models.professor import Professor
+
+MAXIMO_IDS = 1000
+
+
+class ExistenciaController:
+
+    ENTIDADES = {
+        "alunos": Aluno,
+        "turmas": Turma,
+        "professores": Professor
+    }
+
+    @staticmethod
+    def get_existencia():
+        if request.method != 'GET':
+            return jsonify({"error": "Método não permitido"}), 405
+
+        resposta = {}
+        for entidade, modelo in ExistenciaController.ENTIDADES.items():
+            valor = request.args.get(entidade)
+            if not valor:
+                continue
+            try:
+                ids = {int(i) for i in valor.split(",") if i.strip()}
+            except ValueError:
+                return jsonify({"error": f"Parâmetro '{entidade}' deve ser uma lista de inteiros"}), 400
+            if len(ids) > MAXIMO_IDS:
+                return jsonify({"error": f"Máximo de {MAXIMO_IDS} ids por entidade"}), 400
+
+            existentes = db.session.execute(
+                select(modelo.id).where(modelo.id.in_(ids))
+            ).scalars().all()
+            resposta[entidade] = sorted(existentes)
+        return jsonify(resposta), 200
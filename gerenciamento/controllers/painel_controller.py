@@ -0,0 +1,62 @@
+from flask import request, jsonify
+from models.turma import Turma
+from controllers.turma_controller import TurmaController
+from services.servicos_client import servicos
+from utils.filtros import data_iso
+
+
+class PainelController:
+
+    # Filtros repassados ao serviço de agendamentos.
+    FILTROS_AGENDAMENTOS = ("data_de", "data_ate")
+
+    @staticmethod
+    def _chamadas(turma_id, filtros_agendamentos):
+        campos = {"turma_id": turma_id}
+        return {
+            "tarefas": ("tarefas", "/tarefas", campos),
+            "avaliacoes": ("tarefas", "/avaliacoes", campos),
+            "medias": ("tarefas", f"/turmas/{turma_id}/medias", None),
+            "agendamentos": ("agendamentos", "/agendamentos", dict(campos, **filtros_agendamentos)),
+            "recorrencias": ("agendamentos", "/recorrencias", campos)
+        }
+
+    @staticmethod
+    def get_painel(turma_id):
+        """Turma, professor e alunos daqui; tarefas, notas e reservas dos outros serviços.
+
+        A existência da turma é conferida antes (leitura pela chave primária),
+        para que um id desconhecido não ocupe o executor com chamadas
+        remotas; depois elas saem todas antes da consulta completa e correm
+        em paralelo com ela. Uma fonte que falha ou estoura o prazo vem como null,
+        com o motivo em `fontes`, e a resposta é marcada como `parcial`.
+        """
+        if request.method != 'GET':
+            return jsonify({"error": "Método não permitido"}), 405
+
+        filtros = {}
+        for nome in PainelController.FILTROS_AGENDAMENTOS:
+            if nome in request.args:
+                try:
+                    data_iso(request.args[nome])
+                except ValueError:
+                    return jsonify({"error": f"Valor inválido para o filtro '{nome}'"}), 400
+                filtros[nome] = request.args[nome]
+
+        if Turma.query.with_entities(Turma.id).filter(Turma.id == turma_id).first() is None:
+            return jsonify({"error": "Turma não encontrada"}), 404
+
+        lote = servicos.disparar(PainelController._chamadas(turma_id, filtros))
+
+        turma = Turma.query.options(
+            *TurmaController.EXPANSOES.values()
+        ).filter(Turma.id == turma_id).first()
+        if not turma:
+            return jsonify({"error": "Turma não encontrada"}), 404
+        painel = {"turma": turma.to_dict(TurmaController.EXPANSOES.keys())}
+
+        dados, fontes = servicos.coletar(lote)
+        painel.update(dados)
+        painel["fontes"] = fontes
+        painel["parcial"] = any(fonte["status"] != "ok" for fonte in fontes.values())
+        return jsonify(painel), 200
@@ -1,8 +1,25 @@
 from flask import request, jsonify
+from sqlalchemy.exc import IntegrityError
 from models.professor import Professor, db
+from models.versao import VersaoColecao
+from services import busca
+from utils.filtros import Filtro, aplicar_filtros, data_hora_iso, texto
+from utils.paginacao import ler_parametros, paginar, stream_json
+from utils.serializacao import Serializador
 
 class ProfessorController:
 
+    FILTROS = {
+        "id": Filtro(Professor.id),
+        "materia": Filtro(Professor.materia, conversor=texto),
+        "atualizado_desde": Filtro(Professor.updated_at, ">=", data_hora_iso)
+    }
+
+    LINHA = Serializador(
+        Professor.id, Professor.nome, Professor.idade, Professor.materia, Professor.observacoes,
+        Professor.updated_at
+    )
+
     @staticmethod
     def _get_data():
         data = request.get_json()
@@ -15,8 +32,31 @@ class ProfessorController:
         if request.method != 'GET':
             return jsonify({"error": "Método não permitido"}), 405
 
-        professores = Professor.query.all()
-        return jsonify([prof.to_dict() for prof in professores]), 200
+        try:
+            limit, after, stream = ler_parametros()
+            query = aplicar_filtros(Professor.query, ProfessorController.FILTROS, request.args)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        linha = ProfessorController.LINHA
+        query = linha.selecionar(query)
+        if stream:
+            return stream_json(query, Professor.id, linha)
+        if limit is None and after is None:
+            return jsonify(linha.lista(query.order_by(Professor.id))), 200
+        return jsonify(paginar(query, Professor.id, linha, limit, after)), 200
+
+    @staticmethod
+    def buscar_professores():
+        if request.method != 'GET':
+            return jsonify({"error": "Método não permitido"}), 405
+        linha = ProfessorController.LINHA
+        try:
+            consulta, limit, offset = busca.ler_busca(request.args)
+            query = linha.selecionar(aplicar_filtros(Professor.query, ProfessorController.FILTROS, request.args))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify(busca.PROFESSORES.paginar(query, consulta, linha, limit, offset)), 200
 
     @staticmethod
     def get_professor_by_id(professor_id):
@@ -50,6 +90,7 @@ class ProfessorController:
         )
 
         db.session.add(novo_professor)
+        VersaoColecao.incrementar("professores")
         db.session.commit()
         return jsonify(novo_professor.to_dict()), 201
 
@@ -71,6 +112,7 @@ class ProfessorController:
             if campo in data:
                 setattr(professor, campo, data[campo])
 
+        VersaoColecao.incrementar("professores")
         db.session.commit()
         return jsonify(professor.to_dict()), 200
 
@@ -84,5 +126,10 @@ class ProfessorController:
             return jsonify({"error": "Professor não encontrado"}), 404
 
         db.session.delete(professor)
-        db.session.commit()
+        try:
+            VersaoColecao.incrementar("professores")
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return jsonify({"error": "Professor possui turmas vinculadas"}), 409
         return jsonify({"message": "Professor deletado com sucesso"}), 200
@@ -1,8 +1,41 @@
 from flask import request, jsonify
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, selectinload
 from models.turma import Turma, db
+from models.versao import VersaoColecao
+from services.arquivamento import TURMAS, incluir_arquivados
+from utils.filtros import Filtro, aplicar_filtros, booleano, data_hora_iso
+from utils.paginacao import ler_parametros, paginar, stream_json
+from utils.serializacao import Serializador
 
 class TurmaController:
 
+    FILTROS = {
+        "id": Filtro(Turma.id),
+        "professor_id": Filtro(Turma.professor_id),
+        "ativo": Filtro(Turma.ativo, conversor=booleano),
+        "atualizado_desde": Filtro(Turma.updated_at, ">=", data_hora_iso)
+    }
+
+    # Relações que podem ser expandidas e como carregá-las: o professor vem no
+    # mesmo SELECT (JOIN) e os alunos em um único SELECT ... IN por página.
+    EXPANSOES = {
+        "professor": joinedload(Turma.professor),
+        "alunos": selectinload(Turma.alunos)
+    }
+
+    # Sem expand a listagem não precisa de objetos: lê as colunas direto.
+    LINHA = Serializador(Turma.id, Turma.descricao, Turma.professor_id, Turma.ativo, Turma.updated_at)
+
+    @staticmethod
+    def _ler_expand():
+        valor = request.args.get("expand", "")
+        expand = {item.strip() for item in valor.split(",") if item.strip()}
+        invalidos = expand - TurmaController.EXPANSOES.keys()
+        if invalidos:
+            raise ValueError(f"Valor inválido para expand: {', '.join(sorted(invalidos))}")
+        return expand
+
     @staticmethod
     def _get_json():
         data = request.get_json()
@@ -15,8 +48,41 @@ class TurmaController:
         if request.method != 'GET':
             return jsonify({"error": "Método não permitido"}), 405
 
-        turmas = Turma.query.all()
-        return jsonify([turma.to_dict() for turma in turmas]), 200
+        coluna_id = Turma.id
+        try:
+            limit, after, stream = ler_parametros()
+            query = aplicar_filtros(Turma.query, TurmaController.FILTROS, request.args)
+            expand = TurmaController._ler_expand()
+            arquivados = incluir_arquivados(request.args)
+            if expand and arquivados:
+                raise ValueError("expand não pode ser usado com incluir_arquivados")
+            if arquivados:
+                frio = aplicar_filtros(
+                    TURMAS.selecionar(TurmaController.LINHA.colunas),
+                    TURMAS.filtros(TurmaController.FILTROS),
+                    request.args
+                )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        if expand:
+            query = query.options(*(TurmaController.EXPANSOES[nome] for nome in expand))
+
+            def serializar(turma):
+                return turma.to_dict(expand)
+        else:
+            serializar = TurmaController.LINHA
+            query = serializar.selecionar(query)
+            # Turmas arquivadas não têm objetos ORM: só a listagem por colunas as alcança.
+            if arquivados:
+                query, coluna_id = TURMAS.unir(query, frio)
+
+        if stream:
+            return stream_json(query, coluna_id, serializar)
+        if limit is None and after is None:
+            turmas = query.order_by(coluna_id).all()
+            return jsonify([serializar(turma) for turma in turmas]), 200
+        return jsonify(paginar(query, coluna_id, serializar, limit, after)), 200
 
     @staticmethod
     def get_turma_by_id(turma_id):
@@ -24,9 +90,28 @@ class TurmaController:
             return jsonify({"error": "Método não permitido"}), 405
 
         turma = Turma.query.get(turma_id)
+        if turma:
+            return jsonify(turma.to_dict()), 200
+        try:
+            arquivados = incluir_arquivados(request.args)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        arquivada = TURMAS.buscar(TurmaController.LINHA.colunas, turma_id) if arquivados else None
+        if not arquivada:
+            return jsonify({"error": "Turma não encontrada"}), 404
+        return jsonify(TurmaController.LINHA(arquivada)), 200
+
+    @staticmethod
+    def get_roster(turma_id):
+        if request.method != 'GET':
+            return jsonify({"error": "Método não permitido"}), 405
+
+        turma = Turma.query.options(
+            *TurmaController.EXPANSOES.values()
+        ).filter(Turma.id == turma_id).first()
         if not turma:
             return jsonify({"error": "Turma não encontrada"}), 404
-        return jsonify(turma.to_dict()), 200
+        return jsonify(turma.to_dict(TurmaController.EXPANSOES.keys())), 200
 
     @staticmethod
     def create_turma():
@@ -46,7 +131,12 @@ class TurmaController:
             ativo=data.get("ativo", True)
         )
         db.session.add(nova_turma)
-        db.session.commit()
+        try:
+            VersaoColecao.incrementar("turmas")
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return jsonify({"error": "Professor informado não existe"}), 400
         return jsonify(nova_turma.to_dict()), 201
 
     @staticmethod
@@ -66,7 +156,12 @@ class TurmaController:
         turma.professor_id = data.get("professor_id", turma.professor_id)
         turma.ativo = data.get("ativo", turma.ativo)
 
-        db.session.commit()
+        try:
+            VersaoColecao.incrementar("turmas")
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return jsonify({"error": "Professor informado não existe"}), 400
         return jsonify(turma.to_dict()), 200
 
     @staticmethod
@@ -79,5 +174,10 @@ class TurmaController:
             return jsonify({"error": "Turma não encontrada"}), 404
 
         db.session.delete(turma)
-        db.session.commit()
+        try:
+            VersaoColecao.incrementar("turmas")
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return jsonify({"error": "Turma possui alunos vinculados"}), 409
         return jsonify({"message": "Turma deletada com sucesso"}), 200
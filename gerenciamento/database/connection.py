@@ -0,0 +1,14 @@
+from sqlalchemy import event
+
+
+def configurar_sqlite(engine, pragmas):
+    """Aplica os PRAGMAs do perfil escolhido em toda conexão nova do pool."""
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def aplicar_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for nome, valor in pragmas.items():
+            cursor.execute(f"PRAGMA {nome}={valor}")
+        cursor.close()
@@ -1,13 +1,15 @@
 from . import db
+from .atualizacao import Atualizavel
 from sqlalchemy.orm import relationship
 
-class Aluno(db.Model):
+class Aluno(Atualizavel, db.Model):
     __tablename__ = 'alunos'
+    __table_args__ = ({"sqlite_autoincrement": True},)
     
     id = db.Column(db.Integer, primary_key=True)
     nome = db.Column(db.String(100), nullable=False)
     idade = db.Column(db.Integer, nullable=False)
-    turma_id = db.Column(db.Integer, db.ForeignKey('turmas.id'), nullable=False)
+    turma_id = db.Column(db.Integer, db.ForeignKey('turmas.id'), nullable=False, index=True)
     data_nascimento = db.Column(db.Date, nullable=False)
     nota_primeiro_semestre = db.Column(db.Float)
     nota_segundo_semestre = db.Column(db.Float)
@@ -24,5 +26,6 @@ class Aluno(db.Model):
             "turma_id": self.turma_id,
             "nota_primeiro_semestre": self.nota_primeiro_semestre,
             "nota_segundo_semestre": self.nota_segundo_semestre,
-            "media_final": self.media_final
+            "media_final": self.media_final,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None
         }
\ No newline at end of file
@@ -0,0 +1,124 @@
+from datetime import datetime, timezone
+
+from . import db
+from .alteracoes import Alteracao
+from sqlalchemy import literal, select, union_all
+
+
+def _agora():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class Arquivo:
+    """Tabela fria ``<tabela>_arquivo`` com as mesmas colunas de um modelo.
+
+    ``mover`` transfere as linhas que atendem a uma condição em lotes
+    set-based (INSERT ... SELECT seguido de DELETE pelos mesmos ids, um
+    commit por lote), de modo que as tabelas quentes e seus índices só
+    guardam dados correntes. O arquivo não tem chaves estrangeiras: a
+    linha vai como estava, com ``arquivado_em``. As tabelas arquivadas são
+    declaradas com ``sqlite_autoincrement``; sem isso o SQLite reaproveita
+    o maior id depois de um DELETE e ele passaria a existir nas duas.
+
+    Para o feed ``/changes`` uma linha arquivada sai da coleção: se o
+    modelo é monitorado, cada lote grava as lápides (DELETE) dos ids
+    movidos na mesma transação.
+
+    As leituras com ``?incluir_arquivados=true`` aplicam os mesmos filtros
+    no arquivo (``filtros``) e unem as duas consultas (``unir``).
+    """
+
+    def __init__(self, modelo, indices=()):
+        self.modelo = modelo
+        origem = modelo.__table__
+        nome = f"{origem.name}_arquivo"
+        self.tabela = db.Table(
+            nome,
+            db.metadata,
+            *[db.Column(coluna.name, coluna.type, primary_key=coluna.primary_key)
+              for coluna in origem.columns],
+            db.Column("arquivado_em", db.DateTime, nullable=False),
+            *[db.Index(f"ix_{nome}_{coluna}", coluna) for coluna in indices]
+        )
+
+    def colunas(self, colunas):
+        """As colunas do arquivo com os mesmos nomes de `colunas` (do modelo)."""
+        return [self.tabela.c[coluna.key] for coluna in colunas]
+
+    def filtros(self, filtros, **substitutos):
+        """Os `filtros` do modelo apontados para o arquivo.
+
+        Filtros por `expressao` não têm coluna para trocar: passe o
+        equivalente no arquivo em `substitutos`; sem ele o filtro é recusado
+        (ValueError) em vez de ignorado.
+        """
+        convertidos = {}
+        for nome, filtro in filtros.items():
+            if nome in substitutos:
+                convertidos[nome] = substitutos[nome]
+            elif filtro.coluna is not None:
+                convertidos[nome] = type(filtro)(
+                    self.tabela.c[filtro.coluna.key], filtro.operador, filtro.conversor
+                )
+            else:
+                convertidos[nome] = type(filtro)(
+                    conversor=filtro.conversor, expressao=self._indisponivel(nome)
+                )
+        return convertidos
+
+    @staticmethod
+    def _indisponivel(nome):
+        def expressao(valores):
+            raise ValueError(f"Filtro '{nome}' não disponível com incluir_arquivados")
+        return expressao
+
+    def selecionar(self, colunas):
+        """SELECT das `colunas` (do modelo) no arquivo, para receber os filtros."""
+        return select(*self.colunas(colunas))
+
+    @staticmethod
+    def unir(query, frio):
+        """Une a `query` quente ao SELECT `frio` do arquivo, nas mesmas colunas.
+
+        Retorna (query, coluna_id) prontos para `paginar`/`stream_json`; as
+        linhas têm as posições das colunas, então o Serializador da
+        listagem vale para as duas origens.
+        """
+        uniao = union_all(query.statement, frio).subquery()
+        return db.session.query(uniao), uniao.c.id
+
+    def buscar(self, colunas, entidade_id):
+        """A linha arquivada com `entidade_id` nas `colunas`, ou None."""
+        return db.session.execute(
+            select(*self.colunas(colunas)).where(self.tabela.c.id == entidade_id)
+        ).first()
+
+    def mover(self, condicao, lote=1000, ao_mover=None):
+        """Arquiva em lotes as linhas do modelo que atendem a `condicao`; retorna quantas.
+
+        `ao_mover(ids)`, se dado, roda em cada lote antes da cópia, com as
+        linhas ainda na tabela quente e na mesma transação: é onde o chamador
+        desfaz o que elas somavam em outras tabelas e invalida caches.
+        """
+        origem = self.modelo.__table__
+        pk = origem.c.id
+        nomes = [coluna.name for coluna in origem.columns] + ["arquivado_em"]
+        colecao = Alteracao.monitorados.get(self.modelo)
+        instante = _agora()
+        total = 0
+        while True:
+            ids = db.session.execute(
+                select(pk).where(condicao).order_by(pk).limit(lote)
+            ).scalars().all()
+            if not ids:
+                return total
+            if ao_mover is not None:
+                ao_mover(ids)
+            db.session.execute(self.tabela.insert().from_select(
+                nomes, select(*origem.columns, literal(instante)).where(pk.in_(ids))
+            ))
+            db.session.execute(origem.delete().where(pk.in_(ids)))
+            if colecao is not None:
+                Alteracao.registrar(colecao, Alteracao.DELETE, [{"id": entidade_id} for entidade_id in ids])
+            db.session.commit()
+            total += len(ids)
@@ -0,0 +1,18 @@
+from datetime import datetime, timezone
+
+from . import db
+
+
+def agora():
+    """Instante atual em UTC, sem fuso (é assim que o SQLite guarda DateTime)."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class Atualizavel:
+    """Coluna ``updated_at`` mantida pelo SQLAlchemy em todo INSERT e UPDATE.
+
+    Vale também para os inserts e updates feitos pelo Core. O índice permite
+    que outros serviços busquem só o que mudou desde uma marca
+    (``?atualizado_desde=``).
+    """
+    updated_at = db.Column(db.DateTime, nullable=False, default=agora, onupdate=agora, index=True)
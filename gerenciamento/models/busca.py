@@ -0,0 +1,103 @@
+import re
+
+from . import db
+from sqlalchemy import column, func, literal_column, table, text
+
+
+class IndiceBusca:
+    """Índice de texto ``<tabela>_busca`` (FTS5) sobre colunas de um modelo.
+
+    A tabela virtual é de conteúdo externo: guarda só o índice invertido e
+    lê o texto da própria tabela do modelo pelo ``rowid`` (= ``id``). Três
+    gatilhos no SQLite a mantêm em dia a cada INSERT, UPDATE das colunas
+    indexadas e DELETE, inclusive os feitos fora do ORM (cargas em lote e o
+    arquivamento). O tokenizador ``unicode61 remove_diacritics 2`` ignora
+    caixa e acentos, então "joao" encontra "João" e "conceicao" encontra
+    "Conceição"; ``prefix`` mantém índices de prefixos curtos para a busca
+    enquanto se digita.
+    """
+
+    TOKENIZADOR = "unicode61 remove_diacritics 2"
+    PREFIXOS = "2 3"
+
+    def __init__(self, modelo, colunas, pesos=None):
+        self.modelo = modelo
+        self.origem = modelo.__table__.name
+        self.nome = f"{self.origem}_busca"
+        self.colunas = tuple(colunas)
+        self.pesos = tuple(pesos or (1.0,) * len(self.colunas))
+        self.tabela = table(self.nome, column("rowid"))
+
+    def _gatilhos(self):
+        nomes = ", ".join(self.colunas)
+        novos = ", ".join(f"new.{coluna}" for coluna in self.colunas)
+        antigos = ", ".join(f"old.{coluna}" for coluna in self.colunas)
+        inserir = f"INSERT INTO {self.nome}(rowid, {nomes}) VALUES (new.id, {novos});"
+        remover = (
+            f"INSERT INTO {self.nome}({self.nome}, rowid, {nomes}) "
+            f"VALUES ('delete', old.id, {antigos});"
+        )
+        return [
+            f"CREATE TRIGGER IF NOT EXISTS {self.nome}_ai AFTER INSERT ON {self.origem} "
+            f"BEGIN {inserir} END",
+            f"CREATE TRIGGER IF NOT EXISTS {self.nome}_ad AFTER DELETE ON {self.origem} "
+            f"BEGIN {remover} END",
+            f"CREATE TRIGGER IF NOT EXISTS {self.nome}_au AFTER UPDATE OF {nomes} ON {self.origem} "
+            f"BEGIN {remover} {inserir} END"
+        ]
+
+    def instalar(self):
+        """Cria a tabela virtual e os gatilhos que faltarem.
+
+        Quando a tabela virtual é nova, indexa as linhas que o modelo já
+        tem (``rebuild``); nas chamadas seguintes não faz nada.
+        """
+        with db.engine.begin() as conexao:
+            existia = conexao.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :nome"),
+                {"nome": self.nome}
+            ).first()
+            conexao.exec_driver_sql(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.nome} USING fts5("
+                f"{', '.join(self.colunas)}, content='{self.origem}', content_rowid='id', "
+                f"tokenize='{self.TOKENIZADOR}', prefix='{self.PREFIXOS}')"
+            )
+            for gatilho in self._gatilhos():
+                conexao.exec_driver_sql(gatilho)
+            if not existia:
+                conexao.exec_driver_sql(f"INSERT INTO {self.nome}({self.nome}) VALUES ('rebuild')")
+
+    @staticmethod
+    def expressao(texto):
+        """Consulta FTS5 para o texto digitado: todas as palavras, cada uma como prefixo.
+
+        As palavras vão entre aspas, então operadores (AND, NEAR, ``-``, ``:``)
+        digitados pelo usuário contam como texto. ValueError sem palavras.
+        """
+        palavras = re.findall(r"\w+", texto or "")
+        if not palavras:
+            raise ValueError("Parâmetro 'q' deve conter ao menos uma palavra")
+        return " ".join(f'"{palavra}"*' for palavra in palavras)
+
+    def paginar(self, query, consulta, serializar, limit, offset=0):
+        """Aplica a `consulta` (ver `expressao`) à `query` do modelo e devolve uma página.
+
+        As linhas vêm da mais para a menos relevante (bm25 com `pesos` por
+        coluna), com o id desempatando. Como `paginar` das listagens, lê uma
+        linha a mais para saber se há próxima página; `next` é o `offset`
+        dela.
+        """
+        fts = literal_column(self.nome)
+        itens = (
+            query.join(self.tabela, self.tabela.c.rowid == self.modelo.id)
+            .filter(fts.op("MATCH")(consulta))
+            .order_by(func.bm25(fts, *self.pesos), self.modelo.id)
+            .offset(offset)
+            .limit(limit + 1)
+            .all()
+        )
+        proximo = None
+        if len(itens) > limit:
+            itens = itens[:limit]
+            proximo = offset + limit
+        return {"dados": [serializar(item) for item in itens], "next": proximo}
@@ -1,7 +1,8 @@
 from . import db
+from .atualizacao import Atualizavel
 from sqlalchemy.orm import relationship
 
-class Professor(db.Model):
+class Professor(Atualizavel, db.Model):
     __tablename__ = 'professores'
 
     id = db.Column(db.Integer, primary_key=True)
@@ -18,5 +19,6 @@ class Professor(db.Model):
             "nome": self.nome,
             "idade": self.idade,
             "materia": self.materia,
-            "observacoes": self.observacoes
+            "observacoes": self.observacoes,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None
         }
@@ -1,21 +1,29 @@
 from . import db
+from .atualizacao import Atualizavel
 from sqlalchemy.orm import relationship
 
-class Turma(db.Model):
+class Turma(Atualizavel, db.Model):
     __tablename__ = 'turmas'
+    __table_args__ = ({"sqlite_autoincrement": True},)
     
     id = db.Column(db.Integer, primary_key=True)
     descricao = db.Column(db.String(100))
-    professor_id = db.Column(db.Integer, db.ForeignKey('professores.id'), nullable=False)
+    professor_id = db.Column(db.Integer, db.ForeignKey('professores.id'), nullable=False, index=True)
     ativo = db.Column(db.Boolean, default=True)
 
     professor = relationship("Professor", back_populates="turmas") 
-    alunos = relationship("Aluno", back_populates="turma")
+    alunos = relationship("Aluno", back_populates="turma", order_by="Aluno.nome")
 
-    def to_dict(self):
-        return {
+    def to_dict(self, expand=()):
+        dados = {
             "id": self.id,
             "descricao": self.descricao,
             "professor_id": self.professor_id,
-            "ativo": self.ativo
-        }
\ No newline at end of file
+            "ativo": self.ativo,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None
+        }
+        if "professor" in expand:
+            dados["professor"] = self.professor.to_dict() if self.professor else None
+        if "alunos" in expand:
+            dados["alunos"] = [aluno.to_dict() for aluno in self.alunos]
+        return dados
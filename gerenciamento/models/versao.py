@@ -0,0 +1,44 @@
+from . import db
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+
+
+class VersaoColecao(db.Model):
+    """Contador de versão de cada coleção, incrementado a cada escrita.
+
+    Fica no banco (e não em memória) para que todos os workers enxerguem a
+    mesma versão.
+    """
+    __tablename__ = "versoes_colecoes"
+
+    colecao = db.Column(db.String(100), primary_key=True)
+    versao = db.Column(db.Integer, nullable=False, default=0)
+
+    @staticmethod
+    def escopo(colecao, entidade, entidade_id):
+        """Nome da versão de um recorte da coleção, ex.: ``avaliacoes:aluno:7``."""
+        return f"{colecao}:{entidade}:{entidade_id}"
+
+    @classmethod
+    def incrementar(cls, *colecoes):
+        """Incrementa as coleções na transação corrente (efetivado no commit da escrita)."""
+        colecoes = list(dict.fromkeys(colecoes))
+        if not colecoes:
+            return
+        stmt = insert(cls).values(versao=1)
+        db.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[cls.colecao],
+                set_={"versao": cls.versao + 1}
+            ),
+            [{"colecao": colecao} for colecao in colecoes]
+        )
+
+    @classmethod
+    def obter(cls, colecoes):
+        tabela = cls.__table__
+        linhas = db.session.execute(
+            select(tabela.c.colecao, tabela.c.versao).where(tabela.c.colecao.in_(colecoes))
+        ).all()
+        versoes = dict(linhas)
+        return [versoes.get(colecao, 0) for colecao in colecoes]
@@ -0,0 +1,43 @@
+from datetime import timedelta
+
+from sqlalchemy import select
+
+from models import db
+from models.aluno import Aluno
+from models.arquivo import Arquivo
+from models.atualizacao import agora
+from models.turma import Turma
+from models.versao import VersaoColecao
+from utils.filtros import booleano
+
+ALUNOS = Arquivo(Aluno, indices=("turma_id",))
+TURMAS = Arquivo(Turma, indices=("professor_id",))
+
+
+def incluir_arquivados(args):
+    """Lê `?incluir_arquivados=`; ValueError se o valor não for booleano."""
+    try:
+        return booleano(args.get("incluir_arquivados", "false"))
+    except ValueError:
+        raise ValueError("Parâmetro 'incluir_arquivados' deve ser true ou false")
+
+
+def arquivar(inativas_dias=30, lote=1000):
+    """Arquiva as turmas inativas há mais de `inativas_dias` dias, com seus alunos.
+
+    Os alunos saem antes das turmas, então uma interrupção no meio deixa no
+    máximo turmas inativas ainda quentes e sem alunos; a próxima execução
+    termina o trabalho. Retorna {coleção: linhas movidas}.
+    """
+    limite = agora() - timedelta(days=inativas_dias)
+    inativas = select(Turma.id).where(
+        Turma.ativo.is_(False),
+        Turma.updated_at < limite
+    )
+    movidos = {
+        "alunos": ALUNOS.mover(Aluno.turma_id.in_(inativas), lote),
+        "turmas": TURMAS.mover(Turma.id.in_(inativas), lote)
+    }
+    VersaoColecao.incrementar(*[colecao for colecao, total in movidos.items() if total])
+    db.session.commit()
+    return movidos
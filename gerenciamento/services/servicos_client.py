@@ -0,0 +1,106 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import urllib3
+
+
+class ServicoIndisponivel(Exception):
+    pass
+
+
+class ServicosClient:
+    """Cliente HTTP dos serviços de tarefas e agendamentos, para agregações.
+
+    Todas as chamadas compartilham um PoolManager keep-alive (um pool por
+    serviço) e rodam num pool de threads: `disparar` envia um lote de GETs de
+    uma vez e `coletar` espera cada um até o prazo do lote, de modo que a
+    latência é a da chamada mais lenta e não a soma delas. Chamadas que
+    falham ou estouram o prazo não derrubam o lote; ficam marcadas em
+    `fontes` e o restante é devolvido normalmente.
+    """
+
+    SERVICOS = ("tarefas", "agendamentos")
+
+    def __init__(self, app=None):
+        self.urls = {}
+        self.executor = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.urls = {}
+        for servico in self.SERVICOS:
+            url = app.config.get(f"{servico.upper()}_URL")
+            self.urls[servico] = url.rstrip("/") if url else None
+        timeout = app.config.get("SERVICOS_TIMEOUT", 2.0)
+        self.timeout = urllib3.Timeout(connect=timeout, read=timeout)
+        self.prazo = app.config.get("SERVICOS_PRAZO", timeout)
+        # Sem novas tentativas: o prazo do lote é o que limita a espera.
+        self.pool = urllib3.PoolManager(
+            maxsize=app.config.get("SERVICOS_POOL_TAMANHO", 10),
+            block=False,
+            retries=False
+        )
+        self.executor = ThreadPoolExecutor(
+            max_workers=app.config.get("SERVICOS_THREADS", 16),
+            thread_name_prefix="servicos"
+        )
+        app.extensions["servicos_client"] = self
+
+    def _get(self, servico, caminho, campos=None):
+        base = self.urls.get(servico)
+        if not base:
+            raise ServicoIndisponivel(f"{servico.upper()}_URL não configurada")
+        try:
+            resposta = self.pool.request(
+                "GET", base + caminho, fields=campos, timeout=self.timeout
+            )
+        except urllib3.exceptions.HTTPError as e:
+            raise ServicoIndisponivel(str(e))
+        if resposta.status != 200:
+            raise ServicoIndisponivel(f"HTTP {resposta.status} em {caminho}")
+        return json.loads(resposta.data)
+
+    def _chamar(self, servico, caminho, campos):
+        inicio = time.perf_counter()
+        try:
+            return "ok", self._get(servico, caminho, campos), None, time.perf_counter() - inicio
+        except (ServicoIndisponivel, ValueError) as e:
+            return "erro", None, str(e), time.perf_counter() - inicio
+
+    def disparar(self, chamadas):
+        """Envia em paralelo {nome: (serviço, caminho, campos)}; devolve o lote para `coletar`."""
+        futuros = {
+            nome: (servico, self.executor.submit(self._chamar, servico, caminho, campos))
+            for nome, (servico, caminho, campos) in chamadas.items()
+        }
+        return time.perf_counter(), futuros
+
+    def coletar(self, lote):
+        """Espera o lote até o prazo e retorna (dados, fontes).
+
+        `dados[nome]` é o JSON da chamada ou None se ela falhou; `fontes[nome]`
+        traz serviço, status ("ok", "erro" ou "timeout"), duração e o erro.
+        """
+        inicio, futuros = lote
+        restante = max(self.prazo - (time.perf_counter() - inicio), 0)
+        wait([futuro for _, futuro in futuros.values()], timeout=restante)
+
+        dados = {}
+        fontes = {}
+        for nome, (servico, futuro) in futuros.items():
+            if futuro.done():
+                status, corpo, erro, duracao = futuro.result()
+                fonte = {"servico": servico, "status": status, "ms": round(duracao * 1000, 1)}
+            else:
+                corpo, erro = None, f"Sem resposta em {self.prazo:g} s"
+                fonte = {"servico": servico, "status": "timeout", "ms": round(self.prazo * 1000, 1)}
+            if erro:
+                fonte["erro"] = erro
+            dados[nome] = corpo
+            fontes[nome] = fonte
+        return dados, fontes
+
+
+servicos = ServicosClient()
@@ -0,0 +1,78 @@
+from flask import Response, current_app, request, stream_with_context
+
+LIMITE_PADRAO = 100
+LIMITE_MAXIMO = 1000
+TAMANHO_LOTE = 1000
+
+
+def _inteiro_positivo(nome, valor):
+    try:
+        numero = int(valor)
+    except (TypeError, ValueError):
+        raise ValueError(f"Parâmetro '{nome}' deve ser um número inteiro")
+    if numero < 0:
+        raise ValueError(f"Parâmetro '{nome}' não pode ser negativo")
+    return numero
+
+
+def ler_parametros():
+    """Lê `limit`, `after` e `stream` da query string.
+
+    Retorna (limit, after, stream); `limit` e `after` ficam None quando não
+    informados. Levanta ValueError para valores inválidos.
+    """
+    limit = request.args.get("limit")
+    after = request.args.get("after")
+    stream = request.args.get("stream", "").lower() in ("1", "true", "sim")
+
+    if limit is not None:
+        limit = _inteiro_positivo("limit", limit)
+        if limit == 0:
+            raise ValueError("Parâmetro 'limit' deve ser maior que zero")
+        limit = min(limit, LIMITE_MAXIMO)
+    if after is not None:
+        after = _inteiro_positivo("after", after)
+    return limit, after, stream
+
+
+def paginar(query, coluna_id, serializar, limit=None, after=None):
+    """Pagina `query` por keyset sobre `coluna_id`.
+
+    Busca uma linha a mais que `limit` para saber se existe próxima página;
+    o cursor `next` é o id da última linha devolvida.
+    """
+    limit = limit or LIMITE_PADRAO
+    if after is not None:
+        query = query.filter(coluna_id > after)
+    itens = query.order_by(coluna_id).limit(limit + 1).all()
+
+    proximo = None
+    if len(itens) > limit:
+        itens = itens[:limit]
+        proximo = getattr(itens[-1], coluna_id.key)
+    return {"dados": [serializar(item) for item in itens], "next": proximo}
+
+
+def stream_json(query, coluna_id, serializar, tamanho_lote=TAMANHO_LOTE):
+    """Devolve a consulta inteira como um array JSON enviado em blocos.
+
+    As linhas são lidas com `yield_per`, então a memória usada depende do
+    tamanho do lote e não do tamanho da tabela.
+    """
+    dumps = current_app.json.dumps
+
+    def gerar():
+        yield "["
+        separador = ""
+        lote = []
+        for item in query.order_by(coluna_id).yield_per(tamanho_lote):
+            lote.append(dumps(serializar(item)))
+            if len(lote) >= tamanho_lote:
+                yield separador + ",".join(lote)
+                separador = ","
+                lote = []
+        if lote:
+            yield separador + ",".join(lote)
+        yield "]"
+
+    return Response(stream_with_context(gerar()), mimetype="application/json")
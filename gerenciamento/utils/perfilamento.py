@@ -0,0 +1,180 @@
+import cProfile
+import hmac
+import io
+import logging
+import os
+import pstats
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+
+from flask import Response, has_request_context, jsonify, request
+from sqlalchemy import event
+
+logger_sql = logging.getLogger("sql_lento")
+
+# Perfilador ativo da requisição corrente, se ela pediu perfil.
+_perfil = ContextVar("perfilamento_perfil", default=None)
+
+
+class Perfilamento:
+    """Perfil sob demanda de requisições e log de comandos SQL lentos.
+
+    Perfil: com PERFIL_TOKEN configurado, uma requisição com o cabeçalho
+    ``X-Perfil: <token>`` roda sob o cProfile do before_request ao
+    after_request, cobrindo view, ORM, ``to_dict``, ``jsonify`` e SQLite.
+    O token só vale no cabeçalho: na URL ele iria para o log de acesso. Por
+    padrão o relatório do pstats substitui o corpo da resposta; com
+    ``X-Perfil-Formato: arquivo`` o .pstats é gravado em PERFIL_DIR e a
+    resposta segue normal com o caminho em ``X-Perfil-Arquivo``.
+
+    SQL lento: com SQL_LENTO_MS configurado, todo comando acima do limite é
+    registrado no logger ``sql_lento`` com duração, parâmetros e rota, e os
+    últimos ficam em GET /perfil/sql-lento (mesmo token).
+    """
+
+    LINHAS_RELATORIO = 60
+    TAMANHO_PARAMETROS = 500
+
+    def __init__(self):
+        self.token = None
+        self.diretorio = None
+        self.limite_sql = None
+        self.lentas = deque(maxlen=200)
+        # Um perfil por vez no processo: o cProfile do Python 3.12+ não aceita
+        # dois ativos, e perfis simultâneos distorcem um ao outro.
+        self._ocupado = threading.Lock()
+
+    def init_app(self, app, engine):
+        self.token = app.config.get("PERFIL_TOKEN") or None
+        self.diretorio = app.config.get("PERFIL_DIR") or None
+        limite = app.config.get("SQL_LENTO_MS")
+        self.limite_sql = limite / 1000 if limite else None
+        self.lentas = deque(maxlen=app.config.get("SQL_LENTO_MAX", 200))
+
+        if self.token:
+            app.before_request(self._antes)
+            app.after_request(self._depois)
+            app.teardown_request(self._encerrar)
+        if self.limite_sql is not None:
+            event.listen(engine, "before_cursor_execute", self._antes_sql)
+            event.listen(engine, "after_cursor_execute", self._depois_sql)
+        app.add_url_rule("/perfil/sql-lento", "perfil_sql_lento", self.listar_lentas, methods=["GET"])
+        app.extensions["perfilamento"] = self
+
+    def _autorizado(self):
+        enviado = request.headers.get("X-Perfil")
+        # Em bytes: compare_digest recusa (TypeError) str com caracteres não ASCII.
+        return bool(self.token and enviado) and hmac.compare_digest(
+            enviado.encode(), self.token.encode()
+        )
+
+    # --- perfil de requisições ---------------------------------------------
+
+    def _antes(self):
+        if "X-Perfil" not in request.headers:
+            return None
+        if request.endpoint == "perfil_sql_lento":
+            return None
+        if not self._autorizado():
+            return jsonify({"erro": "Token de perfil inválido"}), 403
+        if request.headers.get("X-Perfil-Formato") == "arquivo" and not self.diretorio:
+            return jsonify({"erro": "PERFIL_DIR não configurado"}), 400
+        if not self._ocupado.acquire(blocking=False):
+            return jsonify({"erro": "Outro perfil em andamento, tente novamente"}), 429
+
+        perfil = cProfile.Profile()
+        _perfil.set((perfil, time.perf_counter()))
+        perfil.enable()
+        return None
+
+    def _depois(self, resposta):
+        ativo = _perfil.get()
+        if ativo is None:
+            return resposta
+        perfil, inicio = ativo
+        perfil.disable()
+        _perfil.set(None)
+        duracao_ms = (time.perf_counter() - inicio) * 1000
+        self._ocupado.release()
+
+        if request.headers.get("X-Perfil-Formato") == "arquivo":
+            regra = request.url_rule.rule if request.url_rule is not None else "nao_mapeada"
+            nome = "{}-{}-{}.pstats".format(
+                time.strftime("%Y%m%d-%H%M%S"),
+                request.method,
+                "".join(c if c.isalnum() else "_" for c in regra).strip("_")
+            )
+            os.makedirs(self.diretorio, exist_ok=True)
+            caminho = os.path.join(self.diretorio, nome)
+            perfil.dump_stats(caminho)
+            resposta.headers["X-Perfil-Arquivo"] = caminho
+            resposta.headers["X-Perfil-Tempo-Ms"] = f"{duracao_ms:.1f}"
+            return resposta
+
+        saida = io.StringIO()
+        ordem = request.headers.get("X-Perfil-Ordem", "cumulative")
+        try:
+            estatisticas = pstats.Stats(perfil, stream=saida).sort_stats(ordem)
+        except KeyError:
+            estatisticas = pstats.Stats(perfil, stream=saida).sort_stats("cumulative")
+        saida.write(
+            f"{request.method} {request.full_path.rstrip('?')} -> {resposta.status_code} em {duracao_ms:.1f} ms\n"
+        )
+        estatisticas.print_stats(self.LINHAS_RELATORIO)
+        relatorio = Response(saida.getvalue(), mimetype="text/plain")
+        relatorio.headers["X-Perfil-Status"] = str(resposta.status_code)
+        relatorio.headers["X-Perfil-Tempo-Ms"] = f"{duracao_ms:.1f}"
+        return relatorio
+
+    def _encerrar(self, erro=None):
+        """Garante que um perfil interrompido (erro em outro after_request) não prenda o lock."""
+        ativo = _perfil.get()
+        if ativo is not None:
+            ativo[0].disable()
+            _perfil.set(None)
+            self._ocupado.release()
+
+    # --- log de SQL lento ----------------------------------------------------
+
+    @staticmethod
+    def _antes_sql(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._perfil_inicio = time.perf_counter()
+
+    def _depois_sql(self, conn, cursor, statement, parameters, context, executemany):
+        if context is None:
+            return
+        duracao = time.perf_counter() - context._perfil_inicio
+        if duracao < self.limite_sql:
+            return
+
+        rota = None
+        if has_request_context():
+            regra = request.url_rule
+            rota = f"{request.method} {regra.rule if regra is not None else request.path}"
+        registro = {
+            "quando": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "duracao_ms": round(duracao * 1000, 2),
+            "rota": rota,
+            "sql": statement,
+            "parametros": repr(parameters)[:self.TAMANHO_PARAMETROS],
+            "executemany": executemany
+        }
+        self.lentas.append(registro)
+        logger_sql.warning(
+            "SQL lento (%.1f ms) em %s: %s | parâmetros: %s",
+            registro["duracao_ms"], rota or "-", statement, registro["parametros"]
+        )
+
+    def listar_lentas(self):
+        if not self._autorizado():
+            return jsonify({"erro": "Token de perfil inválido"}), 403
+        return jsonify({
+            "limite_ms": self.limite_sql * 1000 if self.limite_sql is not None else None,
+            "consultas": list(reversed(self.lentas))
+        }), 200
+
+
+perfilamento = Perfilamento()
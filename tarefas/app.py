@@ -1,17 +1,34 @@
-from flask import Flask
+import click
+from flask import Blueprint, Flask
 from flasgger import Swagger
 from models import db
+from models.versao import VersaoColecao
 from models.tarefas import Tarefa
 from models.avaliacoes import Avaliacao
+from models.medias import MediaAluno
+from models.estatisticas import EstatisticaTarefa
+from models.alteracoes import Alteracao
+from models.replicas import AlunoReplica, MarcaReplica, ProfessorReplica, TurmaReplica
 from config import Config
+from database.connection import configurar_sqlite
+from utils.etag import condicional
+from utils.metricas import metricas
+from utils.perfilamento import perfilamento
+from utils.serializacao import ProvedorJSON
+from services import busca
+from services.gerenciamento_client import gerenciamento
 from controllers.tarefas_controller import TarefaController
 from controllers.avaliacoes_controller import AvaliacaoController
+from controllers.medias_controller import MediaController
+from controllers.boletim_controller import BoletimController
+from controllers.estatisticas_controller import EstatisticaController
+from controllers.alteracoes_controller import AlteracaoController
+from controllers.replicas_controller import ReplicaController
+from controllers.arquivamento_controller import ArquivamentoController
 
-app = Flask(__name__)
-app.config.from_object(Config)
-db.init_app(app)
+rotas = Blueprint("tarefas", __name__)
 
-swagger = Swagger(app, template={
+SWAGGER_TEMPLATE = {
     "swagger": "2.0",
     "info": {
         "title": "API Escolar - Tarefas e Avaliações",
@@ -20,21 +37,75 @@ swagger = Swagger(app, template={
     },
     "basePath": "/",
     "schemes": ["http"]
-})
+}
 
 
-@app.route("/tarefas", methods=["GET"])
+@rotas.route("/tarefas", methods=["GET"])
+@condicional("tarefas")
 def get_tarefas():
     """Listar todas as tarefas
     ---
     tags: [Tarefas]
+    parameters:
+      - name: turma_id
+        in: query
+        type: string
+        description: Id ou lista de ids separados por vírgula
+      - name: professor_id
+        in: query
+        type: string
+        description: Id ou lista de ids separados por vírgula
+      - name: data_entrega_de
+        in: query
+        type: string
+        description: Entrega a partir de (AAAA-MM-DD)
+      - name: data_entrega_ate
+        in: query
+        type: string
+        description: Entrega até (AAAA-MM-DD)
+      - name: incluir_arquivados
+        in: query
+        type: boolean
+        description: Inclui as tarefas arquivadas (anos letivos anteriores e turmas inativas)
     responses:
       200:
         description: Lista de tarefas cadastradas no sistema
+      400: {description: Filtro inválido}
     """
     return TarefaController.get_tarefas()
 
-@app.route("/tarefas/<int:tarefa_id>", methods=["GET"])
+@rotas.route("/tarefas/busca", methods=["GET"])
+@condicional("tarefas")
+def buscar_tarefas():
+    """Buscar tarefas por nome ou descrição
+    ---
+    tags: [Tarefas]
+    parameters:
+      - name: q
+        in: query
+        type: string
+        required: true
+        description: Palavras a procurar; sem diferença de acentos e maiúsculas, cada palavra casa com o início de uma palavra
+      - name: limit
+        in: query
+        type: integer
+        description: Tamanho da página (padrão 20, máx. 100)
+      - name: offset
+        in: query
+        type: integer
+        description: Posição inicial; use o `next` devolvido pela página anterior
+    responses:
+      200:
+        description: >
+          Página de tarefas da mais para a menos relevante, com `next`.
+          Casar no nome pesa mais que casar na descrição. Aceita os filtros
+          da listagem (turma_id, ...); tarefas arquivadas não entram.
+      400: {description: Busca vazia ou parâmetro inválido}
+    """
+    return TarefaController.buscar_tarefas()
+
+@rotas.route("/tarefas/<int:tarefa_id>", methods=["GET"])
+@condicional("tarefas")
 def get_tarefa_by_id(tarefa_id):
     """Buscar tarefa por ID
     ---
@@ -44,13 +115,17 @@ def get_tarefa_by_id(tarefa_id):
         in: path
         type: integer
         required: true
+      - name: incluir_arquivados
+        in: query
+        type: boolean
+        description: Procura também no arquivo
     responses:
       200: {description: Tarefa encontrada}
       404: {description: Tarefa não encontrada}
     """
     return TarefaController.get_tarefa_by_id(tarefa_id)
 
-@app.route("/tarefas", methods=["POST"])
+@rotas.route("/tarefas", methods=["POST"])
 def create_tarefa():
     """Criar nova tarefa
     ---
@@ -74,7 +149,7 @@ def create_tarefa():
     """
     return TarefaController.create_tarefa()
 
-@app.route("/tarefas/<int:tarefa_id>", methods=["PUT"])
+@rotas.route("/tarefas/<int:tarefa_id>", methods=["PUT"])
 def update_tarefa(tarefa_id):
     """Atualizar tarefa existente
     ---
@@ -101,7 +176,7 @@ def update_tarefa(tarefa_id):
     """
     return TarefaController.update_tarefa(tarefa_id)
 
-@app.route("/tarefas/<int:tarefa_id>", methods=["DELETE"])
+@rotas.route("/tarefas/<int:tarefa_id>", methods=["DELETE"])
 def delete_tarefa(tarefa_id):
     """Excluir tarefa
     ---
@@ -117,18 +192,145 @@ def delete_tarefa(tarefa_id):
     """
     return TarefaController.delete_tarefa(tarefa_id)
 
-@app.route("/avaliacoes", methods=["GET"])
+@rotas.route("/tarefas/<int:tarefa_id>/estatisticas", methods=["GET"])
+@condicional("tarefas", "avaliacoes", "estatisticas")
+def get_estatisticas_tarefa(tarefa_id):
+    """Estatísticas das notas de uma tarefa
+    ---
+    tags: [Tarefas]
+    parameters:
+      - name: tarefa_id
+        in: path
+        type: integer
+        required: true
+      - name: percentis
+        in: query
+        type: string
+        description: Percentis separados por vírgula (padrão 10,25,50,75,90)
+      - name: faixas
+        in: query
+        type: integer
+        description: Número de faixas do histograma (padrão 10, máx. 100)
+      - name: quantis
+        in: query
+        type: boolean
+        description: Use false para receber só contagem, média e desvio padrão, sem ler as notas
+    responses:
+      200:
+        description: Quantidade, média, desvio padrão, mínimo, máximo, mediana, percentis e histograma
+      400: {description: Parâmetros inválidos}
+      404: {description: Tarefa não encontrada}
+    """
+    return EstatisticaController.get_estatisticas_tarefa(tarefa_id)
+
+@rotas.route("/tarefas/<int:tarefa_id>/estatisticas/recalcular", methods=["POST"])
+def recalcular_estatisticas_tarefa(tarefa_id):
+    """Recalcular as somas das notas de uma tarefa a partir das avaliações
+    ---
+    tags: [Tarefas]
+    parameters:
+      - name: tarefa_id
+        in: path
+        type: integer
+        required: true
+    responses:
+      200: {description: Estatísticas recalculadas, no formato do GET}
+      404: {description: Tarefa não encontrada}
+    """
+    return EstatisticaController.recalcular_estatisticas_tarefa(tarefa_id)
+
+@rotas.route("/tarefas/<int:tarefa_id>/avaliacoes", methods=["PUT"])
+def upsert_avaliacoes_tarefa(tarefa_id):
+    """Lançar ou atualizar as notas de uma tarefa em lote
+    ---
+    tags: [Avaliações]
+    consumes: [application/json]
+    parameters:
+      - name: tarefa_id
+        in: path
+        type: integer
+        required: true
+      - in: body
+        name: body
+        schema:
+          type: array
+          items:
+            type: object
+            properties:
+              aluno_id: {type: integer}
+              nota: {type: number}
+    responses:
+      200: {description: Avaliações gravadas numa única transação}
+      400: {description: Dados inválidos}
+      404: {description: Tarefa não encontrada}
+    """
+    return AvaliacaoController.upsert_avaliacoes_tarefa(tarefa_id)
+
+@rotas.route("/avaliacoes", methods=["GET"])
+@condicional("avaliacoes")
 def get_avaliacoes():
     """Listar todas as avaliações
     ---
     tags: [Avaliações]
+    parameters:
+      - name: aluno_id
+        in: query
+        type: string
+        description: Id ou lista de ids separados por vírgula
+      - name: tarefa_id
+        in: query
+        type: string
+        description: Id ou lista de ids separados por vírgula
+      - name: turma_id
+        in: query
+        type: string
+        description: Avaliações das tarefas da(s) turma(s)
+      - name: nota_de
+        in: query
+        type: number
+        description: Nota mínima
+      - name: nota_ate
+        in: query
+        type: number
+        description: Nota máxima
+      - name: incluir_arquivados
+        in: query
+        type: boolean
+        description: Inclui as avaliações arquivadas junto com suas tarefas
     responses:
       200:
         description: Lista de avaliações cadastradas
+      400: {description: Filtro inválido}
     """
     return AvaliacaoController.get_avaliacoes()
 
-@app.route("/avaliacoes/<int:avaliacao_id>", methods=["GET"])
+@rotas.route("/avaliacoes/export", methods=["GET"])
+def export_avaliacoes():
+    """Exportar avaliações em CSV ou NDJSON
+    ---
+    tags: [Avaliações]
+    produces: [text/csv, application/x-ndjson]
+    parameters:
+      - name: format
+        in: query
+        type: string
+        enum: [csv, ndjson]
+        description: Formato do arquivo (padrão csv)
+      - name: incluir_arquivados
+        in: query
+        type: boolean
+        description: Inclui os registros arquivados
+    responses:
+      200:
+        description: >
+          Arquivo enviado em blocos à medida que as linhas são lidas, em
+          ordem de id. Aceita os mesmos filtros da listagem (aluno_id, tarefa_id, turma_id, ...).
+      400: {description: Formato ou filtro inválido}
+    """
+    return AvaliacaoController.export_avaliacoes()
+
+@rotas.route("/avaliacoes/<int:avaliacao_id>", methods=["GET"])
+@condicional("avaliacoes")
 def get_avaliacao_by_id(avaliacao_id):
     """Buscar avaliação por ID
     ---
@@ -138,13 +340,17 @@ def get_avaliacao_by_id(avaliacao_id):
         in: path
         type: integer
         required: true
+      - name: incluir_arquivados
+        in: query
+        type: boolean
+        description: Procura também no arquivo
     responses:
       200: {description: Avaliação encontrada}
       404: {description: Avaliação não encontrada}
     """
     return AvaliacaoController.get_avaliacao_by_id(avaliacao_id)
 
-@app.route("/avaliacoes", methods=["POST"])
+@rotas.route("/avaliacoes", methods=["POST"])
 def create_avaliacao():
     """Criar nova avaliação
     ---
@@ -162,10 +368,11 @@ def create_avaliacao():
     responses:
       201: {description: Avaliação criada com sucesso}
       400: {description: Dados inválidos}
+      409: {description: Aluno já avaliado nesta tarefa}
     """
     return AvaliacaoController.create_avaliacao()
 
-@app.route("/avaliacoes/<int:avaliacao_id>", methods=["PUT"])
+@rotas.route("/avaliacoes/<int:avaliacao_id>", methods=["PUT"])
 def update_avaliacao(avaliacao_id):
     """Atualizar avaliação
     ---
@@ -185,7 +392,7 @@ def update_avaliacao(avaliacao_id):
     """
     return AvaliacaoController.update_avaliacao(avaliacao_id)
 
-@app.route("/avaliacoes/<int:avaliacao_id>", methods=["DELETE"])
+@rotas.route("/avaliacoes/<int:avaliacao_id>", methods=["DELETE"])
 def delete_avaliacao(avaliacao_id):
     """Excluir avaliação
     ---
@@ -201,12 +408,208 @@ def delete_avaliacao(avaliacao_id):
     """
     return AvaliacaoController.delete_avaliacao(avaliacao_id)
 
+@rotas.route("/turmas/<int:turma_id>/medias", methods=["GET"])
+@condicional("tarefas", "avaliacoes", "medias")
+def get_medias_turma(turma_id):
+    """Listar as médias ponderadas dos alunos de uma turma
+    ---
+    tags: [Médias]
+    parameters:
+      - name: turma_id
+        in: path
+        type: integer
+        required: true
+    responses:
+      200:
+        description: Média ponderada (nota x peso_porcento) de cada aluno avaliado
+    """
+    return MediaController.get_medias_turma(turma_id)
+
+@rotas.route("/turmas/<int:turma_id>/medias/<int:aluno_id>", methods=["GET"])
+@condicional("tarefas", "avaliacoes", "medias")
+def get_media_aluno(turma_id, aluno_id):
+    """Buscar a média ponderada de um aluno na turma
+    ---
+    tags: [Médias]
+    parameters:
+      - name: turma_id
+        in: path
+        type: integer
+        required: true
+      - name: aluno_id
+        in: path
+        type: integer
+        required: true
+    responses:
+      200: {description: Média do aluno}
+      404: {description: Aluno sem avaliações nesta turma}
+    """
+    return MediaController.get_media_aluno(turma_id, aluno_id)
+
+@rotas.route("/turmas/<int:turma_id>/medias/recalcular", methods=["POST"])
+def recalcular_medias_turma(turma_id):
+    """Recalcular as médias da turma a partir das tarefas e avaliações
+    ---
+    tags: [Médias]
+    parameters:
+      - name: turma_id
+        in: path
+        type: integer
+        required: true
+    responses:
+      200: {description: Médias recalculadas com um único agregado SQL}
+    """
+    return MediaController.recalcular_medias_turma(turma_id)
+
+@rotas.route("/alunos/<int:aluno_id>/boletim", methods=["GET"])
+def get_boletim(aluno_id):
+    """Boletim do aluno: tarefas da turma, notas e médias ponderadas
+    ---
+    tags: [Médias]
+    parameters:
+      - name: aluno_id
+        in: path
+        type: integer
+        required: true
+      - name: turma_id
+        in: query
+        type: integer
+        description: Turma do boletim (padrão - turma do aluno no gerenciamento)
+    responses:
+      200:
+        description: Cada tarefa com a nota do aluno e a média acumulada, mais as médias parcial e final
+      404: {description: Aluno não encontrado ou sem turma}
+    """
+    return BoletimController.get_boletim(aluno_id)
+
+
+@rotas.route("/turmas/<int:turma_id>/avaliacoes", methods=["GET"])
+@condicional("tarefas", "avaliacoes", "replicas")
+def get_avaliacoes_turma(turma_id):
+    """Avaliações da turma com nomes de alunos e tarefas, sem chamar o gerenciamento
+    ---
+    tags: [Avaliações]
+    parameters:
+      - name: turma_id
+        in: path
+        type: integer
+        required: true
+    responses:
+      200:
+        description: >
+          Turma (da réplica local, null se ainda não sincronizada) e suas
+          avaliações ordenadas por tarefa e nome do aluno
+    """
+    return ReplicaController.get_avaliacoes_turma(turma_id)
+
+@rotas.route("/replicas", methods=["GET"])
+def get_replicas():
+    """Estado das réplicas locais de turmas, alunos e professores
+    ---
+    tags: [Réplicas]
+    responses:
+      200:
+        description: Marca (maior updated_at recebido) e instante da última sincronização de cada entidade
+    """
+    return ReplicaController.get_replicas()
+
+@rotas.route("/replicas/sincronizar", methods=["POST"])
+def sincronizar_replicas():
+    """Trazer do gerenciamento o que mudou desde a última sincronização
+    ---
+    tags: [Réplicas]
+    parameters:
+      - name: completo
+        in: query
+        type: boolean
+        description: Recarrega tudo e apaga da réplica o que não existe mais no gerenciamento
+    responses:
+      200: {description: Linhas gravadas por entidade e as novas marcas}
+      503: {description: Gerenciamento não configurado ou indisponível}
+    """
+    return ReplicaController.post_sincronizar()
+
+@rotas.route("/changes", methods=["GET"])
+def get_alteracoes():
+    """Feed de alterações (inserts, updates e deletes) a partir de um cursor
+    ---
+    tags: [Alterações]
+    parameters:
+      - name: since
+        in: query
+        type: integer
+        description: Último seq já consumido (padrão 0)
+      - name: limit
+        in: query
+        type: integer
+        description: Máximo de alterações (padrão 500, máx. 5000)
+      - name: colecao
+        in: query
+        type: string
+        description: Coleção ou lista separada por vírgulas (tarefas, avaliacoes)
+    responses:
+      200:
+        description: >
+          Alterações com seq > since em ordem, cada uma com coleção, id,
+          operação e o estado da entidade (null nos deletes). `next` é o
+          cursor da próxima chamada e `mais` indica se há outra página.
+      400: {description: Parâmetros inválidos}
+    """
+    return AlteracaoController.get_alteracoes()
+
+@rotas.route("/arquivamento", methods=["POST"])
+def arquivar():
+    """Arquivar tarefas de anos letivos anteriores e de turmas inativas
+    ---
+    tags: [Arquivamento]
+    responses:
+      200:
+        description: >
+          Tarefas com entrega antes do início do ano letivo (ANO_LETIVO_INICIO)
+          ou de turmas inativas na réplica, e suas avaliações, movidas para as
+          tabelas de arquivo; quantidade movida por coleção
+      500: {description: Falha no meio do arquivamento (os lotes anteriores ficam arquivados)}
+    """
+    return ArquivamentoController.post_arquivar()
+
+def create_app(config=Config):
+    app = Flask(__name__)
+    app.config.from_object(config)
+    if app.config.get("JSON_RAPIDO", True):
+        app.json = ProvedorJSON(app)
+    db.init_app(app)
+    Alteracao.monitorar({Tarefa: "tarefas", Avaliacao: "avaliacoes"})
+    with app.app_context():
+        configurar_sqlite(db.engine, app.config["SQLITE_PRAGMAS"])
+        metricas.init_app(app, db.engine)
+        perfilamento.init_app(app, db.engine)
+    gerenciamento.init_app(app)
+    BoletimController.init_app(app)
+
+    @app.cli.command("sincronizar-replicas")
+    @click.option("--completo", is_flag=True, help="Recarrega tudo e remove o que foi excluído.")
+    def sincronizar_replicas_comando(completo):
+        """Sincroniza as réplicas de turmas, alunos e professores."""
+        click.echo(ReplicaController.sincronizar(completo))
+
+    @app.cli.command("arquivar")
+    def arquivar_comando():
+        """Arquiva as tarefas de anos letivos anteriores e as de turmas inativas."""
+        click.echo(ArquivamentoController.arquivar())
+
+    Swagger(app, template=SWAGGER_TEMPLATE)
+    app.register_blueprint(rotas)
+    return app
 
-def init_db():
+def init_db(app):
     with app.app_context():
         db.create_all()
+        EstatisticaTarefa.sincronizar()
+        db.session.commit()
+        busca.instalar()
         print("✅ Base de dados do módulo Tarefas pronta para uso!")
 
 if __name__ == "__main__":
-    init_db()
-    app.run(host="0.0.0.0", port=5052, debug=True)
\ No newline at end of file
+    app = create_app()
+    init_db(app)
+    app.run(host="0.0.0.0", port=5052, debug=True)
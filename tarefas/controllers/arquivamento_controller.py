@@ -0,0 +1,25 @@
+from flask import current_app, jsonify
+from models import db
+from services.arquivamento import arquivar
+
+
+class ArquivamentoController:
+
+    @staticmethod
+    def arquivar():
+        """Move para o arquivo as tarefas de anos letivos anteriores e as de turmas inativas."""
+        config = current_app.config
+        return arquivar(
+            inicio=config.get("ANO_LETIVO_INICIO", "02-01"),
+            lote=config.get("ARQUIVO_LOTE", 1000)
+        )
+
+    @staticmethod
+    def post_arquivar():
+        """Cada lote é efetivado ao ser movido; numa falha só o lote corrente é desfeito."""
+        try:
+            movidos = ArquivamentoController.arquivar()
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({"erro": f"Erro ao arquivar: {str(e)}"}), 500
+        return jsonify({"movidos": movidos}), 200
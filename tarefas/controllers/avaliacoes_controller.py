@@ -1,8 +1,54 @@
 from flask import request, jsonify
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.exc import IntegrityError
 from models.avaliacoes import Avaliacao, db
+from models.tarefas import Tarefa
+from models.medias import MediaAluno
+from models.estatisticas import EstatisticaTarefa
+from models.alteracoes import Alteracao
+from models.versao import VersaoColecao
+from services.arquivamento import AVALIACOES, TAREFAS, incluir_arquivados
+from services.gerenciamento_client import validar_referencias
+from utils.exportacao import exportar, ler_formato
+from utils.filtros import Filtro, aplicar_filtros, numero
+from utils.serializacao import Serializador
 
 class AvaliacaoController:
 
+    FILTROS = {
+        "id": Filtro(Avaliacao.id),
+        "aluno_id": Filtro(Avaliacao.aluno_id),
+        "tarefa_id": Filtro(Avaliacao.tarefa_id),
+        "turma_id": Filtro(expressao=lambda turmas: Avaliacao.tarefa_id.in_(
+            select(Tarefa.id).where(Tarefa.turma_id.in_(turmas))
+        )),
+        "nota_de": Filtro(Avaliacao.nota, ">=", numero),
+        "nota_ate": Filtro(Avaliacao.nota, "<=", numero)
+    }
+
+    LINHA = Serializador(Avaliacao.id, Avaliacao.nota, Avaliacao.aluno_id, Avaliacao.tarefa_id)
+
+    # Notas arquivadas só existem junto com a tarefa, então o filtro por
+    # turma no arquivo olha as tarefas arquivadas.
+    FILTROS_ARQUIVO = AVALIACOES.filtros(FILTROS, turma_id=Filtro(
+        expressao=lambda turmas: AVALIACOES.tabela.c.tarefa_id.in_(
+            select(TAREFAS.tabela.c.id).where(TAREFAS.tabela.c.turma_id.in_(turmas))
+        )
+    ))
+
+    @staticmethod
+    def _aplicar_nota(tarefa_id, aluno_id, nota, sinal):
+        """Soma (sinal 1) ou retira (sinal -1) a nota da média do aluno e das estatísticas da tarefa."""
+        tarefa = Tarefa.query.get(tarefa_id)
+        if tarefa:
+            MediaAluno.aplicar_nota(tarefa.turma_id, aluno_id, nota, sinal * tarefa.peso_porcento)
+            EstatisticaTarefa.aplicar_nota(tarefa_id, nota, sinal)
+
+    @staticmethod
+    def _versoes_alunos(*aluno_ids):
+        return [VersaoColecao.escopo("avaliacoes", "aluno", aluno_id) for aluno_id in aluno_ids]
+
     @staticmethod
     def _get_data():
         data = request.get_json()
@@ -10,17 +56,49 @@ class AvaliacaoController:
             return None, jsonify({"erro": "Dados inválidos"}), 400
         return data, None, None
 
+    @staticmethod
+    def _consulta():
+        """Colunas de LINHA com os filtros da query string (e o arquivo, se pedido) e a coluna de ordenação."""
+        linha = AvaliacaoController.LINHA
+        query = linha.selecionar(aplicar_filtros(Avaliacao.query, AvaliacaoController.FILTROS, request.args))
+        if not incluir_arquivados(request.args):
+            return query, Avaliacao.id
+        frio = aplicar_filtros(
+            AVALIACOES.selecionar(linha.colunas), AvaliacaoController.FILTROS_ARQUIVO, request.args
+        )
+        return AVALIACOES.unir(query, frio)
+
     @staticmethod
     def get_avaliacoes():
-        avaliacoes = Avaliacao.query.all()
-        return jsonify([a.to_dict() for a in avaliacoes]), 200
+        try:
+            query, coluna_id = AvaliacaoController._consulta()
+        except ValueError as e:
+            return jsonify({"erro": str(e)}), 400
+
+        return jsonify(AvaliacaoController.LINHA.lista(query.order_by(coluna_id))), 200
+
+    @staticmethod
+    def export_avaliacoes():
+        try:
+            formato = ler_formato()
+            query, coluna_id = AvaliacaoController._consulta()
+        except ValueError as e:
+            return jsonify({"erro": str(e)}), 400
+        return exportar(query, coluna_id, AvaliacaoController.LINHA, formato, "avaliacoes")
 
     @staticmethod
     def get_avaliacao_by_id(avaliacao_id):
         avaliacao = Avaliacao.query.get(avaliacao_id)
-        if not avaliacao:
+        if avaliacao:
+            return jsonify(avaliacao.to_dict()), 200
+        try:
+            arquivados = incluir_arquivados(request.args)
+        except ValueError as e:
+            return jsonify({"erro": str(e)}), 400
+        arquivada = AVALIACOES.buscar(AvaliacaoController.LINHA.colunas, avaliacao_id) if arquivados else None
+        if not arquivada:
             return jsonify({"erro": "Avaliação não encontrada"}), 404
-        return jsonify(avaliacao.to_dict()), 200
+        return jsonify(AvaliacaoController.LINHA(arquivada)), 200
 
     @staticmethod
     def create_avaliacao():
@@ -33,6 +111,10 @@ class AvaliacaoController:
             if campo not in data:
                 return jsonify({"erro": f"Campo obrigatório '{campo}' ausente"}), 400
 
+        erro_referencia = validar_referencias(alunos=[data["aluno_id"]])
+        if erro_referencia:
+            return erro_referencia
+
         try:
             nova_avaliacao = Avaliacao(
                 nota=data["nota"],
@@ -40,8 +122,17 @@ class AvaliacaoController:
                 tarefa_id=data["tarefa_id"]
             )
             db.session.add(nova_avaliacao)
+            AvaliacaoController._aplicar_nota(
+                nova_avaliacao.tarefa_id, nova_avaliacao.aluno_id, nova_avaliacao.nota, 1
+            )
+            VersaoColecao.incrementar(
+                "avaliacoes", *AvaliacaoController._versoes_alunos(nova_avaliacao.aluno_id)
+            )
             db.session.commit()
             return jsonify(nova_avaliacao.to_dict()), 201
+        except IntegrityError:
+            db.session.rollback()
+            return jsonify({"erro": "Já existe avaliação deste aluno para esta tarefa"}), 409
         except Exception as e:
             db.session.rollback()
             return jsonify({"erro": f"Erro ao criar avaliação: {str(e)}"}), 500
@@ -56,16 +147,35 @@ class AvaliacaoController:
         if error_response:
             return error_response, status
 
+        if "aluno_id" in data:
+            erro_referencia = validar_referencias(alunos=[data["aluno_id"]])
+            if erro_referencia:
+                return erro_referencia
+
+        aluno_anterior = avaliacao.aluno_id
+
         try:
+            AvaliacaoController._aplicar_nota(
+                avaliacao.tarefa_id, avaliacao.aluno_id, avaliacao.nota, -1
+            )
             if "nota" in data:
                 avaliacao.nota = data["nota"]
             if "aluno_id" in data:
                 avaliacao.aluno_id = data["aluno_id"]
             if "tarefa_id" in data:
                 avaliacao.tarefa_id = data["tarefa_id"]
+            AvaliacaoController._aplicar_nota(
+                avaliacao.tarefa_id, avaliacao.aluno_id, avaliacao.nota, 1
+            )
 
+            VersaoColecao.incrementar(
+                "avaliacoes", *AvaliacaoController._versoes_alunos(aluno_anterior, avaliacao.aluno_id)
+            )
             db.session.commit()
             return jsonify(avaliacao.to_dict()), 200
+        except IntegrityError:
+            db.session.rollback()
+            return jsonify({"erro": "Já existe avaliação deste aluno para esta tarefa"}), 409
         except Exception as e:
             db.session.rollback()
             return jsonify({"erro": f"Erro ao atualizar avaliação: {str(e)}"}), 500
@@ -77,9 +187,82 @@ class AvaliacaoController:
             return jsonify({"erro": "Avaliação não encontrada"}), 404
 
         try:
+            AvaliacaoController._aplicar_nota(
+                avaliacao.tarefa_id, avaliacao.aluno_id, avaliacao.nota, -1
+            )
             db.session.delete(avaliacao)
+            VersaoColecao.incrementar(
+                "avaliacoes", *AvaliacaoController._versoes_alunos(avaliacao.aluno_id)
+            )
             db.session.commit()
             return jsonify({"mensagem": "Avaliação removida com sucesso"}), 200
         except Exception as e:
             db.session.rollback()
-            return jsonify({"erro": f"Erro ao deletar avaliação: {str(e)}"}), 500
\ No newline at end of file
+            return jsonify({"erro": f"Erro ao deletar avaliação: {str(e)}"}), 500
+
+    @staticmethod
+    def upsert_avaliacoes_tarefa(tarefa_id):
+        tarefa = Tarefa.query.get(tarefa_id)
+        if not tarefa:
+            return jsonify({"erro": "Tarefa não encontrada"}), 404
+
+        data = request.get_json(silent=True)
+        if not isinstance(data, list) or not data:
+            return jsonify({"erro": "Envie uma lista de {aluno_id, nota}"}), 400
+
+        notas = {}
+        erros = []
+        for posicao, item in enumerate(data):
+            aluno_id = item.get("aluno_id") if isinstance(item, dict) else None
+            nota = item.get("nota") if isinstance(item, dict) else None
+            if not isinstance(aluno_id, int) or isinstance(aluno_id, bool):
+                erros.append({"posicao": posicao, "erro": "Campo 'aluno_id' inteiro obrigatório"})
+            elif not isinstance(nota, (int, float)) or isinstance(nota, bool):
+                erros.append({"posicao": posicao, "erro": "Campo 'nota' numérico obrigatório"})
+            else:
+                notas[aluno_id] = float(nota)
+        if erros:
+            return jsonify({"erro": "Dados inválidos", "detalhes": erros}), 400
+
+        erro_referencia = validar_referencias(alunos=notas.keys())
+        if erro_referencia:
+            return erro_referencia
+
+        stmt = insert(Avaliacao)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Avaliacao.tarefa_id, Avaliacao.aluno_id],
+            set_={"nota": stmt.excluded.nota}
+        )
+        linha = AvaliacaoController.LINHA
+        da_tarefa = linha.selecionar(Avaliacao.query).filter(
+            Avaliacao.tarefa_id == tarefa_id,
+            Avaliacao.aluno_id.in_(notas.keys())
+        ).order_by(Avaliacao.aluno_id)
+        try:
+            existentes = {item["aluno_id"] for item in linha.lista(da_tarefa)}
+            MediaAluno.aplicar_tarefa(tarefa.id, tarefa.turma_id, -tarefa.peso_porcento, notas.keys())
+            EstatisticaTarefa.aplicar_tarefa(tarefa.id, -1, notas.keys())
+            db.session.execute(stmt, [
+                {"tarefa_id": tarefa_id, "aluno_id": aluno_id, "nota": nota}
+                for aluno_id, nota in notas.items()
+            ])
+            MediaAluno.aplicar_tarefa(tarefa.id, tarefa.turma_id, tarefa.peso_porcento, notas.keys())
+            EstatisticaTarefa.aplicar_tarefa(tarefa.id, 1, notas.keys())
+
+            # Upsert em Core não dispara o after_flush: notas novas e alteradas vão ao feed aqui.
+            avaliacoes = linha.lista(da_tarefa)
+            Alteracao.registrar("avaliacoes", Alteracao.INSERT,
+                                [a for a in avaliacoes if a["aluno_id"] not in existentes])
+            Alteracao.registrar("avaliacoes", Alteracao.UPDATE,
+                                [a for a in avaliacoes if a["aluno_id"] in existentes])
+            VersaoColecao.incrementar("avaliacoes", *AvaliacaoController._versoes_alunos(*notas))
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({"erro": f"Erro ao salvar avaliações: {str(e)}"}), 500
+
+        return jsonify({
+            "tarefa_id": tarefa_id,
+            "total": len(avaliacoes),
+            "avaliacoes": avaliacoes
+        }), 200
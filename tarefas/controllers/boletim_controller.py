@@ -0,0 +1,130 @@
+from flask import request, jsonify
+from sqlalchemy import and_, case, func, select
+from models import db
+from models.avaliacoes import Avaliacao
+from models.tarefas import Tarefa
+from models.versao import VersaoColecao
+from services.gerenciamento_client import GerenciamentoIndisponivel, gerenciamento
+from utils.cache import CacheLRU
+
+class BoletimController:
+
+    # Boletins prontos por (aluno, turma), guardados junto das versões com que
+    # foram calculados. A validade é conferida a cada leitura contra as versões
+    # do aluno e da turma no banco, então uma escrita em qualquer worker
+    # invalida o boletim em todos eles.
+    cache = CacheLRU(tamanho_maximo=20000, ttl=600)
+
+    @classmethod
+    def init_app(cls, app):
+        cls.cache = CacheLRU(
+            tamanho_maximo=app.config.get("BOLETIM_CACHE_TAMANHO", 20000),
+            ttl=app.config.get("BOLETIM_CACHE_TTL", 600)
+        )
+
+    @staticmethod
+    def colecoes(aluno_id, turma_id):
+        return [
+            VersaoColecao.escopo("avaliacoes", "aluno", aluno_id),
+            VersaoColecao.escopo("tarefas", "turma", turma_id)
+        ]
+
+    @staticmethod
+    def _turma_do_aluno(aluno_id):
+        """Turma do aluno segundo o gerenciamento ou, sem ele, pelas avaliações já lançadas."""
+        if gerenciamento.habilitado:
+            try:
+                aluno = gerenciamento.buscar("alunos", aluno_id)
+                return aluno["turma_id"] if aluno else None
+            except GerenciamentoIndisponivel:
+                pass
+
+        return db.session.execute(
+            select(Tarefa.turma_id)
+            .join(Avaliacao, Avaliacao.tarefa_id == Tarefa.id)
+            .where(Avaliacao.aluno_id == aluno_id)
+            .order_by(Tarefa.data_entrega.desc(), Tarefa.id.desc())
+            .limit(1)
+        ).scalar()
+
+    @staticmethod
+    def _consultar(aluno_id, turma_id):
+        """Monta o boletim com uma única consulta: tarefas da turma com a nota do aluno
+        (LEFT JOIN) e as somas ponderadas calculadas por funções de janela."""
+        ordem = (Tarefa.data_entrega, Tarefa.id)
+        ponderada = Avaliacao.nota * Tarefa.peso_porcento
+        peso_avaliado = case((Avaliacao.nota.is_not(None), Tarefa.peso_porcento), else_=0)
+
+        linhas = db.session.execute(
+            select(
+                Tarefa.id,
+                Tarefa.nome_tarefa,
+                Tarefa.data_entrega,
+                Tarefa.peso_porcento,
+                Avaliacao.id.label("avaliacao_id"),
+                Avaliacao.nota,
+                func.sum(ponderada).over(order_by=ordem).label("soma_acumulada"),
+                func.sum(peso_avaliado).over(order_by=ordem).label("peso_acumulado"),
+                func.sum(ponderada).over().label("soma_ponderada"),
+                func.sum(peso_avaliado).over().label("peso_avaliado"),
+                func.sum(Tarefa.peso_porcento).over().label("peso_total")
+            )
+            .outerjoin(Avaliacao, and_(
+                Avaliacao.tarefa_id == Tarefa.id,
+                Avaliacao.aluno_id == aluno_id
+            ))
+            .where(Tarefa.turma_id == turma_id)
+            .order_by(*ordem)
+        ).all()
+
+        def dividir(soma, peso):
+            return round(soma / peso, 2) if soma is not None and peso else None
+
+        tarefas = [{
+            "tarefa_id": linha.id,
+            "nome_tarefa": linha.nome_tarefa,
+            "data_entrega": linha.data_entrega.isoformat() if linha.data_entrega else None,
+            "peso_porcento": linha.peso_porcento,
+            "avaliacao_id": linha.avaliacao_id,
+            "nota": linha.nota,
+            "media_acumulada": dividir(linha.soma_acumulada, linha.peso_acumulado)
+        } for linha in linhas]
+
+        totais = linhas[0] if linhas else None
+        return {
+            "aluno_id": aluno_id,
+            "turma_id": turma_id,
+            "tarefas": tarefas,
+            "peso_avaliado": totais.peso_avaliado if totais else 0,
+            "peso_total": totais.peso_total if totais else 0,
+            # Parcial: média só das tarefas já avaliadas. Final: tarefas sem nota
+            # contam como zero sobre o peso total da turma.
+            "media_parcial": dividir(totais.soma_ponderada, totais.peso_avaliado) if totais else None,
+            "media_final": dividir(totais.soma_ponderada or 0, totais.peso_total) if totais else None
+        }
+
+    @staticmethod
+    def get_boletim(aluno_id):
+        turma_id = request.args.get("turma_id")
+        if turma_id is not None:
+            try:
+                turma_id = int(turma_id)
+            except ValueError:
+                return jsonify({"erro": "Valor inválido para turma_id"}), 400
+        else:
+            turma_id = BoletimController._turma_do_aluno(aluno_id)
+            if turma_id is None:
+                return jsonify({"erro": "Aluno não encontrado ou sem turma"}), 404
+
+        # As versões são lidas antes da consulta: se uma escrita acontecer no
+        # meio, o boletim fica guardado com versões antigas e é refeito na
+        # próxima leitura, nunca servido desatualizado.
+        versoes = VersaoColecao.obter(BoletimController.colecoes(aluno_id, turma_id))
+        chave = (aluno_id, turma_id)
+        guardado = BoletimController.cache.get(chave)
+        if guardado and guardado[0] == versoes:
+            return jsonify(guardado[1]), 200
+
+        boletim = BoletimController._consultar(aluno_id, turma_id)
+        BoletimController.cache.set(chave, (versoes, boletim))
+        return jsonify(boletim), 200
@@ -0,0 +1,80 @@
+from flask import request, jsonify
+from models.estatisticas import EstatisticaTarefa, db
+from models.tarefas import Tarefa
+from models.versao import VersaoColecao
+
+class EstatisticaController:
+
+    PERCENTIS = (10, 25, 50, 75, 90)
+    FAIXAS = 10
+    MAX_FAIXAS = 100
+
+    @staticmethod
+    def _ler_parametros():
+        valor = request.args.get("percentis")
+        try:
+            percentis = [float(p) for p in valor.split(",")] if valor else list(EstatisticaController.PERCENTIS)
+        except ValueError:
+            raise ValueError("Valor inválido para percentis")
+        if any(not 0 <= p <= 100 for p in percentis):
+            raise ValueError("Percentis devem estar entre 0 e 100")
+
+        try:
+            faixas = int(request.args.get("faixas", EstatisticaController.FAIXAS))
+        except ValueError:
+            raise ValueError("Valor inválido para faixas")
+        if not 1 <= faixas <= EstatisticaController.MAX_FAIXAS:
+            raise ValueError(f"faixas deve estar entre 1 e {EstatisticaController.MAX_FAIXAS}")
+
+        quantis = request.args.get("quantis", "true").lower() != "false"
+        return percentis, faixas, quantis
+
+    @staticmethod
+    def get_estatisticas_tarefa(tarefa_id):
+        if not Tarefa.query.get(tarefa_id):
+            return jsonify({"erro": "Tarefa não encontrada"}), 404
+
+        try:
+            percentis, faixas, quantis = EstatisticaController._ler_parametros()
+        except ValueError as e:
+            return jsonify({"erro": str(e)}), 400
+
+        estatistica = EstatisticaTarefa.query.get(tarefa_id) or EstatisticaTarefa(
+            tarefa_id=tarefa_id, quantidade=0, soma=0, soma_quadrados=0
+        )
+        if not quantis:
+            return jsonify(estatistica.to_dict()), 200
+
+        notas = EstatisticaTarefa.notas_ordenadas(tarefa_id)
+        if len(notas) != estatistica.quantidade:
+            # Somas fora de sincronia: responde com as notas lidas, sem gravar
+            # (a linha é refeita por POST .../estatisticas/recalcular).
+            estatistica = EstatisticaTarefa.de_notas(tarefa_id, notas)
+
+        resposta = estatistica.to_dict()
+        if notas:
+            resposta.update({
+                "minimo": notas[0],
+                "maximo": notas[-1],
+                "mediana": EstatisticaTarefa.percentil(notas, 50),
+                "percentis": {
+                    f"p{p:g}": EstatisticaTarefa.percentil(notas, p) for p in percentis
+                },
+                "histograma": EstatisticaTarefa.histograma(
+                    notas, min(0.0, notas[0]), max(10.0, notas[-1]), faixas
+                )
+            })
+        return jsonify(resposta), 200
+
+    @staticmethod
+    def recalcular_estatisticas_tarefa(tarefa_id):
+        if not Tarefa.query.get(tarefa_id):
+            return jsonify({"erro": "Tarefa não encontrada"}), 404
+        try:
+            EstatisticaTarefa.recalcular([tarefa_id])
+            VersaoColecao.incrementar("estatisticas")
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({"erro": f"Erro ao recalcular estatísticas: {str(e)}"}), 500
+        return EstatisticaController.get_estatisticas_tarefa(tarefa_id)
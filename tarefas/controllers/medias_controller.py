@@ -0,0 +1,28 @@
+from flask import jsonify
+from models.medias import MediaAluno, db
+from models.versao import VersaoColecao
+
+class MediaController:
+
+    @staticmethod
+    def get_medias_turma(turma_id):
+        medias = MediaAluno.query.filter_by(turma_id=turma_id).order_by(MediaAluno.aluno_id).all()
+        return jsonify([m.to_dict() for m in medias]), 200
+
+    @staticmethod
+    def get_media_aluno(turma_id, aluno_id):
+        media = MediaAluno.query.get((turma_id, aluno_id))
+        if not media:
+            return jsonify({"erro": "Aluno sem avaliações nesta turma"}), 404
+        return jsonify(media.to_dict()), 200
+
+    @staticmethod
+    def recalcular_medias_turma(turma_id):
+        try:
+            MediaAluno.recalcular_turma(turma_id)
+            VersaoColecao.incrementar("medias")
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({"erro": f"Erro ao recalcular médias: {str(e)}"}), 500
+        return MediaController.get_medias_turma(turma_id)
@@ -0,0 +1,82 @@
+from flask import current_app, request, jsonify
+from sqlalchemy import select
+from models import db
+from models.avaliacoes import Avaliacao
+from models.tarefas import Tarefa
+from models.replicas import AlunoReplica, ProfessorReplica, Replicas, TurmaReplica
+from services.gerenciamento_client import GerenciamentoIndisponivel, gerenciamento
+from utils.filtros import booleano
+from utils.serializacao import Serializador
+
+class ReplicaController:
+
+    # Uma linha por avaliação da turma, já com o nome do aluno (da réplica)
+    # e os dados da tarefa.
+    LINHA_AVALIACAO = Serializador(
+        Avaliacao.id, Avaliacao.nota, Avaliacao.aluno_id,
+        AlunoReplica.nome.label("aluno_nome"),
+        Avaliacao.tarefa_id, Tarefa.nome_tarefa, Tarefa.data_entrega, Tarefa.peso_porcento
+    )
+
+    @staticmethod
+    def sincronizar(completo=False):
+        """Sincroniza as réplicas com o gerenciamento usando a configuração do app."""
+        config = current_app.config
+        return Replicas.sincronizar(
+            gerenciamento,
+            completo=completo,
+            margem=config.get("REPLICA_MARGEM_S", 10),
+            lote=config.get("REPLICA_LOTE", 1000)
+        )
+
+    @staticmethod
+    def get_replicas():
+        return jsonify(Replicas.marcas()), 200
+
+    @staticmethod
+    def post_sincronizar():
+        if not gerenciamento.base_url:
+            return jsonify({"erro": "GERENCIAMENTO_URL não configurada"}), 503
+        try:
+            completo = booleano(request.args.get("completo", "false"))
+        except ValueError:
+            return jsonify({"erro": "Parâmetro 'completo' deve ser true ou false"}), 400
+
+        try:
+            gravados = ReplicaController.sincronizar(completo=completo)
+        except GerenciamentoIndisponivel as e:
+            db.session.rollback()
+            return jsonify({"erro": "Serviço de gerenciamento indisponível", "detalhe": str(e)}), 503
+        return jsonify({"gravados": gravados, "marcas": Replicas.marcas()}), 200
+
+    @staticmethod
+    def get_avaliacoes_turma(turma_id):
+        """Avaliações da turma com nomes de alunos e tarefas numa única consulta local.
+
+        Os nomes vêm da réplica; aluno ainda não sincronizado sai com
+        `aluno_nome` nulo em vez de sumir da lista.
+        """
+        turma = db.session.execute(
+            select(TurmaReplica.id, TurmaReplica.descricao, TurmaReplica.professor_id,
+                   ProfessorReplica.nome)
+            .outerjoin(ProfessorReplica, ProfessorReplica.id == TurmaReplica.professor_id)
+            .where(TurmaReplica.id == turma_id)
+        ).first()
+
+        linha = ReplicaController.LINHA_AVALIACAO
+        avaliacoes = db.session.execute(
+            select(*linha.colunas)
+            .join(Tarefa, Tarefa.id == Avaliacao.tarefa_id)
+            .outerjoin(AlunoReplica, AlunoReplica.id == Avaliacao.aluno_id)
+            .where(Tarefa.turma_id == turma_id)
+            .order_by(Tarefa.data_entrega, Tarefa.id, AlunoReplica.nome, Avaliacao.aluno_id)
+        )
+        return jsonify({
+            "turma": {
+                "id": turma.id,
+                "descricao": turma.descricao,
+                "professor_id": turma.professor_id,
+                "professor_nome": turma.nome
+            } if turma else None,
+            "avaliacoes": linha.lista(avaliacoes)
+        }), 200
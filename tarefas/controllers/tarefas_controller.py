@@ -1,9 +1,31 @@
 from flask import request, jsonify
 from datetime import datetime
 from models.tarefas import Tarefa, db
+from models.medias import MediaAluno
+from models.estatisticas import EstatisticaTarefa
+from models.versao import VersaoColecao
+from services import busca
+from services.arquivamento import TAREFAS, incluir_arquivados
+from services.gerenciamento_client import validar_referencias
+from utils.filtros import Filtro, aplicar_filtros, data_iso
+from utils.serializacao import Serializador
 
 class TarefaController:
 
+    FILTROS = {
+        "id": Filtro(Tarefa.id),
+        "turma_id": Filtro(Tarefa.turma_id),
+        "professor_id": Filtro(Tarefa.professor_id),
+        "data_entrega_de": Filtro(Tarefa.data_entrega, ">=", data_iso),
+        "data_entrega_ate": Filtro(Tarefa.data_entrega, "<=", data_iso)
+    }
+
+    # Mesmo formato de Tarefa.to_dict, montado direto das colunas.
+    LINHA = Serializador(
+        Tarefa.id, Tarefa.nome_tarefa, Tarefa.descricao, Tarefa.peso_porcento,
+        Tarefa.data_entrega, Tarefa.turma_id, Tarefa.professor_id
+    )
+
     @staticmethod
     def _get_data():
         data = request.get_json()
@@ -16,8 +38,32 @@ class TarefaController:
         if request.method != 'GET':
             return jsonify({"erro": "Método não permitido"}), 405
 
-        tarefas = Tarefa.query.all()
-        return jsonify([tarefa.to_dict() for tarefa in tarefas]), 200
+        linha = TarefaController.LINHA
+        try:
+            query = linha.selecionar(aplicar_filtros(Tarefa.query, TarefaController.FILTROS, request.args))
+            if incluir_arquivados(request.args):
+                frio = aplicar_filtros(
+                    TAREFAS.selecionar(linha.colunas), TAREFAS.filtros(TarefaController.FILTROS), request.args
+                )
+                query, coluna_id = TAREFAS.unir(query, frio)
+                query = query.order_by(coluna_id)
+        except ValueError as e:
+            return jsonify({"erro": str(e)}), 400
+
+        return jsonify(linha.lista(query)), 200
+
+    @staticmethod
+    def buscar_tarefas():
+        if request.method != 'GET':
+            return jsonify({"erro": "Método não permitido"}), 405
+
+        linha = TarefaController.LINHA
+        try:
+            consulta, limit, offset = busca.ler_busca(request.args)
+            query = linha.selecionar(aplicar_filtros(Tarefa.query, TarefaController.FILTROS, request.args))
+        except ValueError as e:
+            return jsonify({"erro": str(e)}), 400
+        return jsonify(busca.TAREFAS.paginar(query, consulta, linha, limit, offset)), 200
 
     @staticmethod
     def get_tarefa_by_id(tarefa_id):
@@ -25,10 +71,16 @@ class TarefaController:
             return jsonify({"erro": "Método não permitido"}), 405
 
         tarefa = Tarefa.query.get(tarefa_id)
-        if not tarefa:
+        if tarefa:
+            return jsonify(tarefa.to_dict()), 200
+        try:
+            arquivados = incluir_arquivados(request.args)
+        except ValueError as e:
+            return jsonify({"erro": str(e)}), 400
+        arquivada = TAREFAS.buscar(TarefaController.LINHA.colunas, tarefa_id) if arquivados else None
+        if not arquivada:
             return jsonify({"erro": "Tarefa não encontrada"}), 404
-
-        return jsonify(tarefa.to_dict()), 200
+        return jsonify(TarefaController.LINHA(arquivada)), 200
 
     @staticmethod
     def create_tarefa():
@@ -44,6 +96,10 @@ class TarefaController:
             if campo not in data:
                 return jsonify({"erro": f"Campo obrigatório '{campo}' ausente"}), 400
 
+        erro_referencia = validar_referencias(turmas=[data["turma_id"]], professores=[data["professor_id"]])
+        if erro_referencia:
+            return erro_referencia
+
         try:
             nova_tarefa = Tarefa(
                 nome_tarefa=data["nome_tarefa"],
@@ -54,6 +110,9 @@ class TarefaController:
                 professor_id=data["professor_id"]
             )
             db.session.add(nova_tarefa)
+            VersaoColecao.incrementar(
+                "tarefas", VersaoColecao.escopo("tarefas", "turma", nova_tarefa.turma_id)
+            )
             db.session.commit()
             return jsonify(nova_tarefa.to_dict()), 201
 
@@ -74,6 +133,15 @@ class TarefaController:
         if error_response:
             return error_response, status
 
+        erro_referencia = validar_referencias(
+            turmas=[data["turma_id"]] if "turma_id" in data else [],
+            professores=[data["professor_id"]] if "professor_id" in data else []
+        )
+        if erro_referencia:
+            return erro_referencia
+
+        turma_anterior, peso_anterior = tarefa.turma_id, tarefa.peso_porcento
+
         campos = ["nome_tarefa", "descricao", "peso_porcento", "data_entrega", "turma_id", "professor_id"]
         for campo in campos:
             if campo in data:
@@ -83,6 +151,14 @@ class TarefaController:
                     setattr(tarefa, campo, data[campo])
 
         try:
+            if (tarefa.turma_id, tarefa.peso_porcento) != (turma_anterior, peso_anterior):
+                MediaAluno.aplicar_tarefa(tarefa.id, turma_anterior, -peso_anterior)
+                MediaAluno.aplicar_tarefa(tarefa.id, tarefa.turma_id, tarefa.peso_porcento)
+            VersaoColecao.incrementar(
+                "tarefas",
+                VersaoColecao.escopo("tarefas", "turma", turma_anterior),
+                VersaoColecao.escopo("tarefas", "turma", tarefa.turma_id)
+            )
             db.session.commit()
             return jsonify(tarefa.to_dict()), 200
         except Exception as e:
@@ -99,7 +175,12 @@ class TarefaController:
             return jsonify({"erro": "Tarefa não encontrada"}), 404
 
         try:
+            MediaAluno.aplicar_tarefa(tarefa.id, tarefa.turma_id, -tarefa.peso_porcento)
+            EstatisticaTarefa.query.filter_by(tarefa_id=tarefa.id).delete()
             db.session.delete(tarefa)
+            VersaoColecao.incrementar(
+                "tarefas", VersaoColecao.escopo("tarefas", "turma", tarefa.turma_id)
+            )
             db.session.commit()
             return jsonify({"mensagem": "Tarefa removida com sucesso"}), 200
         except Exception as e:
@@ -0,0 +1,58 @@
+import itertools
+import multiprocessing
+import os
+import tempfile
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5052')}"
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+worker_class = "gthread"
+preload_app = True
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "10000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "1000"))
+accesslog = "-"
+
+# Os workers somam as métricas por arquivos neste diretório (ver utils/metricas.py).
+os.environ.setdefault("METRICAS_DIR", os.path.join(
+    tempfile.gettempdir(), f"metricas-{os.path.basename(os.path.dirname(os.path.abspath(__file__)))}"
+))
+
+
+def on_starting(server):
+    """Cria as tabelas uma única vez, no processo mestre, antes do fork dos workers."""
+    from app import create_app, init_db
+    from models import db
+    from utils.metricas import metricas
+
+    app = create_app()
+    init_db(app)
+    metricas.limpar_diretorio()
+    with app.app_context():
+        db.engine.dispose()
+
+
+def pre_fork(server, worker):
+    """Dá ao worker o menor índice livre; quem substitui um worker reciclado herda o dele."""
+    usados = {getattr(ativo, "indice", None) for ativo in server.WORKERS.values()}
+    worker.indice = next(indice for indice in itertools.count() if indice not in usados)
+
+
+def post_fork(server, worker):
+    """Descarta conexões herdadas do mestre e adota o índice de métricas do worker."""
+    from models import db
+    from utils.metricas import metricas
+    from wsgi import app
+
+    with app.app_context():
+        db.engine.dispose()
+    metricas.definir_worker(worker.indice)
+
+
+def worker_exit(server, worker):
+    """Grava as métricas do worker que sai, para o substituto continuar delas."""
+    from utils.metricas import metricas
+
+    metricas.gravar()
@@ -2,6 +2,12 @@ from models import db
 
 class Avaliacao(db.Model):
     __tablename__ = "avaliacoes"
+    __table_args__ = (
+        db.Index("ux_avaliacoes_tarefa_aluno", "tarefa_id", "aluno_id", unique=True),
+        db.Index("ix_avaliacoes_aluno", "aluno_id"),
+        db.Index("ix_avaliacoes_tarefa_nota", "tarefa_id", "nota"),
+        {"sqlite_autoincrement": True},
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     nota = db.Column(db.Float, nullable=False)
@@ -0,0 +1,166 @@
+import math
+from bisect import bisect_left, bisect_right
+
+from models import db
+from models.avaliacoes import Avaliacao
+from sqlalchemy import func, literal, select
+from sqlalchemy.dialects.sqlite import insert
+
+
+class EstatisticaTarefa(db.Model):
+    """Contagem, soma e soma dos quadrados das notas de cada tarefa.
+
+    Mantidas por delta a cada escrita em avaliações, dão média e desvio padrão
+    sem ler as notas. Quantis e histograma saem de uma única leitura da coluna
+    já ordenada pelo índice (tarefa_id, nota).
+    """
+    __tablename__ = "estatisticas_tarefas"
+
+    tarefa_id = db.Column(db.Integer, primary_key=True)
+    quantidade = db.Column(db.Integer, nullable=False, default=0)
+    soma = db.Column(db.Float, nullable=False, default=0)
+    soma_quadrados = db.Column(db.Float, nullable=False, default=0)
+
+    @property
+    def media(self):
+        return self.soma / self.quantidade if self.quantidade else None
+
+    @property
+    def desvio_padrao(self):
+        if not self.quantidade:
+            return None
+        variancia = self.soma_quadrados / self.quantidade - self.media ** 2
+        return math.sqrt(max(variancia, 0.0))
+
+    @classmethod
+    def _upsert_somas(cls, stmt):
+        return stmt.on_conflict_do_update(
+            index_elements=[cls.tarefa_id],
+            set_={
+                "quantidade": cls.quantidade + stmt.excluded.quantidade,
+                "soma": cls.soma + stmt.excluded.soma,
+                "soma_quadrados": cls.soma_quadrados + stmt.excluded.soma_quadrados
+            }
+        )
+
+    @classmethod
+    def _limpar_vazias(cls, tarefa_id):
+        db.session.execute(
+            db.delete(cls).where(cls.tarefa_id == tarefa_id, cls.quantidade <= 0)
+        )
+
+    @classmethod
+    def aplicar_nota(cls, tarefa_id, nota, sinal):
+        """Acrescenta (sinal 1) ou retira (sinal -1) uma nota das somas da tarefa."""
+        db.session.execute(cls._upsert_somas(insert(cls).values(
+            tarefa_id=tarefa_id,
+            quantidade=sinal,
+            soma=sinal * nota,
+            soma_quadrados=sinal * nota * nota
+        )))
+        if sinal < 0:
+            cls._limpar_vazias(tarefa_id)
+
+    @classmethod
+    def aplicar_tarefa(cls, tarefa_id, sinal, aluno_ids=None):
+        """Aplica de uma vez as notas já gravadas de uma tarefa (ou de parte dos alunos)."""
+        origem = select(
+            literal(tarefa_id),
+            sinal * func.count(Avaliacao.id),
+            sinal * func.coalesce(func.sum(Avaliacao.nota), 0),
+            sinal * func.coalesce(func.sum(Avaliacao.nota * Avaliacao.nota), 0)
+        ).where(Avaliacao.tarefa_id == tarefa_id)
+        if aluno_ids is not None:
+            origem = origem.where(Avaliacao.aluno_id.in_(aluno_ids))
+
+        db.session.execute(cls._upsert_somas(insert(cls).from_select(
+            ["tarefa_id", "quantidade", "soma", "soma_quadrados"], origem
+        )))
+        if sinal < 0:
+            cls._limpar_vazias(tarefa_id)
+
+    @classmethod
+    def recalcular(cls, tarefa_ids=None):
+        """Reconstrói as somas a partir das avaliações (de todas as tarefas ou das informadas)."""
+        agregado = select(
+            Avaliacao.tarefa_id,
+            func.count(Avaliacao.id),
+            func.sum(Avaliacao.nota),
+            func.sum(Avaliacao.nota * Avaliacao.nota)
+        ).group_by(Avaliacao.tarefa_id)
+        remocao = db.delete(cls)
+        if tarefa_ids is not None:
+            agregado = agregado.where(Avaliacao.tarefa_id.in_(tarefa_ids))
+            remocao = remocao.where(cls.tarefa_id.in_(tarefa_ids))
+
+        db.session.execute(remocao)
+        db.session.execute(insert(cls).from_select(
+            ["tarefa_id", "quantidade", "soma", "soma_quadrados"], agregado
+        ))
+
+    @classmethod
+    def sincronizar(cls):
+        """Cria as somas das tarefas com avaliações gravadas antes desta tabela existir."""
+        agregado = select(
+            Avaliacao.tarefa_id,
+            func.count(Avaliacao.id),
+            func.sum(Avaliacao.nota),
+            func.sum(Avaliacao.nota * Avaliacao.nota)
+        ).where(
+            Avaliacao.tarefa_id.not_in(select(cls.tarefa_id))
+        ).group_by(Avaliacao.tarefa_id)
+        db.session.execute(insert(cls).from_select(
+            ["tarefa_id", "quantidade", "soma", "soma_quadrados"], agregado
+        ).on_conflict_do_nothing())
+
+    @classmethod
+    def de_notas(cls, tarefa_id, notas):
+        """Estatística (não gravada) calculada a partir das notas já lidas."""
+        return cls(
+            tarefa_id=tarefa_id,
+            quantidade=len(notas),
+            soma=sum(notas),
+            soma_quadrados=sum(nota * nota for nota in notas)
+        )
+
+    @staticmethod
+    def notas_ordenadas(tarefa_id):
+        """Todas as notas da tarefa em ordem crescente (varredura só do índice)."""
+        return db.session.execute(
+            select(Avaliacao.nota)
+            .where(Avaliacao.tarefa_id == tarefa_id)
+            .order_by(Avaliacao.nota)
+        ).scalars().all()
+
+    @staticmethod
+    def percentil(notas, p):
+        """Percentil p (0-100) de uma lista ordenada, com interpolação linear."""
+        posicao = (len(notas) - 1) * p / 100
+        abaixo = math.floor(posicao)
+        acima = min(abaixo + 1, len(notas) - 1)
+        return notas[abaixo] + (notas[acima] - notas[abaixo]) * (posicao - abaixo)
+
+    @staticmethod
+    def histograma(notas, inicio, fim, faixas):
+        """Contagem por faixas de largura igual entre inicio e fim; a última inclui o fim."""
+        largura = (fim - inicio) / faixas
+        limites = [inicio + largura * i for i in range(faixas)] + [fim]
+        resultado = []
+        for i in range(faixas):
+            ultima = i == faixas - 1
+            esquerda = bisect_left(notas, limites[i])
+            direita = bisect_right(notas, limites[i + 1]) if ultima else bisect_left(notas, limites[i + 1])
+            resultado.append({
+                "de": round(limites[i], 4),
+                "ate": round(limites[i + 1], 4),
+                "quantidade": direita - esquerda
+            })
+        return resultado
+
+    def to_dict(self):
+        return {
+            "tarefa_id": self.tarefa_id,
+            "quantidade": self.quantidade,
+            "media": self.media,
+            "desvio_padrao": self.desvio_padrao
+        }
@@ -0,0 +1,128 @@
+from models import db
+from models.avaliacoes import Avaliacao
+from models.tarefas import Tarefa
+from sqlalchemy import func, literal, select
+from sqlalchemy.dialects.sqlite import insert
+
+
+class MediaAluno(db.Model):
+    """Média ponderada materializada de cada aluno numa turma.
+
+    Guarda as somas (nota * peso e peso) para que cada escrita em avaliações
+    ou tarefas atualize a média com um delta, sem recalcular a turma inteira.
+    """
+    __tablename__ = "medias_alunos"
+
+    turma_id = db.Column(db.Integer, primary_key=True)
+    aluno_id = db.Column(db.Integer, primary_key=True)
+    soma_ponderada = db.Column(db.Float, nullable=False, default=0)
+    soma_pesos = db.Column(db.Integer, nullable=False, default=0)
+
+    @property
+    def media(self):
+        return self.soma_ponderada / self.soma_pesos if self.soma_pesos else None
+
+    @classmethod
+    def _upsert_somas(cls, stmt):
+        return stmt.on_conflict_do_update(
+            index_elements=[cls.turma_id, cls.aluno_id],
+            set_={
+                "soma_ponderada": cls.soma_ponderada + stmt.excluded.soma_ponderada,
+                "soma_pesos": cls.soma_pesos + stmt.excluded.soma_pesos
+            }
+        )
+
+    @classmethod
+    def _limpar_vazias(cls, turma_id):
+        db.session.execute(
+            db.delete(cls).where(cls.turma_id == turma_id, cls.soma_pesos <= 0)
+        )
+
+    @classmethod
+    def aplicar_nota(cls, turma_id, aluno_id, nota, peso):
+        """Soma a nota com o peso informado; peso negativo remove a contribuição."""
+        if not peso:
+            return
+        db.session.execute(cls._upsert_somas(insert(cls).values(
+            turma_id=turma_id,
+            aluno_id=aluno_id,
+            soma_ponderada=nota * peso,
+            soma_pesos=peso
+        )))
+        if peso < 0:
+            cls._limpar_vazias(turma_id)
+
+    @classmethod
+    def aplicar_tarefa(cls, tarefa_id, turma_id, peso, aluno_ids=None):
+        """Aplica de uma vez as notas já gravadas de uma tarefa (ou de parte dos alunos)."""
+        if not peso:
+            return
+        origem = select(
+            literal(turma_id),
+            Avaliacao.aluno_id,
+            Avaliacao.nota * peso,
+            literal(peso)
+        ).where(Avaliacao.tarefa_id == tarefa_id)
+        if aluno_ids is not None:
+            origem = origem.where(Avaliacao.aluno_id.in_(aluno_ids))
+
+        db.session.execute(cls._upsert_somas(insert(cls).from_select(
+            ["turma_id", "aluno_id", "soma_ponderada", "soma_pesos"], origem
+        )))
+        if peso < 0:
+            cls._limpar_vazias(turma_id)
+
+    @classmethod
+    def retirar_avaliacoes(cls, avaliacao_ids):
+        """Desconta das médias as notas `avaliacao_ids`, com o peso atual de cada tarefa.
+
+        É o delta inverso de ``aplicar_tarefa`` para um conjunto de notas de
+        tarefas quaisquer (o arquivamento as tira em lotes por id).
+        """
+        notas = select(Avaliacao.tarefa_id, Avaliacao.aluno_id, Avaliacao.nota).where(
+            Avaliacao.id.in_(avaliacao_ids)
+        ).subquery()
+        agregado = select(
+            Tarefa.turma_id,
+            notas.c.aluno_id,
+            -func.sum(notas.c.nota * Tarefa.peso_porcento),
+            -func.sum(Tarefa.peso_porcento)
+        ).join(
+            Tarefa, Tarefa.id == notas.c.tarefa_id
+        ).group_by(Tarefa.turma_id, notas.c.aluno_id)
+
+        db.session.execute(cls._upsert_somas(insert(cls).from_select(
+            ["turma_id", "aluno_id", "soma_ponderada", "soma_pesos"], agregado
+        )))
+        db.session.execute(db.delete(cls).where(
+            cls.turma_id.in_(select(Tarefa.turma_id).where(Tarefa.id.in_(select(notas.c.tarefa_id)))),
+            cls.soma_pesos <= 0
+        ))
+
+    @classmethod
+    def recalcular_turma(cls, turma_id):
+        """Reconstrói as médias da turma a partir de um único agregado sobre tarefas e avaliações."""
+        agregado = select(
+            Tarefa.turma_id,
+            Avaliacao.aluno_id,
+            func.sum(Avaliacao.nota * Tarefa.peso_porcento),
+            func.sum(Tarefa.peso_porcento)
+        ).join(
+            Tarefa, Tarefa.id == Avaliacao.tarefa_id
+        ).where(
+            Tarefa.turma_id == turma_id
+        ).group_by(Tarefa.turma_id, Avaliacao.aluno_id)
+
+        db.session.execute(db.delete(cls).where(cls.turma_id == turma_id))
+        db.session.execute(insert(cls).from_select(
+            ["turma_id", "aluno_id", "soma_ponderada", "soma_pesos"], agregado
+        ))
+        cls._limpar_vazias(turma_id)
+
+    def to_dict(self):
+        return {
+            "turma_id": self.turma_id,
+            "aluno_id": self.aluno_id,
+            "soma_pesos": self.soma_pesos,
+            "media": self.media
+        }
@@ -0,0 +1,155 @@
+from datetime import datetime, timedelta, timezone
+
+from models import db
+from models.versao import VersaoColecao
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+
+
+def _agora():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class AlunoReplica(db.Model):
+    """Cópia somente leitura dos alunos do gerenciamento (só o que os joins usam)."""
+    __tablename__ = "replica_alunos"
+
+    id = db.Column(db.Integer, primary_key=True)
+    nome = db.Column(db.String(100), nullable=False)
+    turma_id = db.Column(db.Integer, index=True)
+    updated_at = db.Column(db.DateTime, nullable=False)
+    sincronizado_em = db.Column(db.DateTime, nullable=False)
+
+
+class TurmaReplica(db.Model):
+    """Cópia somente leitura das turmas do gerenciamento."""
+    __tablename__ = "replica_turmas"
+
+    id = db.Column(db.Integer, primary_key=True)
+    descricao = db.Column(db.String(100), nullable=False)
+    professor_id = db.Column(db.Integer, index=True)
+    ativo = db.Column(db.Boolean)
+    updated_at = db.Column(db.DateTime, nullable=False)
+    sincronizado_em = db.Column(db.DateTime, nullable=False)
+
+
+class ProfessorReplica(db.Model):
+    """Cópia somente leitura dos professores do gerenciamento."""
+    __tablename__ = "replica_professores"
+
+    id = db.Column(db.Integer, primary_key=True)
+    nome = db.Column(db.String(100), nullable=False)
+    materia = db.Column(db.String(100))
+    updated_at = db.Column(db.DateTime, nullable=False)
+    sincronizado_em = db.Column(db.DateTime, nullable=False)
+
+
+class MarcaReplica(db.Model):
+    """Até onde cada réplica já foi sincronizada: o maior ``updated_at`` recebido."""
+    __tablename__ = "replica_marcas"
+
+    entidade = db.Column(db.String(50), primary_key=True)
+    marca = db.Column(db.DateTime)
+    sincronizado_em = db.Column(db.DateTime)
+
+    def to_dict(self):
+        return {
+            "entidade": self.entidade,
+            "marca": self.marca.isoformat() if self.marca else None,
+            "sincronizado_em": self.sincronizado_em.isoformat() if self.sincronizado_em else None
+        }
+
+
+class Replicas:
+    """Sincronização incremental das réplicas a partir do gerenciamento.
+
+    Cada entidade é buscada com ``?atualizado_desde=<marca - margem>`` e
+    gravada com upsert, uma transação por página. As páginas vêm em ordem
+    de id, não de ``updated_at``, então a marca só avança depois da última
+    página: se a sincronização cair no meio, a próxima recomeça da marca
+    anterior e reaplica o que já tinha sido gravado. A margem cobre escritas
+    cujo ``updated_at`` é anterior à marca mas que só foram efetivadas depois
+    da leitura; reaplicar uma linha repetida não muda nada. Exclusões não
+    aparecem nesse filtro: só a sincronização completa as remove, apagando o
+    que não veio na carga (``sincronizado_em`` anterior a ela).
+    """
+
+    MODELOS = {
+        "turmas": TurmaReplica,
+        "alunos": AlunoReplica,
+        "professores": ProfessorReplica
+    }
+
+    # Turmas e alunos arquivados no gerenciamento continuam na réplica: as
+    # notas antigas ainda precisam dos nomes.
+    COM_ARQUIVADOS = ("turmas", "alunos")
+
+    @staticmethod
+    def _colunas(modelo):
+        return [c.name for c in modelo.__table__.columns if c.name != "sincronizado_em"]
+
+    @classmethod
+    def _gravar(cls, modelo, itens, instante):
+        colunas = cls._colunas(modelo)
+        linhas = []
+        for item in itens:
+            linha = {coluna: item.get(coluna) for coluna in colunas}
+            linha["updated_at"] = datetime.fromisoformat(item["updated_at"])
+            linha["sincronizado_em"] = instante
+            linhas.append(linha)
+        stmt = insert(modelo)
+        db.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[modelo.id],
+                set_={coluna: stmt.excluded[coluna] for coluna in colunas[1:] + ["sincronizado_em"]}
+            ),
+            linhas
+        )
+        return max(linha["updated_at"] for linha in linhas)
+
+    @classmethod
+    def sincronizar_entidade(cls, cliente, entidade, completo=False, margem=10, lote=1000):
+        """Traz as alterações de uma entidade; retorna quantas linhas foram gravadas."""
+        modelo = cls.MODELOS[entidade]
+        marca = db.session.get(MarcaReplica, entidade)
+        if marca is None:
+            marca = MarcaReplica(entidade=entidade)
+            db.session.add(marca)
+
+        campos = {"incluir_arquivados": "true"} if entidade in cls.COM_ARQUIVADOS else {}
+        if marca.marca is not None and not completo:
+            campos["atualizado_desde"] = (marca.marca - timedelta(seconds=margem)).isoformat()
+
+        inicio = _agora()
+        nova_marca = marca.marca
+        total = 0
+        for itens in cliente.paginas(entidade, campos, lote):
+            if not itens:
+                continue
+            maior = cls._gravar(modelo, itens, inicio)
+            nova_marca = maior if nova_marca is None else max(nova_marca, maior)
+            total += len(itens)
+            VersaoColecao.incrementar("replicas")
+            db.session.commit()
+
+        if completo:
+            db.session.execute(db.delete(modelo).where(modelo.sincronizado_em < inicio))
+            VersaoColecao.incrementar("replicas")
+        marca.marca = nova_marca
+        marca.sincronizado_em = _agora()
+        db.session.commit()
+        return total
+
+    @classmethod
+    def sincronizar(cls, cliente, completo=False, margem=10, lote=1000):
+        """Sincroniza todas as réplicas; retorna {entidade: linhas gravadas}."""
+        return {
+            entidade: cls.sincronizar_entidade(cliente, entidade, completo, margem, lote)
+            for entidade in cls.MODELOS
+        }
+
+    @staticmethod
+    def marcas():
+        return [marca.to_dict() for marca in db.session.execute(
+            select(MarcaReplica).order_by(MarcaReplica.entidade)
+        ).scalars()]
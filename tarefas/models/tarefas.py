@@ -3,6 +3,10 @@ from datetime import date
 
 class Tarefa(db.Model):
     __tablename__ = "tarefas"
+    __table_args__ = (
+        db.Index("ix_tarefas_turma_entrega", "turma_id", "data_entrega"),
+        {"sqlite_autoincrement": True},
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     nome_tarefa = db.Column(db.String(200), nullable=False)
@@ -10,7 +14,7 @@ class Tarefa(db.Model):
     peso_porcento = db.Column(db.Integer, nullable=False)
     data_entrega = db.Column(db.Date, nullable=False)
     turma_id = db.Column(db.Integer, nullable=False)
-    professor_id = db.Column(db.Integer, nullable=False)
+    professor_id = db.Column(db.Integer, nullable=False, index=True)
     
     def to_dict(self):
         return {
@@ -0,0 +1,86 @@
+from datetime import date
+
+from sqlalchemy import or_, select
+
+from models import db
+from models.arquivo import Arquivo
+from models.avaliacoes import Avaliacao
+from models.estatisticas import EstatisticaTarefa
+from models.medias import MediaAluno
+from models.replicas import TurmaReplica
+from models.tarefas import Tarefa
+from models.versao import VersaoColecao
+from utils.filtros import booleano
+
+TAREFAS = Arquivo(Tarefa, indices=("turma_id",))
+AVALIACOES = Arquivo(Avaliacao, indices=("tarefa_id", "aluno_id"))
+
+
+def incluir_arquivados(args):
+    """Lê `?incluir_arquivados=`; ValueError se o valor não for booleano."""
+    try:
+        return booleano(args.get("incluir_arquivados", "false"))
+    except ValueError:
+        raise ValueError("Parâmetro 'incluir_arquivados' deve ser true ou false")
+
+
+def inicio_ano_letivo(hoje, inicio="02-01"):
+    """Primeiro dia do ano letivo em curso em `hoje`; `inicio` é o dia em que ele começa (MM-DD)."""
+    mes, dia = map(int, inicio.split("-"))
+    comeco = date(hoje.year, mes, dia)
+    return comeco if hoje >= comeco else date(hoje.year - 1, mes, dia)
+
+
+def _ao_mover_avaliacoes(ids):
+    """Tira as notas do lote das médias e invalida o boletim dos alunos e turmas delas."""
+    pares = db.session.execute(
+        select(Tarefa.turma_id, Avaliacao.aluno_id)
+        .join(Tarefa, Tarefa.id == Avaliacao.tarefa_id)
+        .where(Avaliacao.id.in_(ids))
+        .distinct()
+    ).all()
+    MediaAluno.retirar_avaliacoes(ids)
+    VersaoColecao.incrementar(
+        "avaliacoes",
+        *[VersaoColecao.escopo("avaliacoes", "aluno", aluno_id) for _, aluno_id in pares],
+        *[VersaoColecao.escopo("tarefas", "turma", turma_id) for turma_id, _ in pares]
+    )
+
+
+def _ao_mover_tarefas(ids):
+    """Invalida as listagens de tarefas e o boletim das turmas do lote."""
+    turmas = db.session.execute(
+        select(Tarefa.turma_id).where(Tarefa.id.in_(ids)).distinct()
+    ).scalars().all()
+    VersaoColecao.incrementar(
+        "tarefas", *[VersaoColecao.escopo("tarefas", "turma", turma_id) for turma_id in turmas]
+    )
+
+
+def arquivar(hoje=None, inicio="02-01", lote=1000):
+    """Arquiva as tarefas de anos letivos anteriores e as de turmas inativas, com as notas.
+
+    Turma inativa é a marcada assim na réplica do gerenciamento. As notas
+    saem antes das tarefas; as estatísticas das tarefas arquivadas são
+    apagadas. Médias e boletim contam só as tarefas da tabela quente: cada
+    lote de notas é descontado de `MediaAluno` e incrementa as versões
+    (gerais e por aluno/turma) na mesma transação em que sai. Retorna
+    {coleção: linhas movidas}.
+    """
+    corte = inicio_ano_letivo(hoje or date.today(), inicio)
+    frias = select(Tarefa.id).where(
+        or_(
+            Tarefa.data_entrega < corte,
+            Tarefa.turma_id.in_(select(TurmaReplica.id).where(TurmaReplica.ativo.is_(False)))
+        )
+    )
+    movidos = {
+        "avaliacoes": AVALIACOES.mover(Avaliacao.tarefa_id.in_(frias), lote, ao_mover=_ao_mover_avaliacoes),
+        "tarefas": TAREFAS.mover(Tarefa.id.in_(frias), lote, ao_mover=_ao_mover_tarefas)
+    }
+    if movidos["tarefas"]:
+        db.session.execute(db.delete(EstatisticaTarefa).where(
+            EstatisticaTarefa.tarefa_id.not_in(select(Tarefa.id))
+        ))
+        db.session.commit()
+    return movidos
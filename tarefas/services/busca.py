@@ -0,0 +1,40 @@
+from models.busca import IndiceBusca
+from models.tarefas import Tarefa
+
+LIMITE_PADRAO = 20
+LIMITE_MAXIMO = 100
+
+# O nome da tarefa é curto e diz mais que uma palavra solta na descrição.
+TAREFAS = IndiceBusca(Tarefa, ("nome_tarefa", "descricao"), pesos=(5.0, 1.0))
+
+INDICES = (TAREFAS,)
+
+
+def instalar():
+    for indice in INDICES:
+        indice.instalar()
+
+
+def _inteiro(args, nome, padrao):
+    try:
+        numero = int(args.get(nome, padrao))
+    except (TypeError, ValueError):
+        raise ValueError(f"Parâmetro '{nome}' deve ser um número inteiro")
+    if numero < 0:
+        raise ValueError(f"Parâmetro '{nome}' não pode ser negativo")
+    return numero
+
+
+def ler_busca(args):
+    """Lê `q`, `limit` e `offset` da query string; ValueError se inválidos.
+
+    Retorna `q` já convertido na consulta FTS5 (`IndiceBusca.expressao`).
+    """
+    texto = args.get("q", "").strip()
+    if not texto:
+        raise ValueError("Parâmetro 'q' é obrigatório")
+    consulta = IndiceBusca.expressao(texto)
+    limit = _inteiro(args, "limit", LIMITE_PADRAO)
+    if limit == 0:
+        raise ValueError("Parâmetro 'limit' deve ser maior que zero")
+    return consulta, min(limit, LIMITE_MAXIMO), _inteiro(args, "offset", 0)
@@ -0,0 +1,140 @@
+import json
+
+import urllib3
+from flask import jsonify
+
+from utils.cache import CacheLRU
+
+_AUSENTE = object()
+
+
+class GerenciamentoIndisponivel(Exception):
+    pass
+
+
+class GerenciamentoClient:
+    """Cliente HTTP do serviço de gerenciamento.
+
+    Mantém um pool de conexões keep-alive e um cache TTL+LRU de existência e
+    de dados das entidades. `verificar` valida vários ids de várias entidades
+    numa única chamada a GET /existencia, consultando só os ids fora do cache.
+    """
+
+    IDS_POR_CHAMADA = 500
+
+    def __init__(self, app=None):
+        self.base_url = None
+        self.habilitado = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        url = app.config.get("GERENCIAMENTO_URL")
+        self.base_url = url.rstrip("/") if url else None
+        self.habilitado = bool(self.base_url) and app.config.get("VALIDAR_REFERENCIAS", True)
+        self.ttl_negativo = app.config.get("GERENCIAMENTO_CACHE_TTL_NEGATIVO", 5)
+        self.timeout = urllib3.Timeout(
+            connect=app.config.get("GERENCIAMENTO_TIMEOUT", 2.0),
+            read=app.config.get("GERENCIAMENTO_TIMEOUT", 2.0)
+        )
+        self.pool = urllib3.PoolManager(
+            maxsize=app.config.get("GERENCIAMENTO_POOL_TAMANHO", 10),
+            block=False,
+            retries=urllib3.Retry(total=2, connect=2, read=1, backoff_factor=0.1)
+        )
+        self.cache = CacheLRU(
+            tamanho_maximo=app.config.get("GERENCIAMENTO_CACHE_TAMANHO", 10000),
+            ttl=app.config.get("GERENCIAMENTO_CACHE_TTL", 60)
+        )
+        app.extensions["gerenciamento_client"] = self
+
+    def _get(self, caminho, campos=None):
+        try:
+            resposta = self.pool.request(
+                "GET", self.base_url + caminho, fields=campos, timeout=self.timeout
+            )
+        except urllib3.exceptions.HTTPError as e:
+            raise GerenciamentoIndisponivel(str(e))
+        if resposta.status == 404:
+            return None
+        if resposta.status != 200:
+            raise GerenciamentoIndisponivel(f"HTTP {resposta.status} em {caminho}")
+        return json.loads(resposta.data)
+
+    def verificar(self, **ids_por_entidade):
+        """Retorna {entidade: [ids inexistentes]} apenas para as entidades com ausências."""
+        ausentes = {}
+        pendentes = {}
+        for entidade, ids in ids_por_entidade.items():
+            for valor in ids:
+                try:
+                    entidade_id = int(valor)
+                except (TypeError, ValueError):
+                    ausentes.setdefault(entidade, []).append(valor)
+                    continue
+                existe = self.cache.get((entidade, entidade_id), _AUSENTE)
+                if existe is _AUSENTE:
+                    pendentes.setdefault(entidade, set()).add(entidade_id)
+                elif not existe:
+                    ausentes.setdefault(entidade, []).append(entidade_id)
+
+        while pendentes:
+            campos = {}
+            consultados = {}
+            for entidade in list(pendentes):
+                lote = sorted(pendentes[entidade])[:self.IDS_POR_CHAMADA]
+                pendentes[entidade].difference_update(lote)
+                if not pendentes[entidade]:
+                    del pendentes[entidade]
+                campos[entidade] = ",".join(map(str, lote))
+                consultados[entidade] = lote
+
+            existentes = self._get("/existencia", campos) or {}
+            for entidade, lote in consultados.items():
+                encontrados = set(existentes.get(entidade, []))
+                for entidade_id in lote:
+                    if entidade_id in encontrados:
+                        self.cache.set((entidade, entidade_id), True)
+                    else:
+                        self.cache.set((entidade, entidade_id), False, ttl=self.ttl_negativo)
+                        ausentes.setdefault(entidade, []).append(entidade_id)
+        return ausentes
+
+    def buscar(self, entidade, entidade_id):
+        """Busca os dados de uma entidade (com cache); retorna None se não existir."""
+        chave = ("dados", entidade, entidade_id)
+        dados = self.cache.get(chave, _AUSENTE)
+        if dados is _AUSENTE:
+            dados = self._get(f"/{entidade}/{entidade_id}")
+            self.cache.set(chave, dados, ttl=None if dados is not None else self.ttl_negativo)
+            self.cache.set((entidade, entidade_id), dados is not None,
+                           ttl=None if dados is not None else self.ttl_negativo)
+        return dados
+
+    def paginas(self, entidade, campos=None, limite=1000):
+        """Percorre GET /<entidade> por keyset (`after`/`next`), uma página por vez."""
+        campos = dict(campos or {}, limit=limite)
+        while True:
+            pagina = self._get(f"/{entidade}", campos)
+            if pagina is None:
+                raise GerenciamentoIndisponivel(f"/{entidade} não encontrado")
+            yield pagina["dados"]
+            if pagina["next"] is None:
+                return
+            campos["after"] = pagina["next"]
+
+
+gerenciamento = GerenciamentoClient()
+
+
+def validar_referencias(**ids_por_entidade):
+    """Valida ids no gerenciamento; retorna uma resposta de erro ou None."""
+    if not gerenciamento.habilitado:
+        return None
+    try:
+        ausentes = gerenciamento.verificar(**ids_por_entidade)
+    except GerenciamentoIndisponivel:
+        return jsonify({"erro": "Serviço de gerenciamento indisponível"}), 503
+    if ausentes:
+        return jsonify({"erro": "Referências não encontradas", "ausentes": ausentes}), 400
+    return None
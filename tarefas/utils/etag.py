@@ -0,0 +1,45 @@
+import hashlib
+from functools import wraps
+
+from flask import Response, make_response, request
+
+from models.versao import VersaoColecao
+
+
+def condicional(*colecoes, expand=None):
+    """Responde GETs com ETag derivado das versões das coleções envolvidas.
+
+    Se o cliente envia If-None-Match com o ETag atual, devolve 304 sem executar
+    a view (só as versões são lidas do banco). O ETag também leva a URL com a
+    query string, pois filtros e páginas diferentes geram corpos diferentes.
+
+    ``expand`` mapeia valores de ``?expand=`` para as coleções que passam a
+    compor a resposta, de modo que o ETag mude quando qualquer uma delas mudar.
+    """
+    expand = expand or {}
+
+    def decorador(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            envolvidas = list(colecoes)
+            for item in request.args.get("expand", "").split(","):
+                colecao = expand.get(item.strip())
+                if colecao and colecao not in envolvidas:
+                    envolvidas.append(colecao)
+            versoes = VersaoColecao.obter(envolvidas)
+            assinatura = "|".join(f"{c}:{v}" for c, v in zip(envolvidas, versoes))
+            etag = hashlib.sha1(
+                f"{assinatura}|{request.full_path}".encode()
+            ).hexdigest()[:32]
+
+            if request.if_none_match.contains(etag):
+                resposta = Response(status=304)
+                resposta.set_etag(etag)
+                return resposta
+
+            resposta = make_response(view(*args, **kwargs))
+            if resposta.status_code == 200:
+                resposta.set_etag(etag)
+            return resposta
+        return wrapper
+    return decorador
@@ -0,0 +1,86 @@
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import Date, DateTime
+
+try:
+    import orjson
+except ImportError:  # opcional: sem ele o provedor usa o json da biblioteca padrão
+    orjson = None
+
+
+def _isoformat(valor):
+    return valor.isoformat()
+
+
+class Serializador:
+    """Monta dicts de resposta a partir de linhas de colunas, sem objetos ORM.
+
+    Listagens grandes gastam a maior parte do tempo hidratando instâncias no
+    identity map e chamando ``to_dict`` linha a linha. Aqui a consulta devolve
+    só as colunas pedidas (tuplas do Core) e cada linha vira dict por uma
+    função gerada uma única vez para o modelo, com as conversões já embutidas:
+    colunas Date/DateTime saem em ``isoformat`` e ``conversores`` permite
+    outras por nome de campo. As chaves seguem a ordem das colunas.
+    """
+
+    def __init__(self, *colunas, conversores=None):
+        self.colunas = colunas
+        self.nomes = tuple(coluna.key for coluna in colunas)
+        conversores = dict(conversores or {})
+        for coluna in colunas:
+            if coluna.key not in conversores and isinstance(coluna.type, (Date, DateTime)):
+                conversores[coluna.key] = _isoformat
+
+        ambiente = {}
+        campos = []
+        for i, nome in enumerate(self.nomes):
+            if nome in conversores:
+                ambiente[f"_c{i}"] = conversores[nome]
+                campos.append(f"{nome!r}: None if l[{i}] is None else _c{i}(l[{i}])")
+            else:
+                campos.append(f"{nome!r}: l[{i}]")
+        exec(f"def serializar(l):\n    return {{{', '.join(campos)}}}", ambiente)
+        self._serializar = ambiente["serializar"]
+
+    def __call__(self, linha):
+        return self._serializar(linha)
+
+    def selecionar(self, query):
+        """Troca as entidades de `query` pelas colunas, mantendo filtros e opções."""
+        return query.with_entities(*self.colunas)
+
+    def lista(self, linhas):
+        return list(map(self._serializar, linhas))
+
+
+class ProvedorJSON(DefaultJSONProvider):
+    """Provedor JSON do Flask que usa orjson quando instalado.
+
+    Sem orjson, cai no ``json`` da biblioteca padrão com as mesmas opções.
+    Em ambos as chaves saem na ordem em que os dicts foram montados (sem
+    ``sort_keys``), o que poupa uma ordenação por objeto nas listagens.
+    """
+
+    sort_keys = False
+    rapido = orjson is not None
+    # Datas cruas passam pelo `default` do Flask, como no provedor padrão.
+    opcoes = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if orjson else 0
+
+    def dumps(self, obj, **kwargs):
+        if self.rapido and not kwargs:
+            return orjson.dumps(obj, default=self.default, option=self.opcoes).decode()
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if self.rapido and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        if not self.rapido or self.compact is False or (self.compact is None and self._app.debug):
+            return super().response(*args, **kwargs)
+        corpo = orjson.dumps(
+            self._prepare_response_obj(args, kwargs),
+            default=self.default,
+            option=self.opcoes | orjson.OPT_APPEND_NEWLINE
+        )
+        return self._app.response_class(corpo, mimetype=self.mimetype)